@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+import urllib.parse as _ulib
+from typing import Any, Dict, List
+
+TOKEN = "bench-token"
+
+
+def user(user_id: int) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "first_name": f"User{user_id}",
+        "last_name": "Benchmark",
+        "username": f"user{user_id}",
+        "is_bot": False,
+        "avatar_url": f"https://i.example/{user_id}.jpg",
+    }
+
+
+def message(i: int, *, chat_id: int = 1000, text: str | None = None) -> Dict[str, Any]:
+    return {
+        "message_id": f"mid.{chat_id}.{i}",
+        "chat_id": chat_id,
+        "sender": user(100 + i % 50),
+        "recipient": {"chat_id": chat_id},
+        "type": "text",
+        "timestamp": 1_700_000_000_000 + i,
+        "body": {
+            "mid": f"mid.{chat_id}.{i}",
+            "seq": i,
+            "text": text if text is not None else f"message number {i} " * 4,
+            "attachments": [
+                {"type": "photo", "payload": {"photo_id": i, "token": "x" * 64, "url": f"https://i.example/p/{i}.jpg"}}
+            ]
+            if i % 5 == 0
+            else None,
+        },
+        "stat": {"views": i * 3},
+    }
+
+
+def new_message_update(i: int, *, chat_id: int = 1000, text: str | None = None) -> Dict[str, Any]:
+    return {
+        "update_id": f"u{i}",
+        "type": "new_message",
+        "data": {
+            "chat_id": chat_id,
+            "message_id": f"mid.{chat_id}.{i}",
+            "text": text if text is not None else f"hello {i}",
+            "sender": user(100 + i % 50),
+        },
+    }
+
+
+def updates(n: int) -> List[Dict[str, Any]]:
+    return [new_message_update(i) for i in range(n)]
+
+
+def messages_page(n: int) -> Dict[str, Any]:
+    return {"messages": [message(i) for i in range(n)], "marker": None}
+
+
+def init_data(bot_token: str = TOKEN, *, user_id: int = 42) -> str:
+    params = {
+        "auth_date": str(int(time.time())),
+        "query_id": "AAH" + "q" * 20,
+        "user": json.dumps(user(user_id), separators=(",", ":")),
+    }
+    data_check_string = "\n".join(f"{k}={params[k]}" for k in sorted(params))
+    secret = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    params["hash"] = hmac.new(secret, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return _ulib.urlencode(params)
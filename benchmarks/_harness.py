@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+__all__ = ["Case", "Suite", "compare", "main"]
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], Any] | Callable[[], Awaitable[Any]]
+    ops: int = 1
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.func)
+
+
+@dataclass
+class Suite:
+    name: str
+    cases: List[Case] = field(default_factory=list)
+
+    def add(self, name: str, *, ops: int = 1):
+        def decorator(func):
+            self.cases.append(Case(name, func, ops))
+            return func
+
+        return decorator
+
+    def run(
+        self,
+        *,
+        rounds: int = 7,
+        min_time: float = 0.05,
+        pattern: str | None = None,
+    ) -> Dict[str, Any]:
+        results: Dict[str, Dict[str, Any]] = {}
+        loop = asyncio.new_event_loop()
+        try:
+            for case in self.cases:
+                if pattern and pattern not in case.name:
+                    continue
+                results[case.name] = _measure(loop, case, rounds=rounds, min_time=min_time)
+        finally:
+            loop.close()
+        return {"suite": self.name, "meta": _meta(), "results": results}
+
+
+def _meta() -> Dict[str, Any]:
+    try:
+        from maxer import __version__
+    except Exception:  # pragma: no cover - benchmarks should still report
+        __version__ = "unknown"
+    return {
+        "maxer": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+    }
+
+
+async def _loop_async(func, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await func()
+    return time.perf_counter() - t0
+
+
+def _loop_sync(func, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        func()
+    return time.perf_counter() - t0
+
+
+def _measure(loop: asyncio.AbstractEventLoop, case: Case, *, rounds: int, min_time: float) -> Dict[str, Any]:
+    def timed(n: int) -> float:
+        if case.is_async:
+            return loop.run_until_complete(_loop_async(case.func, n))
+        return _loop_sync(case.func, n)
+
+    # warm-up and calibration: grow the inner loop until one round takes min_time
+    number = 1
+    while True:
+        elapsed = timed(number)
+        if elapsed >= min_time or number >= 1 << 24:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            samples.append(timed(number) / (number * case.ops))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "ops": case.ops,
+        "loops": number,
+        "rounds": rounds,
+        "min_ns": min(samples) * 1e9,
+        "median_ns": statistics.median(samples) * 1e9,
+        "stdev_ns": (statistics.stdev(samples) if len(samples) > 1 else 0.0) * 1e9,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float) -> List[Dict[str, Any]]:
+    """Return one row per case present in both runs, flagging regressions."""
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, cur in current.get("results", {}).items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        ratio = cur["median_ns"] / base["median_ns"] if base["median_ns"] else float("inf")
+        rows.append(
+            {
+                "name": name,
+                "baseline_ns": base["median_ns"],
+                "current_ns": cur["median_ns"],
+                "ratio": ratio,
+                "regressed": ratio > 1.0 + threshold,
+            }
+        )
+    return rows
+
+
+def _fmt_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def main(suite: Suite, argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog=f"python -m benchmarks.{suite.name}")
+    parser.add_argument("-k", "--filter", help="only run cases whose name contains this substring")
+    parser.add_argument("-o", "--output", help="write machine-readable JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown of the median tolerated before a case counts as regressed (default: 0.10)",
+    )
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per round (default: 0.05)")
+    parser.add_argument("--quick", action="store_true", help="3 short rounds; useful as a smoke test")
+    args = parser.parse_args(argv)
+
+    # the v1-style pydantic calls used throughout the SDK warn on every new call site
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    rounds, min_time = (3, 0.01) if args.quick else (args.rounds, args.min_time)
+    report = suite.run(rounds=rounds, min_time=min_time, pattern=args.filter)
+
+    width = max((len(n) for n in report["results"]), default=10)
+    for name, res in report["results"].items():
+        print(f"{name:<{width}}  {_fmt_ns(res['median_ns']):>10} /op  (min {_fmt_ns(res['min_ns'])}, ±{_fmt_ns(res['stdev_ns'])})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        rows = compare(report, baseline, threshold=args.threshold)
+        regressed = [r for r in rows if r["regressed"]]
+        print()
+        for r in rows:
+            flag = "REGRESSED" if r["regressed"] else "ok"
+            print(f"{r['name']:<{width}}  {r['ratio']:6.2f}x  {flag}")
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than baseline by more than {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
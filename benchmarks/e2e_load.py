@@ -0,0 +1,130 @@
+"""End-to-end throughput and tail latency of a ``Bot`` against the local emulator.
+
+    python -m benchmarks.e2e_load --updates 2000 --chats 50 --rate 500
+    python -m benchmarks.e2e_load --latency 5 --error-rate 0.01 -o load.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import warnings
+from typing import Dict
+
+from maxer import Bot
+from maxer.testing import LatencyRecorder, MaxEmulator
+
+from ._harness import _meta
+
+
+async def run(
+    *,
+    updates: int,
+    chats: int,
+    rate: float | None,
+    latency_ms: float,
+    error_rate: float,
+    serve: bool,
+) -> Dict[str, object]:
+    emu = MaxEmulator(latency=latency_ms / 1000, error_rate=error_rate, max_poll_wait=0.05, seed=1)
+    chat_ids = [emu.add_chat(f"load {i}")["chat_id"] for i in range(chats)]
+
+    if serve:
+        server = await emu.serve()
+        port = server.sockets[0].getsockname()[1]
+        bot = Bot(emu.token, base_url=f"http://127.0.0.1:{port}")
+    else:
+        bot = Bot(emu.token, session=emu.session())
+
+    pushed_at: Dict[str, float] = {}
+    latencies = LatencyRecorder()
+    errors = 0
+    done = asyncio.Event()
+
+    @bot.message()
+    async def echo(ctx, text: str):
+        nonlocal errors
+        try:
+            await ctx.reply(text)
+        except Exception:
+            errors += 1
+        latencies.add(time.perf_counter() - pushed_at.pop(ctx.message_id))
+        if len(latencies) >= updates:
+            done.set()
+
+    async def produce():
+        interval = 1.0 / rate if rate else 0.0
+        start = time.perf_counter()
+        for i in range(updates):
+            msg = emu.push_message(chat_ids[i % len(chat_ids)], f"load {i}")
+            pushed_at[msg["message_id"]] = time.perf_counter()
+            if interval:
+                await asyncio.sleep(max(0.0, start + (i + 1) * interval - time.perf_counter()))
+
+    started = time.perf_counter()
+    bot_task = asyncio.create_task(bot.start())
+    await produce()
+    try:
+        await asyncio.wait_for(done.wait(), timeout=max(60.0, updates / 10))
+    finally:
+        elapsed = time.perf_counter() - started
+        bot_task.cancel()
+        await asyncio.gather(bot_task, return_exceptions=True)
+        await bot.client.__aexit__(None, None, None)
+        await emu.aclose()
+
+    return {
+        "suite": "e2e_load",
+        "meta": _meta(),
+        "config": {
+            "updates": updates,
+            "chats": chats,
+            "rate": rate,
+            "latency_ms": latency_ms,
+            "error_rate": error_rate,
+            "transport": "http" if serve else "mock",
+        },
+        "results": {
+            "handled": len(latencies),
+            "handler_errors": errors,
+            "elapsed_s": elapsed,
+            "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0,
+            "latency": latencies.summary(),
+            "api_requests": emu.stats["requests"],
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.e2e_load")
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=None, help="updates per second (default: burst)")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulated API latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--serve", action="store_true", help="go through a local HTTP server instead of MockTransport")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    report = asyncio.run(
+        run(
+            updates=args.updates,
+            chats=args.chats,
+            rate=args.rate,
+            latency_ms=args.latency,
+            error_rate=args.error_rate,
+            serve=args.serve,
+        )
+    )
+    print(json.dumps(report["results"], indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
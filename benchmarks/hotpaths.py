@@ -0,0 +1,231 @@
+"""CPU hot paths of the SDK, measured offline against ``httpx.MockTransport``.
+
+    python -m benchmarks.hotpaths -o current.json
+    python -m benchmarks.hotpaths --compare baseline.json --threshold 0.15
+"""
+from __future__ import annotations
+
+import json
+import sys
+
+import httpx
+
+from maxer import Bot, Client, validate_init_data
+from maxer.bot import CallbackData, ChatProxy
+from maxer.bot.button import Button
+from maxer.core.compact import CompactMessage, CompactUpdate
+from maxer.core.models import Message, NewMessageBody, Update
+from maxer.webapp import InitDataVerifier
+
+from . import _fixtures as fx
+from ._harness import Suite, main
+
+BATCH = 100
+N_COMMANDS = 50
+N_MESSAGE_HANDLERS = 20
+N_MIDDLEWARES = 5
+
+suite = Suite("hotpaths")
+
+_updates_raw = fx.updates(BATCH)
+_messages_raw = fx.messages_page(BATCH)
+_updates_bytes = json.dumps(_updates_raw).encode()
+_messages_bytes = json.dumps(_messages_raw).encode()
+_sent_bytes = json.dumps(fx.message(1)).encode()
+_json_headers = {"content-type": "application/json"}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/updates":
+        return httpx.Response(200, content=_updates_bytes, headers=_json_headers)
+    if path == "/messages" and request.method == "GET":
+        return httpx.Response(200, content=_messages_bytes, headers=_json_headers)
+    if path == "/messages":
+        return httpx.Response(200, content=_sent_bytes, headers=_json_headers)
+    return httpx.Response(404, json={"error": {"code": "not.found", "description": path}})
+
+
+def _session() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(_handler),
+        base_url="https://bench.invalid",
+        params={"access_token": fx.TOKEN},
+    )
+
+
+client = Client(fx.TOKEN, session=_session())
+
+
+# ----------------------------- Model parsing -------------------------------
+
+
+@suite.add(f"models.update.parse[{BATCH}]", ops=BATCH)
+def _parse_updates():
+    [Update.model_validate(d) for d in _updates_raw]
+
+
+@suite.add(f"models.message.parse[{BATCH}]", ops=BATCH)
+def _parse_messages():
+    [Message.model_validate(d) for d in _messages_raw["messages"]]
+
+
+@suite.add(f"models.update.parse.compact[{BATCH}]", ops=BATCH)
+def _parse_updates_compact():
+    [CompactUpdate.parse_obj(d) for d in _updates_raw]
+
+
+@suite.add(f"models.message.parse.compact[{BATCH}]", ops=BATCH)
+def _parse_messages_compact():
+    [CompactMessage.parse_obj(d) for d in _messages_raw["messages"]]
+
+
+@suite.add(f"client.get_updates[{BATCH}]", ops=BATCH)
+async def _client_get_updates():
+    await client.get_updates()
+
+
+@suite.add(f"client.get_messages[{BATCH}]", ops=BATCH)
+async def _client_get_messages():
+    await client.get_messages(chat_id=1000, count=BATCH)
+
+
+compact_client = Client(fx.TOKEN, session=_session(), models="compact")
+
+
+@suite.add(f"client.get_messages.compact[{BATCH}]", ops=BATCH)
+async def _client_get_messages_compact():
+    await compact_client.get_messages(chat_id=1000, count=BATCH)
+
+
+# ------------------------------ Outgoing body ------------------------------
+
+_body_payload = {
+    "text": "Hello *world*",
+    "format": "markdown",
+    "attachments": [{"type": "photo", "payload": {"file_id": "f1"}}],
+    "buttons": [{"text": "Yes", "callback": "yes"}, {"text": "No", "callback": "no"}],
+}
+
+
+@suite.add("body.validate")
+def _body_validate():
+    NewMessageBody(**_body_payload)
+
+
+@suite.add("body.validate+dump")
+def _body_validate_dump():
+    NewMessageBody(**_body_payload).dict(exclude_none=True)
+
+
+@suite.add("client.send_message")
+async def _client_send():
+    await client.messages.send(1000, "hello")
+
+
+# --------------------------------- Routing ---------------------------------
+
+
+async def _noop_command(ctx, *args):
+    return None
+
+
+async def _noop_message(ctx, text):
+    return None
+
+
+routing_bot = Bot(fx.TOKEN, session=_session())
+for _i in range(N_COMMANDS):
+    routing_bot._register_command(f"cmd{_i}", _noop_command)
+for _i in range(N_MESSAGE_HANDLERS):
+    routing_bot.message(rf"^pattern{_i}\b")(_noop_message)
+
+_cmd_update = Update.model_validate(fx.new_message_update(1, text=f"/cmd{N_COMMANDS - 1} a b"))
+_text_update = Update.model_validate(fx.new_message_update(2, text="no handler matches this text"))
+
+
+@suite.add(f"bot.route.command[{N_COMMANDS}]")
+async def _route_command():
+    await routing_bot._handle_new_message(_cmd_update)
+
+
+@suite.add(f"bot.route.message[{N_MESSAGE_HANDLERS}]")
+async def _route_message():
+    await routing_bot._handle_new_message(_text_update)
+
+
+mw_bot = Bot(fx.TOKEN, session=_session())
+for _i in range(N_MIDDLEWARES):
+
+    async def _mw(update, nxt):
+        await nxt(update)
+
+    mw_bot.use(_mw)
+
+
+@suite.add(f"bot.middleware[{N_MIDDLEWARES}]")
+async def _middleware_chain():
+    await mw_bot._update_router(_text_update)
+
+
+async def _noop_callback(query, **fields):
+    return None
+
+
+callback_bot = Bot(fx.TOKEN, session=_session())
+for _i in range(N_COMMANDS):
+    callback_bot.callbacks.register(f"exact{_i}", _noop_callback)
+    callback_bot.callbacks.register(CallbackData(f"pfx{_i}", "id", "choice"), _noop_callback)
+
+
+@suite.add(f"bot.callbacks.resolve[{2 * N_COMMANDS}]")
+def _callbacks_resolve():
+    callback_bot.callbacks.resolve("exact7")
+    callback_bot.callbacks.resolve(f"pfx{N_COMMANDS - 1}:123:up")
+
+
+# --------------------------------- Builder ---------------------------------
+
+_chat = ChatProxy(client, 1000)
+_buttons = [Button(f"b{i}", callback=f"cb:{i}") for i in range(4)]
+
+
+@suite.add("builder.chain")
+def _builder_chain():
+    (
+        _chat.message("hello")
+        .markdown()
+        .notify(False)
+        .reply("mid.1")
+        .buttons(_buttons)
+        .button("more", callback="more")
+        .photo("file-1")
+    )
+
+
+# --------------------------------- Web app ---------------------------------
+
+_init_data = fx.init_data()
+
+
+@suite.add("webapp.validate_init_data")
+def _validate_init_data():
+    validate_init_data(_init_data, fx.TOKEN)
+
+
+_verifier = InitDataVerifier(fx.TOKEN)
+_uncached_verifier = InitDataVerifier(fx.TOKEN, cache_size=0)
+
+
+@suite.add("webapp.verifier.cached")
+def _verifier_cached():
+    _verifier.verify(_init_data)
+
+
+@suite.add("webapp.verifier.uncached")
+def _verifier_uncached():
+    _uncached_verifier.verify(_init_data)
+
+
+if __name__ == "__main__":
+    sys.exit(main(suite))
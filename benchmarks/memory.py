@@ -0,0 +1,76 @@
+"""Retained memory and decode time per object for each model backend.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory -n 20000 -o memory.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List
+
+from maxer.core.compact import MODEL_BACKENDS
+
+from . import _fixtures as fx
+from ._harness import _fmt_ns, _meta
+
+KINDS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "Message": fx.message,
+    "Update": fx.new_message_update,
+    "User": fx.user,
+}
+
+
+def _measure(parse: Callable[[Dict[str, Any]], Any], raw: List[bytes]) -> Dict[str, float]:
+    # decoded from JSON inside the traced block so dicts the object keeps a reference to are counted
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [parse(json.loads(b)) for b in raw]
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    decoded = [json.loads(b) for b in raw]
+    t0 = time.perf_counter()
+    for d in decoded:
+        parse(d)
+    elapsed = time.perf_counter() - t0
+    return {"bytes_per_object": retained / len(raw), "decode_ns": elapsed / len(raw) * 1e9}
+
+
+def run(n: int) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for kind, factory in KINDS.items():
+        raw = [json.dumps(factory(i)).encode() for i in range(n)]
+        for backend in MODEL_BACKENDS.values():
+            results[f"{kind}.{backend.name}"] = _measure(getattr(backend, kind).parse_obj, raw)
+    return {"suite": "memory", "meta": _meta(), "objects": n, "results": results}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory")
+    parser.add_argument("-n", type=int, default=5000, help="objects decoded per case (default: 5000)")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    report = run(args.n)
+    width = max(len(name) for name in report["results"])
+    for name, res in report["results"].items():
+        print(f"{name:<{width}}  {res['bytes_per_object']:8.0f} B/object  {_fmt_ns(res['decode_ns']):>10} /decode")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Import cost of each public entry point, measured in fresh interpreters.
+
+    python -m benchmarks.startup -o startup.json
+    python -m benchmarks.startup --compare startup.json --threshold 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from ._harness import _fmt_ns, _meta, compare
+
+ENTRY_POINTS: Dict[str, str] = {
+    "import maxer": "import maxer",
+    "maxer.validate_init_data": "from maxer import validate_init_data",
+    "maxer.webapp": "from maxer.webapp import validate_init_data",
+    "maxer.exceptions": "from maxer.core.exceptions import MaxerException",
+    "maxer.models": "from maxer import models; models.Message",
+    "maxer.Client": "from maxer import Client",
+    "maxer.Bot": "from maxer import Bot",
+    "maxer.testing": "import maxer.testing",
+}
+
+HEAVY = ("httpx", "pydantic")
+
+_PROBE = """
+import sys, time
+before = set(sys.modules)
+t0 = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t0
+loaded = set(sys.modules) - before
+print(repr((elapsed, len(loaded), sorted({{m.split('.')[0] for m in loaded}} & set({heavy!r})))))
+"""
+
+
+def _probe(stmt: str) -> tuple[float, int, List[str]]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(stmt=stmt, heavy=HEAVY)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    return eval(out.strip().splitlines()[-1])  # noqa: S307 - our own repr()
+
+
+def run(rounds: int, pattern: str | None = None) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, stmt in ENTRY_POINTS.items():
+        if pattern and pattern not in name:
+            continue
+        samples, modules, heavy = [], 0, []
+        for _ in range(rounds):
+            elapsed, modules, heavy = _probe(stmt)
+            samples.append(elapsed)
+        results[name] = {
+            "statement": stmt,
+            "rounds": rounds,
+            "min_ns": min(samples) * 1e9,
+            "median_ns": statistics.median(samples) * 1e9,
+            "modules_loaded": modules,
+            "heavy_deps": heavy,
+        }
+    return {"suite": "startup", "meta": _meta(), "results": results}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("-k", "--filter")
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--rounds", type=int, default=9)
+    args = parser.parse_args(argv)
+
+    report = run(args.rounds, args.filter)
+    width = max((len(n) for n in report["results"]), default=10)
+    for name, res in report["results"].items():
+        heavy = ",".join(res["heavy_deps"]) or "-"
+        print(f"{name:<{width}}  {_fmt_ns(res['median_ns']):>10}  {res['modules_loaded']:4d} modules  heavy: {heavy}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            rows = compare(report, json.load(fp), threshold=args.threshold)
+        for r in rows:
+            print(f"{r['name']:<{width}}  {r['ratio']:6.2f}x  {'REGRESSED' if r['regressed'] else 'ok'}")
+        if any(r["regressed"] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
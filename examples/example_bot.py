@@ -64,27 +64,24 @@ async def echo(ctx, text: str):
     )
 
 
-# --------------------------- Callback handler ------------------------------
+# --------------------------- Callback handlers -----------------------------
+# Payloads are matched by an O(1) lookup; a handler that doesn't answer within
+# a second is answered automatically so the button stops spinning.
 
 
-@bot.on("callback_query")
-async def on_callback_query(upd):
-    """Reply to inline button presses with small toast notifications."""
-    data = upd.data
-    callback_id = data.get("callback_id")
-    payload = data.get("callback")
+@bot.callback  # payload "like"
+async def like(query):
+    await query.answer("Спасибо за 👍!")
 
-    if not callback_id or not payload:
-        return  # Malformed update – ignore
 
-    if payload == "like":
-        notify_text = "Спасибо за 👍!"
-    elif payload == "dislike":
-        notify_text = "Жаль 😢 Попробую лучше!"
-    else:
-        notify_text = "🤔 Неизвестное действие"
+@bot.callback("dislike")
+async def on_dislike(query):
+    await query.answer("Жаль 😢 Попробую лучше!")
 
-    await bot.client.messages.answer_callback(callback_id, notification=notify_text)
+
+@bot.callback()  # anything else
+async def unknown_callback(query):
+    await query.answer("🤔 Неизвестное действие")
 
 
 # ---------------------------------------------------------------------------
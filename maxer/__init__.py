@@ -15,12 +15,26 @@ logger = _logger
 
 __version__ = "0.1.0"
 
-from .core.client import MaxerClient as Client
-from .webapp import validate_init_data
-from .bot import Bot
-from .core import models as models
-from .core import enums as enums
-from .core import exceptions as exceptions
+from typing import TYPE_CHECKING
+
+# Submodules are imported on first attribute access (PEP 562), so that e.g.
+# ``from maxer import validate_init_data`` doesn't pull in httpx and pydantic.
+_LAZY = {
+    "Client": ("maxer.core.client", "MaxerClient"),
+    "validate_init_data": ("maxer.webapp.validators", "validate_init_data"),
+    "Bot": ("maxer.bot.bot", "Bot"),
+    "models": ("maxer.core.models", None),
+    "enums": ("maxer.core.enums", None),
+    "exceptions": ("maxer.core.exceptions", None),
+}
+
+if TYPE_CHECKING:
+    from .core.client import MaxerClient as Client
+    from .webapp import validate_init_data
+    from .bot import Bot
+    from .core import models as models
+    from .core import enums as enums
+    from .core import exceptions as exceptions
 
 __all__ = [
     "Client",
@@ -29,4 +43,21 @@ __all__ = [
     "models",
     "enums",
     "exceptions",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    import importlib
+
+    module = importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
@@ -0,0 +1,4 @@
+from .store import MessageArchive
+from .sync import ArchiveSync, SyncReport
+
+__all__ = ["MessageArchive", "ArchiveSync", "SyncReport"]
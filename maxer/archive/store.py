@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from ..core.exceptions import MaxerException
+from ..core.models import Message
+
+__all__ = ["MessageArchive", "SyncState"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    chat_id    INTEGER NOT NULL,
+    sender_id  INTEGER,
+    ts         INTEGER NOT NULL,
+    type       TEXT,
+    text       TEXT,
+    raw        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_messages_chat_ts ON messages (chat_id, ts);
+CREATE INDEX IF NOT EXISTS ix_messages_sender_ts ON messages (sender_id, ts);
+CREATE INDEX IF NOT EXISTS ix_messages_ts ON messages (ts);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    chat_id     INTEGER PRIMARY KEY,
+    last_ts     INTEGER,
+    run_from_ts INTEGER,
+    marker      INTEGER,
+    updated_at  INTEGER NOT NULL
+);
+"""
+
+SyncState = Tuple[int | None, int | None, int | None]  # last_ts, run_from_ts, marker
+
+
+class MessageArchive:
+    """SQLite-backed message store with per-chat sync checkpoints.
+
+    Message bodies are kept as zlib-compressed JSON next to a few indexed
+    columns (chat, sender, timestamp) used for queries. Safe to share between
+    the event loop and worker threads.
+    """
+
+    def __init__(self, path: str | os.PathLike, *, compress_level: int = 6):
+        self.path = os.fspath(path)
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def add_messages(self, messages: Iterable[Message | Dict[str, Any]], *, chat_id: int | None = None) -> int:
+        rows = [self._row(m, chat_id) for m in messages]
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def add_page(
+        self,
+        chat_id: int,
+        messages: List[Message],
+        *,
+        run_from_ts: int | None,
+        marker: int | None,
+    ) -> None:
+        """Store one page and advance the chat's checkpoint in the same transaction."""
+        rows = [self._row(m, chat_id) for m in messages]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                if rows:
+                    self._db.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                newest = max((r[3] for r in rows), default=None)
+                prev = self._db.execute("SELECT last_ts FROM sync_state WHERE chat_id = ?", (chat_id,)).fetchone()
+                last_ts = max(filter(None, [newest, prev[0] if prev else None]), default=None)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                    (chat_id, last_ts, run_from_ts if marker is not None else None, marker, int(time.time())),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def sync_state(self, chat_id: int) -> SyncState:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_ts, run_from_ts, marker FROM sync_state WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else (None, None, None)
+
+    def _row(self, msg: Message | Dict[str, Any], chat_id: int | None) -> tuple:
+        if isinstance(msg, dict):
+            data = msg
+        else:
+            data = msg.dict(exclude_none=True)
+        sender = data.get("sender") or {}
+        body = data.get("body") or {}
+        ts = data.get("timestamp") or data.get("date") or 0
+        mtype = data.get("type")
+        raw = zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(), self.compress_level)
+        return (
+            data["message_id"],
+            data.get("chat_id") if data.get("chat_id") is not None else chat_id,
+            sender.get("user_id") if isinstance(sender, dict) else None,
+            ts,
+            getattr(mtype, "value", mtype),
+            body.get("text") if isinstance(body, dict) else None,
+            raw,
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _where(
+        self,
+        chat_id: int | None,
+        sender_id: int | None,
+        since: int | None,
+        until: int | None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        args: List[Any] = []
+        if chat_id is not None:
+            clauses.append("chat_id = ?")
+            args.append(chat_id)
+        if sender_id is not None:
+            clauses.append("sender_id = ?")
+            args.append(sender_id)
+        if since is not None:
+            clauses.append("ts >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            args.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def count(
+        self,
+        *,
+        chat_id: int | None = None,
+        sender_id: int | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> int:
+        where, args = self._where(chat_id, sender_id, since, until)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM messages{where}", args).fetchone()[0]
+
+    def iter_raw(
+        self,
+        *,
+        chat_id: int | None = None,
+        sender_id: int | None = None,
+        since: int | None = None,
+        until: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matching messages as dicts, oldest first, ``batch_size`` rows at a time."""
+        where, args = self._where(chat_id, sender_id, since, until)
+        # keyset pagination keeps memory flat and never holds the lock across yields
+        last: Tuple[int, str] = (-(1 << 62), "")
+        sep = " AND " if where else " WHERE "
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT ts, message_id, raw FROM messages{where}{sep}(ts, message_id) > (?, ?) "
+                    "ORDER BY ts, message_id LIMIT ?",
+                    [*args, *last, batch_size],
+                ).fetchall()
+            if not rows:
+                return
+            for ts, mid, raw in rows:
+                yield json.loads(zlib.decompress(raw))
+            last = (rows[-1][0], rows[-1][1])
+
+    def iter_messages(self, **filters) -> Iterator[Message]:
+        for data in self.iter_raw(**filters):
+            yield Message.parse_obj(data)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_parquet(self, path: str | os.PathLike, *, batch_size: int = 10_000, **filters) -> int:
+        """Write matching messages to a Parquet file; needs the optional ``pyarrow`` package."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise MaxerException("export_parquet requires 'pyarrow' (pip install pyarrow)") from exc
+
+        schema = pa.schema(
+            [
+                ("message_id", pa.string()),
+                ("chat_id", pa.int64()),
+                ("sender_id", pa.int64()),
+                ("ts", pa.int64()),
+                ("type", pa.string()),
+                ("text", pa.string()),
+                ("body", pa.string()),
+            ]
+        )
+        written = 0
+        columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        with pq.ParquetWriter(os.fspath(path), schema, compression="zstd") as writer:
+
+            def flush():
+                nonlocal columns
+                if columns["message_id"]:
+                    writer.write_table(pa.table(columns, schema=schema))
+                    columns = {name: [] for name in schema.names}
+
+            for data in self.iter_raw(batch_size=batch_size, **filters):
+                sender = data.get("sender") or {}
+                body = data.get("body") or {}
+                columns["message_id"].append(data["message_id"])
+                columns["chat_id"].append(data.get("chat_id"))
+                columns["sender_id"].append(sender.get("user_id"))
+                columns["ts"].append(data.get("timestamp"))
+                columns["type"].append(data.get("type"))
+                columns["text"].append(body.get("text"))
+                columns["body"].append(json.dumps(body, ensure_ascii=False))
+                written += 1
+                if len(columns["message_id"]) >= batch_size:
+                    flush()
+            flush()
+        return written
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, TYPE_CHECKING
+
+from ..core.priority import BULK, request_priority
+from .store import MessageArchive
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+
+__all__ = ["ArchiveSync", "SyncReport"]
+
+_logger = logging.getLogger("maxer.archive.sync")
+
+
+@dataclass
+class SyncReport:
+    chats: int = 0
+    pages: int = 0
+    messages: int = 0
+    failed: Dict[int, str] = field(default_factory=dict)
+
+
+class ArchiveSync:
+    """Mirrors chat history into a :class:`MessageArchive`, fetching only the delta.
+
+    Each chat resumes from its newest archived timestamp (``from_ts``). The
+    pagination marker is checkpointed with every page, so an interrupted sync
+    continues where it stopped instead of starting over.
+    """
+
+    def __init__(self, client: "MaxerClient", archive: MessageArchive, *, page_size: int = 100):
+        self._c = client
+        self.archive = archive
+        self.page_size = page_size
+
+    async def sync_chat(self, chat_id: int, *, report: SyncReport | None = None) -> SyncReport:
+        report = report or SyncReport()
+        last_ts, run_from_ts, marker = await asyncio.to_thread(self.archive.sync_state, chat_id)
+        from_ts = run_from_ts if marker is not None else last_ts
+        while True:
+            with request_priority(BULK):
+                msgs, marker = await self._c.get_messages(
+                    chat_id=chat_id,
+                    from_ts=from_ts,
+                    marker=marker,
+                    count=self.page_size,
+                )
+            await asyncio.to_thread(self.archive.add_page, chat_id, msgs, run_from_ts=from_ts, marker=marker)
+            report.pages += 1
+            report.messages += len(msgs)
+            if marker is None:
+                break
+        report.chats += 1
+        return report
+
+    async def sync_all(self, chat_ids: Iterable[int] | None = None, *, concurrency: int = 4) -> SyncReport:
+        """Sync the given chats, or every chat the bot is in, ``concurrency`` at a time."""
+        report = SyncReport()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(chat_id: int):
+            async with sem:
+                try:
+                    await self.sync_chat(chat_id, report=report)
+                except Exception as exc:
+                    _logger.warning("Archive sync of chat %s failed: %s", chat_id, exc)
+                    report.failed[chat_id] = str(exc)
+
+        if chat_ids is None:
+            chat_ids = [ch.chat_id async for ch in self._c.iter_chats()]
+        await asyncio.gather(*(one(cid) for cid in chat_ids))
+        return report
@@ -1,11 +1,53 @@
-from .bot import Bot
-from .chat_proxy import ChatProxy
-from .context import CommandContext
-from .message_builder import MessageBuilder
+from typing import TYPE_CHECKING
+
+# Like ``maxer`` itself, names are imported on first access (PEP 562), so that
+# ``from maxer.bot import Bot`` doesn't load state, callbacks and the rest.
+_LAZY = {
+    "Bot": "maxer.bot.bot",
+    "CallbackData": "maxer.bot.callbacks",
+    "CallbackQuery": "maxer.bot.callbacks",
+    "ChatProxy": "maxer.bot.chat_proxy",
+    "ChatState": "maxer.bot.state",
+    "CommandContext": "maxer.bot.context",
+    "MemoryStateStorage": "maxer.bot.state",
+    "MessageBuilder": "maxer.bot.message_builder",
+    "SQLiteStateStorage": "maxer.bot.state",
+    "StateStorage": "maxer.bot.state",
+}
+
+if TYPE_CHECKING:
+    from .bot import Bot
+    from .callbacks import CallbackData, CallbackQuery
+    from .chat_proxy import ChatProxy
+    from .context import CommandContext
+    from .message_builder import MessageBuilder
+    from .state import ChatState, MemoryStateStorage, SQLiteStateStorage, StateStorage
 
 __all__ = [
     "Bot",
+    "CallbackData",
+    "CallbackQuery",
     "ChatProxy",
+    "ChatState",
     "CommandContext",
-    "MessageBuilder"
-] 
\ No newline at end of file
+    "MemoryStateStorage",
+    "MessageBuilder",
+    "SQLiteStateStorage",
+    "StateStorage",
+]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import inspect
 import logging
 from collections import defaultdict
-from typing import Any, Awaitable, Callable, Dict, List, TYPE_CHECKING, Optional, Pattern
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, TYPE_CHECKING, Optional, Pattern
 import re
 import typing as _t
 from types import SimpleNamespace
@@ -12,29 +13,104 @@ from typing import cast
 
 from ..core.client import MaxerClient
 from ..core.models import Update
+from ..core.priority import INTERACTIVE, request_priority
 from .context import CommandContext
 from .chat_proxy import ChatProxy
 
 if TYPE_CHECKING:
+    # optional subsystems are imported where they are first used
     from ..core.models import NewMessageBody
+    from ..core.update_queue import UpdateQueue
+    from ..core.warmup import ConnectionWarmer
+    from .callbacks import CallbackData, CallbackRouter
+    from .executors import HandlerPools
+    from .fairness import FairDispatcher
+    from .profiler import Profiler
+    from .scheduler import Scheduler
+    from .state import StateManager, StateStorage
 
 _logger = logging.getLogger("maxer.bot")
 
 EventHandler = Callable[..., Awaitable[None]]
 CommandHandler = Callable[[CommandContext, str], Awaitable[None]]
 
+# dispatched by the bot itself rather than received as update types
+_SYNTHETIC_EVENTS = frozenset({"on_ready", "on_update"})
+
 
 class Bot:
     PREFIX = "/"
 
-    def __init__(self, token: str, **client_kwargs):
+    def __init__(
+        self,
+        token: str,
+        *,
+        state_storage: StateStorage | None = None,
+        schedule_path: str | None = None,
+        update_queue: UpdateQueue | None = None,
+        workers: int = 1,
+        profiler: Profiler | None = None,
+        warmup: ConnectionWarmer | None = None,
+        fair: FairDispatcher | None = None,
+        update_types: Iterable[str] | None = None,
+        **client_kwargs,
+    ):
         self.client = MaxerClient(token, **client_kwargs)
+        self._state_storage = state_storage
+        self._state: StateManager | None = None
+        self._schedule_path = schedule_path
+        self._scheduler: Scheduler | None = None
+        self._scheduler_start: asyncio.Future[None] | None = None
+        self._running = False
+        self.update_queue = update_queue
+        self.workers = workers
+        self.profiler = profiler
+        self.warmup = warmup
+        self.fair = fair
+        self._update_types = None if update_types is None else frozenset(update_types)
+        self._executors: HandlerPools | None = None
         self._event_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
         self._commands: Dict[str, CommandHandler] = {}
         self._message_handlers: List[CommandHandler] = []
+        self._callbacks: CallbackRouter | None = None
         from typing import Any as _Any
         self._middlewares: List[_Any] = []
 
+    @property
+    def state(self) -> StateManager:
+        if self._state is None:
+            from .state import StateManager
+
+            self._state = StateManager(self._state_storage)
+        return self._state
+
+    @property
+    def executors(self) -> HandlerPools:
+        if self._executors is None:
+            from .executors import HandlerPools
+
+            self._executors = HandlerPools()
+        return self._executors
+
+    @property
+    def callbacks(self) -> CallbackRouter:
+        if self._callbacks is None:
+            from .callbacks import CallbackRouter
+
+            self._callbacks = CallbackRouter()
+        return self._callbacks
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Scheduled messages; created on first use (or at start with ``schedule_path``)."""
+        if self._scheduler is None:
+            from .scheduler import Scheduler
+
+            self._scheduler = Scheduler(self.client, self._schedule_path or ":memory:")
+            if self._running:
+                self._scheduler_start = asyncio.ensure_future(self._scheduler.start())
+        return self._scheduler
+
     def event(self, coro: EventHandler):
         name = coro.__name__
         if not name.startswith("on_"):
@@ -44,9 +120,21 @@ class Bot:
 
     async def _dispatch(self, name: str, *args):
         for handler in self._event_handlers.get(name, []):
-            await handler(*args)
+            await self._invoke(f"event:{handler.__name__}", handler, *args)
+
+    def _invoke(self, name: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Awaitable[Any]:
+        if self.profiler is None:
+            return func(*args, **kwargs)
+        return self.profiler.run(name, func, *args, **kwargs)
+
+    def command(self, name: str | Callable[..., Any] | None = None, *, executor: str | None = None):
+        """Register a command handler.
 
-    def command(self, name: str | Callable[..., Any] | None = None):
+        With ``executor="thread"`` or ``"process"`` the handler is a plain
+        ``def handler(ctx, *args)`` run in the bot's pool; it gets an
+        :class:`~maxer.bot.executors.OffloadContext` and may ``ctx.reply()``
+        or return the reply. Process handlers must be module-level functions.
+        """
         if callable(name) and inspect.iscoroutinefunction(name):
             func = _t.cast(Callable[..., Any], name)
             cmd_name = func.__name__
@@ -55,11 +143,25 @@ class Bot:
 
         def decorator(func: CommandHandler):
             cmd_name = name if isinstance(name, str) and name else func.__name__
-            self._register_command(cmd_name, func)
+            self._register_command(cmd_name, self._offload(func, executor) if executor else func)
             return func
 
         return decorator
 
+    def _offload(self, func: Callable[..., Any], executor: str) -> CommandHandler:
+        from .executors import EXECUTORS
+
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+        if inspect.iscoroutinefunction(func):
+            raise TypeError("Offloaded handler must be a plain def, not async def")
+
+        @functools.wraps(func)
+        async def _submit(ctx: CommandContext, *args):
+            await self.executors.submit(executor, func, ctx, args)
+
+        return _submit
+
     def _register_command(self, cmd_name: str, func: CommandHandler):
         if not inspect.iscoroutinefunction(func):
             raise TypeError("Command handler must be async def")
@@ -82,11 +184,11 @@ class Bot:
                 cmd_name, *args = parts
                 cmd = self._commands.get(cmd_name)
                 if cmd is not None:
-                    await cmd(ctx, *args)
+                    await self._invoke(f"command:{cmd_name}", cmd, ctx, *args)
                     return
 
         for handler in self._message_handlers:
-            await handler(ctx, text)
+            await self._invoke(f"message:{handler.__name__}", handler, ctx, text)
 
     def on(self, event_name: str):
         def decorator(func: EventHandler):
@@ -97,14 +199,24 @@ class Bot:
 
         return decorator
 
-    def message(self, pattern: str | Pattern[str] | Callable[[str], bool] | None = None):
+    def message(
+        self,
+        pattern: str | Pattern[str] | Callable[[str], bool] | None = None,
+        *,
+        state: str | None = None,
+        executor: str | None = None,
+    ):
+        """Register a message handler; ``state`` limits it to chats in that conversation state.
+
+        ``executor`` works as for :meth:`command`; filtering still happens on the loop.
+        """
         regex: Optional[Pattern[str]] = None
         predicate: Optional[Callable[[str], bool]] = None
 
         if pattern is not None and callable(pattern) and inspect.iscoroutinefunction(pattern):
             func = pattern
             pattern = None
-            decorator = cast(Any, self.message(None))
+            decorator = cast(Any, self.message(None, state=state, executor=executor))
             return decorator(cast(CommandHandler, func))
 
         if isinstance(pattern, (str, re.Pattern)):
@@ -115,21 +227,46 @@ class Bot:
             raise TypeError("pattern must be str | Pattern | predicate | None | coroutine function")
 
         def decorator(func: CommandHandler):
-            if not inspect.iscoroutinefunction(func):
+            if executor is not None:
+                target = self._offload(func, executor)
+            elif inspect.iscoroutinefunction(func):
+                target = func
+            else:
                 raise TypeError("Message handler must be async def")
 
+            @functools.wraps(func)
             async def _wrapped(ctx: CommandContext, text: str):
                 if regex is not None and not regex.search(text):
                     return
                 if predicate is not None and not predicate(text):
                     return
-                await func(ctx, text)
+                if state is not None and await ctx.state.get_state() != state:
+                    return
+                await target(ctx, text)
 
             self._message_handlers.append(_wrapped)
             return func
 
         return decorator
 
+    def callback(self, key: str | CallbackData | Callable[..., Any] | None = None):
+        """Register a button callback handler.
+
+        ``key`` is an exact payload (``"like"``), a :class:`CallbackData`
+        whose decoded fields are passed as keyword arguments, or ``None`` for
+        a catch-all. Used bare, the function name is the payload.
+        """
+        if callable(key) and inspect.iscoroutinefunction(key):
+            func = _t.cast(Callable[..., Any], key)
+            self.callbacks.register(func.__name__, func)
+            return func
+
+        def decorator(func):
+            self.callbacks.register(cast(Any, key), func)
+            return func
+
+        return decorator
+
     def use(self, mw):
         if not callable(mw):
             raise TypeError("Middleware must be callable")
@@ -145,7 +282,8 @@ class Bot:
 
             async def make_next(nxt, current):
                 async def _wrapper(update: Update):
-                    await current(update, nxt)
+                    name = getattr(current, "__name__", type(current).__name__)
+                    await self._invoke(f"middleware:{name}", current, update, nxt)
                 return _wrapper
 
             next_callable = await make_next(next_callable, curr_mw)
@@ -155,13 +293,74 @@ class Bot:
     async def _route_update(self, upd: Update):
         if upd.type == "new_message":
             await self._handle_new_message(upd)
+        elif self._callbacks and upd.type in self._callbacks.update_types:
+            await self._callbacks.dispatch(self, upd)
 
         await self._dispatch("on_update", upd)
         await self._dispatch(f"on_{upd.type}", upd)
 
+    def handled_update_types(self) -> List[str] | None:
+        """Update types some handler reacts to, or ``None`` when every type is needed.
+
+        A catch-all ``on_update`` handler, or any middleware registered with
+        :meth:`use` (which sees every update), needs every type unless the bot
+        was created with an explicit ``update_types``, which always wins.
+        """
+        if self._update_types is not None:
+            return sorted(self._update_types)
+        if self._event_handlers.get("on_update") or self._middlewares:
+            return None
+        types = {
+            name[3:]
+            for name, handlers in self._event_handlers.items()
+            if handlers and name not in _SYNTHETIC_EVENTS
+        }
+        if self._commands or self._message_handlers:
+            types.add("new_message")
+        if self._callbacks:
+            types |= self._callbacks.update_types
+        return sorted(types) or None
+
+    async def subscribe(self, url: str) -> bool:
+        """Register a webhook for the update types this bot handles."""
+        return await self.client.subscribe(url, self.handled_update_types())
+
     async def start(self):
-        await self._dispatch("on_ready")
-        await self.client.long_poll(self._update_router)
+        if self.profiler is not None:
+            await self.profiler.start()
+        self._running = True
+        try:
+            if self._schedule_path is not None or self._scheduler is not None:
+                # a persistent schedule may hold jobs missed while the bot was down
+                await self.scheduler.start()
+            if self.warmup is not None:
+                await self.warmup.warm(self.client)
+                self.warmup.start(self.client)
+            await self._dispatch("on_ready")
+            handler = self._update_router
+            if self.fair is not None:
+                self.fair.start(self._update_router)
+                handler = self.fair.submit
+            types = self.handled_update_types()
+            _logger.debug("Polling for update types: %s", ", ".join(types) if types else "all")
+            await self.client.long_poll(handler, queue=self.update_queue, workers=self.workers, types=types)
+        finally:
+            if self.fair is not None:
+                await self.fair.stop()
+            if self.warmup is not None:
+                await self.warmup.stop()
+            self._running = False
+            if self._scheduler_start is not None:
+                await asyncio.gather(self._scheduler_start, return_exceptions=True)
+                self._scheduler_start = None
+            if self._scheduler is not None:
+                await self._scheduler.stop()
+            if self._executors is not None:
+                await self._executors.shutdown()
+            if self._state is not None:
+                await self._state.close()
+            if self.profiler is not None:
+                await self.profiler.stop()
 
     def run(self):
         try:
@@ -169,11 +368,13 @@ class Bot:
         except KeyboardInterrupt:
             _logger.info("Bot stopped by user")
 
-    def chat(self, chat_id: int) -> ChatProxy:
-        return ChatProxy(self.client, chat_id)
+    def chat(self, chat_id: int, *, priority: str | None = None) -> ChatProxy:
+        return ChatProxy(self.client, chat_id, priority=priority)
 
     async def _update_router(self, upd: Update):
-        if self._middlewares:
-            await self._run_middlewares(upd)
-        else:
-            await self._route_update(upd) 
\ No newline at end of file
+        # replies made while handling an update are what users are waiting on
+        with request_priority(INTERACTIVE):
+            if self._middlewares:
+                await self._run_middlewares(upd)
+            else:
+                await self._route_update(upd) 
\ No newline at end of file
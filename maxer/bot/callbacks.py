@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple, TYPE_CHECKING
+
+from ..core import settings as _cfg
+from .button import Button
+
+if TYPE_CHECKING:
+    from ..core.models import NewMessageBody, Update
+    from .bot import Bot
+    from .chat_proxy import ChatProxy
+
+__all__ = ["CallbackData", "CallbackQuery", "CallbackRouter", "CALLBACK_UPDATE_TYPES"]
+
+_logger = logging.getLogger("maxer.bot.callbacks")
+
+CALLBACK_UPDATE_TYPES = frozenset({"callback_query", "message_callback"})
+
+CallbackHandler = Callable[..., Awaitable[None]]
+
+
+class CallbackData:
+    """Structured button payloads such as ``vote:42:up``.
+
+    >>> vote = CallbackData("vote", "poll_id", "choice")
+    >>> vote.pack(poll_id=42, choice="up")
+    'vote:42:up'
+    >>> vote.unpack("vote:42:up")
+    {'poll_id': '42', 'choice': 'up'}
+    """
+
+    __slots__ = ("prefix", "fields", "sep")
+
+    def __init__(self, prefix: str, *fields: str, sep: str = ":"):
+        if not prefix or sep in prefix:
+            raise ValueError(f"prefix must be non-empty and must not contain {sep!r}")
+        self.prefix = prefix
+        self.fields = fields
+        self.sep = sep
+
+    def pack(self, **values: Any) -> str:
+        missing = [f for f in self.fields if f not in values]
+        if missing:
+            raise ValueError(f"missing callback fields: {', '.join(missing)}")
+        parts = [self.prefix]
+        for name in self.fields:
+            value = str(values[name])
+            if self.sep in value:
+                raise ValueError(f"callback field {name!r} must not contain {self.sep!r}")
+            parts.append(value)
+        return self.sep.join(parts)
+
+    def unpack(self, payload: str) -> Dict[str, str]:
+        prefix, *values = payload.split(self.sep, len(self.fields))
+        if prefix != self.prefix or len(values) != len(self.fields):
+            raise ValueError(f"payload {payload!r} does not match {self.prefix!r}")
+        return dict(zip(self.fields, values))
+
+    def button(self, text: str, **values: Any) -> Button:
+        return Button(text, callback=self.pack(**values))
+
+
+class CallbackQuery:
+    __slots__ = ("bot", "update", "callback_id", "payload", "chat_id", "user", "answered")
+
+    def __init__(self, bot: "Bot", update: "Update", callback_id: str, payload: str):
+        self.bot = bot
+        self.update = update
+        self.callback_id = callback_id
+        self.payload = payload
+        data = update.data
+        message = data.get("message") or {}
+        recipient = message.get("recipient") or {}
+        self.chat_id: int | None = data.get("chat_id") or recipient.get("chat_id")
+        callback = data.get("callback")
+        self.user: Dict[str, Any] | None = data.get("user") or (callback.get("user") if isinstance(callback, dict) else None)
+        self.answered = False
+
+    @property
+    def chat(self) -> "ChatProxy | None":
+        return self.bot.chat(self.chat_id) if self.chat_id is not None else None
+
+    async def answer(
+        self,
+        notification: str | None = None,
+        *,
+        message: "NewMessageBody | Dict[str, Any] | None" = None,
+    ) -> bool:
+        if self.answered:
+            return False
+        self.answered = True
+        return await self.bot.client.messages.answer_callback(
+            self.callback_id, message=message, notification=notification
+        )
+
+
+def _extract(update: "Update") -> Tuple[str, str] | None:
+    data = update.data
+    callback = data.get("callback")
+    if isinstance(callback, dict):
+        # {"callback": {"callback_id": ..., "payload": ...}}
+        callback_id, payload = callback.get("callback_id"), callback.get("payload")
+    else:
+        callback_id, payload = data.get("callback_id"), callback
+    if not callback_id or payload is None:
+        return None
+    return callback_id, payload
+
+
+class CallbackRouter:
+    """Dispatches button callbacks by exact payload or by ``CallbackData`` prefix.
+
+    Both lookups are single dict hits. If a handler hasn't answered within
+    ``deadline`` seconds the router answers for it (with ``auto_answer`` as
+    the notification, if set), so the user's button never keeps spinning.
+    """
+
+    update_types = CALLBACK_UPDATE_TYPES
+
+    def __init__(self, *, deadline: float | None = None, auto_answer: str | None = None):
+        self.deadline = _cfg.CALLBACK_ANSWER_DEADLINE if deadline is None else deadline
+        self.auto_answer = auto_answer
+        self._exact: Dict[str, CallbackHandler] = {}
+        self._prefixed: Dict[Tuple[str, str], Tuple[CallbackData, CallbackHandler]] = {}
+        self._seps: Dict[str, None] = {}
+        self._fallback: CallbackHandler | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self._exact or self._prefixed or self._fallback)
+
+    def register(self, key: str | CallbackData | None, handler: CallbackHandler) -> None:
+        if not inspect.iscoroutinefunction(handler):
+            raise TypeError("Callback handler must be async def")
+        if key is None:
+            self._fallback = handler
+        elif isinstance(key, CallbackData):
+            self._prefixed[(key.prefix, key.sep)] = (key, handler)
+            self._seps[key.sep] = None
+        elif isinstance(key, str):
+            self._exact[key] = handler
+        else:
+            raise TypeError("callback key must be str | CallbackData | None")
+
+    def resolve(self, payload: str) -> Tuple[CallbackHandler, Dict[str, str]] | None:
+        handler = self._exact.get(payload)
+        if handler is not None:
+            return handler, {}
+        for sep in self._seps:
+            entry = self._prefixed.get((payload.split(sep, 1)[0], sep))
+            if entry is not None:
+                data, handler = entry
+                try:
+                    return handler, data.unpack(payload)
+                except ValueError:
+                    continue
+        if self._fallback is not None:
+            return self._fallback, {}
+        return None
+
+    async def dispatch(self, bot: "Bot", update: "Update") -> bool:
+        extracted = _extract(update)
+        if extracted is None:
+            return False
+        callback_id, payload = extracted
+        resolved = self.resolve(payload)
+        if resolved is None:
+            return False
+        handler, fields = resolved
+        query = CallbackQuery(bot, update, callback_id, payload)
+
+        task = asyncio.ensure_future(bot._invoke(f"callback:{handler.__name__}", handler, query, **fields))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.deadline)
+            if not done:
+                _logger.debug("Callback %r missed its %.2fs deadline; answering early", payload, self.deadline)
+                await self._answer(query)
+            await task
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            await self._answer(query)
+        return True
+
+    async def _answer(self, query: CallbackQuery) -> None:
+        if query.answered:
+            return
+        try:
+            await query.answer(self.auto_answer)
+        except Exception as exc:
+            _logger.warning("Automatic answer to callback %s failed: %s", query.callback_id, exc)
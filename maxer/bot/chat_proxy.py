@@ -5,6 +5,7 @@ import os
 
 from ..core.models import Message, NewMessageBody
 from ..core.enums import ChatAction
+from ..core.priority import request_priority
 from .message_builder import MessageBuilder
 
 if TYPE_CHECKING:
@@ -12,24 +13,43 @@ if TYPE_CHECKING:
 
 
 class ChatProxy:
-    __slots__ = ("_c", "chat_id")
+    __slots__ = ("_c", "chat_id", "priority")
 
-    def __init__(self, client: "MaxerClient", chat_id: int):
+    def __init__(self, client: "MaxerClient", chat_id: int, *, priority: str | None = None):
         self._c = client
         self.chat_id = chat_id
+        self.priority = priority
+
+    def with_priority(self, priority: str | None) -> "ChatProxy":
+        """Same chat, with sends and edits tagged for the client's outbound scheduler."""
+        return ChatProxy(self._c, self.chat_id, priority=priority)
+
+    async def _tagged(self, coro):
+        with request_priority(self.priority):
+            return await coro
 
     async def send(
         self,
         body: Union[str, Dict[str, Any], NewMessageBody, None] = None,
         **body_kwargs,
     ) -> Message:
-        return await self._c.messages.send(self.chat_id, body, **body_kwargs)
+        return await self._tagged(self._c.messages.send(self.chat_id, body, **body_kwargs))
+
+    async def edit(
+        self,
+        message_id: str,
+        body: Union[str, Dict[str, Any], NewMessageBody, None] = None,
+        *,
+        coalesce: bool = False,
+        **body_kwargs,
+    ) -> Message | None:
+        return await self._tagged(self._c.messages.edit(message_id, body, coalesce=coalesce, **body_kwargs))
 
-    async def edit(self, message_id: str, body: Union[str, Dict[str, Any], NewMessageBody, None] = None, **body_kwargs) -> Message:
-        return await self._c.messages.edit(message_id, body, **body_kwargs)
+    async def commit_edit(self, message_id: str) -> Message | None:
+        return await self._tagged(self._c.messages.edits.commit(message_id))
 
     async def delete(self, message_id: str) -> bool:
-        return await self._c.messages.delete(message_id=message_id)
+        return await self._tagged(self._c.messages.delete(message_id=message_id))
 
     async def iter_messages(self, *, batch_size: int = 100):
         async for msg in self._c.iter_messages(chat_id=self.chat_id, batch_size=batch_size):
@@ -52,12 +72,12 @@ class ChatProxy:
         )
 
     async def action(self, action: ChatAction | str):
-        return await self._c.chats.send_action(self.chat_id, action)
+        return await self._tagged(self._c.chats.send_action(self.chat_id, action))
 
     async def pin(self, message_id: str | None):
         if message_id is None:
-            return await self._c.chats.unpin(self.chat_id)
-        return await self._c.chats.pin(self.chat_id, message_id)
+            return await self._tagged(self._c.chats.unpin(self.chat_id))
+        return await self._tagged(self._c.chats.pin(self.chat_id, message_id))
 
     async def unpin(self):
         return await self.pin(None)
@@ -72,13 +92,8 @@ class ChatProxy:
         return await self._c.chats.edit(self.chat_id, **fields)
 
     async def members_iter(self, *, batch_size: int = 100):
-        marker: int | None = None
-        while True:
-            members, marker = await self._c.get_chat_members(self.chat_id, count=batch_size, marker=marker)
-            for m in members:
-                yield m
-            if marker is None:
-                break
+        async for m in self._c.iter_chat_members(self.chat_id, batch_size=batch_size):
+            yield m
 
     async def members(
         self,
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .bot import Bot
+    from .state import ChatState
 
 
 class CommandContext:
@@ -16,5 +17,9 @@ class CommandContext:
     def chat(self):
         return self.bot.chat(self.chat_id)
 
+    @property
+    def state(self) -> "ChatState":
+        return self.bot.state.for_chat(self.chat_id)
+
     async def reply(self, text: str):
         await self.bot.client.messages.send(self.chat_id, text) 
\ No newline at end of file
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+    from ..core.models import NewMessageBody
+    from .context import CommandContext
+
+__all__ = ["HandlerPools", "OffloadContext", "EXECUTORS"]
+
+_logger = logging.getLogger("maxer.bot.executors")
+
+EXECUTORS = ("thread", "process")
+
+
+class OffloadContext:
+    """Picklable stand-in for :class:`CommandContext` inside a pool worker.
+
+    In a thread worker :meth:`reply` sends right away through the bot's loop.
+    In a process worker replies are collected and sent once the function
+    returns. A non-``None`` return value is sent as a reply as well.
+    """
+
+    __slots__ = ("chat_id", "message_id", "outbox", "_loop", "_client")
+
+    def __init__(self, chat_id: int, message_id: str):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.outbox: List[Any] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: "MaxerClient | None" = None
+
+    def __getstate__(self):
+        return {"chat_id": self.chat_id, "message_id": self.message_id, "outbox": self.outbox}
+
+    def __setstate__(self, state):
+        self.chat_id = state["chat_id"]
+        self.message_id = state["message_id"]
+        self.outbox = state["outbox"]
+        self._loop = None
+        self._client = None
+
+    def reply(self, body: "NewMessageBody | str | Dict[str, Any]", timeout: float | None = 30.0):
+        if self._loop is None or self._client is None:
+            self.outbox.append(body)
+            return None
+        fut = asyncio.run_coroutine_threadsafe(self._client.messages.send(self.chat_id, body), self._loop)
+        return fut.result(timeout)
+
+
+def _call(func: Callable[..., Any], ctx: OffloadContext, args: Tuple[Any, ...]) -> Tuple[Any, List[Any]]:
+    result = func(ctx, *args)
+    return result, ctx.outbox
+
+
+class HandlerPools:
+    """Lazily created, bounded thread and process pools for offloaded handlers.
+
+    Offloaded work runs in the background so dispatch moves on to the next
+    update; once ``max_pending`` jobs of a kind are queued or running,
+    submitting another waits, which pushes back on dispatch instead of
+    queueing without limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        max_pending: int | None = None,
+    ):
+        cpus = os.cpu_count() or 1
+        self.max_workers = {
+            "thread": max_threads or min(32, cpus + 4),
+            "process": max_processes or cpus,
+        }
+        self.max_pending = max_pending
+        self._pools: Dict[str, Executor] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    def pool(self, kind: str) -> Executor:
+        executor = self._pools.get(kind)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(self.max_workers[kind], thread_name_prefix="maxer-handler")
+            elif kind == "process":
+                # never fork: the parent runs an event loop and holds sockets and locks
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                executor = ProcessPoolExecutor(self.max_workers[kind], mp_context=multiprocessing.get_context(method))
+            else:
+                raise ValueError(f"executor must be one of {EXECUTORS}, got {kind!r}")
+            self._pools[kind] = executor
+        return executor
+
+    async def submit(self, kind: str, func: Callable[..., Any], ctx: "CommandContext", args: Tuple[Any, ...]) -> None:
+        """Start ``func(offload_ctx, *args)`` in the background once a slot is free."""
+        slots = self._slots.get(kind)
+        if slots is None:
+            slots = self._slots[kind] = asyncio.Semaphore(self.max_pending or self.max_workers[kind] * 2)
+        await slots.acquire()
+        task = asyncio.create_task(self._run(kind, func, ctx, args, slots))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        ctx: "CommandContext",
+        args: Tuple[Any, ...],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        name = getattr(func, "__name__", repr(func))
+        octx = OffloadContext(ctx.chat_id, ctx.message_id)
+        loop = asyncio.get_running_loop()
+        if kind == "thread":
+            octx._loop = loop
+            octx._client = ctx.bot.client
+        try:
+            result, outbox = await loop.run_in_executor(self.pool(kind), _call, func, octx, args)
+            for body in outbox:
+                await ctx.bot.client.messages.send(ctx.chat_id, body)
+            if result is not None:
+                await ctx.bot.client.messages.send(ctx.chat_id, result)
+        except Exception:
+            _logger.exception("Offloaded handler %s failed", name)
+        finally:
+            slots.release()
+
+    async def join(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def shutdown(self, *, wait: bool = True) -> None:
+        if wait:
+            await self.join()
+        for executor in self._pools.values():
+            await asyncio.to_thread(functools.partial(executor.shutdown, wait=wait, cancel_futures=not wait))
+        self._pools.clear()
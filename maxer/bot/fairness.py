@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Mapping, Tuple
+
+from ..core.models import Update
+
+__all__ = ["FairDispatcher", "chat_key"]
+
+_logger = logging.getLogger("maxer.bot.fairness")
+
+_MIN_WEIGHT = 0.01  # keeps a zero or negative weight from stalling the round
+
+
+def chat_key(upd: Update) -> Hashable:
+    """Default fairness key: the update's chat, else its user."""
+    chat_id = upd.data.get("chat_id")
+    if chat_id is not None:
+        return chat_id
+    user = upd.data.get("user")
+    return user.get("user_id") if isinstance(user, dict) else upd.data.get("user_id")
+
+
+class _KeyStats:
+    __slots__ = ("dispatched", "max_queued", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.dispatched = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class FairDispatcher:
+    """Runs update handlers on ``workers`` tasks, shared fairly between keys.
+
+    Updates are queued per key (:func:`chat_key` by default, or any
+    ``key(update)`` such as a tenant id) and workers pick the next one by
+    deficit round robin: each turn a key may start ``weight`` updates
+    (``weights`` maps keys to weights, default ``1``; fractions take several
+    turns), so a flooding chat gets its share and no more while quiet chats
+    are served within one round. At most ``max_per_key`` updates of one key run
+    at once, which also keeps a chat's updates in order at the default of 1.
+    :meth:`submit` waits once ``max_pending`` updates are queued, pushing back
+    on polling. Use ``Bot(..., fair=FairDispatcher(workers=8))``.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 8,
+        key: Callable[[Update], Hashable] = chat_key,
+        weights: Mapping[Hashable, float] | Callable[[Hashable], float] | None = None,
+        max_per_key: int = 1,
+        max_pending: int = 1000,
+        max_tracked: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.workers = workers
+        self.key = key
+        self.weights = weights
+        self.max_per_key = max_per_key
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+        self._clock = clock
+        self._queues: Dict[Hashable, Deque[Tuple[Update, float]]] = {}
+        self._running: Dict[Hashable, int] = {}
+        self._deficit: Dict[Hashable, float] = {}
+        self._active: Deque[Hashable] = deque()  # keys with queued updates, in round-robin order
+        self._pending = 0
+        self._changed = asyncio.Condition()
+        self._tasks: List[asyncio.Task[None]] = []
+        self._stats: "OrderedDict[Hashable, _KeyStats]" = OrderedDict()
+        self.dispatched = 0
+
+    def weight(self, key: Hashable) -> float:
+        if self.weights is None:
+            return 1.0
+        value = self.weights(key) if callable(self.weights) else self.weights.get(key, 1.0)
+        return max(value, _MIN_WEIGHT)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, handler: Callable[[Update], Awaitable[Any]]) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(handler)) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def join(self) -> None:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._pending == 0 and not any(self._running.values()))
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    async def submit(self, upd: Update) -> None:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._pending < self.max_pending)
+            key = self.key(upd)
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+                self._active.append(key)
+                self._deficit[key] = 0.0
+            queue.append((upd, self._clock()))
+            self._pending += 1
+            st = self._key_stats(key)
+            st.max_queued = max(st.max_queued, len(queue))
+            self._changed.notify_all()
+
+    def _next(self) -> Tuple[Hashable, Update, float] | None:
+        active = self._active
+        cap = self.max_per_key
+        if not any(self._running.get(k, 0) < cap for k in active):
+            return None
+        while True:
+            key = active[0]
+            if self._running.get(key, 0) >= cap:
+                active.rotate(-1)
+                continue
+            if self._deficit[key] < 1.0:
+                self._deficit[key] += self.weight(key)
+                if self._deficit[key] < 1.0:
+                    active.rotate(-1)
+                    continue
+            self._deficit[key] -= 1.0
+            queue = self._queues[key]
+            upd, queued_at = queue.popleft()
+            if not queue:
+                active.popleft()
+                del self._queues[key], self._deficit[key]
+            elif self._deficit[key] < 1.0:
+                active.rotate(-1)
+            return key, upd, queued_at
+
+    async def _worker(self, handler: Callable[[Update], Awaitable[Any]]) -> None:
+        while True:
+            async with self._changed:
+                picked = self._next()
+                while picked is None:
+                    await self._changed.wait()
+                    picked = self._next()
+                key, upd, queued_at = picked
+                self._pending -= 1
+                self._running[key] = self._running.get(key, 0) + 1
+                self._record(key, self._clock() - queued_at)
+                self._changed.notify_all()
+            try:
+                await handler(upd)
+            except Exception:
+                _logger.exception("Unhandled error while handling %s update", upd.type)
+            finally:
+                async with self._changed:
+                    left = self._running[key] - 1
+                    if left:
+                        self._running[key] = left
+                    else:
+                        del self._running[key]
+                    self._changed.notify_all()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _key_stats(self, key: Hashable) -> _KeyStats:
+        st = self._stats.get(key)
+        if st is None:
+            st = self._stats[key] = _KeyStats()
+            if len(self._stats) > self.max_tracked:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return st
+
+    def _record(self, key: Hashable, waited: float) -> None:
+        st = self._key_stats(key)
+        st.dispatched += 1
+        st.wait_total += waited
+        st.wait_max = max(st.wait_max, waited)
+        self.dispatched += 1
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Totals plus the ``top`` keys with the most queued updates (ties by worst wait)."""
+        ranked = sorted(
+            self._stats.items(),
+            key=lambda kv: (len(self._queues.get(kv[0], ())), kv[1].wait_max),
+            reverse=True,
+        )
+        return {
+            "pending": self._pending,
+            "running": sum(self._running.values()),
+            "keys_queued": len(self._queues),
+            "dispatched": self.dispatched,
+            "keys": {
+                key: {
+                    "queued": len(self._queues.get(key, ())),
+                    "running": self._running.get(key, 0),
+                    "max_queued": st.max_queued,
+                    "dispatched": st.dispatched,
+                    "avg_wait_ms": st.wait_total / st.dispatched * 1000 if st.dispatched else 0.0,
+                    "max_wait_ms": st.wait_max * 1000,
+                    "weight": self.weight(key),
+                }
+                for key, st in ranked[:top]
+            },
+        }
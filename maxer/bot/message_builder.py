@@ -74,5 +74,9 @@ class MessageBuilder:
         doc_payload = {"type": "document", "payload": {"file_id": file_id}}
         return self._clone(attachments=[*prev, doc_payload])
 
+    def priority(self, value: str | None):
+        """Send with the given outbound priority class (``interactive``, ``normal``, ``bulk``)."""
+        return MessageBuilder(self._chat.with_priority(value), self._payload)
+
     async def send(self) -> "Message":
         return await self._chat.send(**self._payload) 
\ No newline at end of file
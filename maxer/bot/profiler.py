@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Tuple
+
+from ..utils.stats import percentile
+
+__all__ = ["Profiler", "HandlerStats"]
+
+_logger = logging.getLogger("maxer.bot.profiler")
+
+StackKey = Tuple[str, Tuple[str, ...]]  # (handler name, frames outermost first)
+
+
+class HandlerStats:
+    __slots__ = ("count", "total", "max", "slow", "errors", "recent")
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.errors = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "max_ms": self.max * 1000,
+            "slow": self.slow,
+            "errors": self.errors,
+        }
+
+
+class _Invocation:
+    __slots__ = ("name", "started", "task")
+
+    def __init__(self, name: str, started: float, task: "asyncio.Task[Any] | None"):
+        self.name = name
+        self.started = started
+        self.task = task
+
+
+class Profiler:
+    """Times bot handlers and watches the event loop for stalls.
+
+    Every command, message, callback, event handler and middleware run is
+    timed under its registered name (``command:start``, ``middleware:auth``;
+    middleware time includes everything downstream of it). A loop task
+    measures scheduling lag every ``lag_interval``. Stacks are sampled in two
+    cases: a watchdog thread samples the loop thread while the loop is stuck
+    for longer than ``lag_threshold`` (sync code blocking it), and the loop
+    task samples the awaiting stack of handlers running longer than
+    ``slow_threshold``. Every ``report_interval`` seconds a top-N report is
+    logged. Use ``Bot(..., profiler=Profiler())``.
+    """
+
+    def __init__(
+        self,
+        *,
+        slow_threshold: float = 0.25,
+        lag_interval: float = 0.05,
+        lag_threshold: float = 0.1,
+        sample_interval: float = 0.02,
+        report_interval: float | None = 60.0,
+        top_n: int = 10,
+        stack_depth: int = 12,
+        max_stacks: int = 1000,
+    ):
+        self.slow_threshold = slow_threshold
+        self.lag_interval = lag_interval
+        self.lag_threshold = lag_threshold
+        self.sample_interval = sample_interval
+        self.report_interval = report_interval
+        self.top_n = top_n
+        self.stack_depth = stack_depth
+        self.max_stacks = max_stacks
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.stacks: Counter[StackKey] = Counter()
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+        self.lag_over = 0
+        self.blocked_samples = 0
+        self._lags: Deque[float] = deque(maxlen=4096)
+        self._codes: Dict[Any, str] = {}
+        self._active: Dict[int, _Invocation] = {}
+        self._ids = itertools.count()
+        self._heartbeat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._tasks: List[asyncio.Task[None]] = []
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._stacks_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Timing
+    # ------------------------------------------------------------------
+
+    async def run(self, name: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        code = getattr(inspect.unwrap(func), "__code__", None)
+        if code is not None and code not in self._codes:
+            self._codes[code] = name
+        token = next(self._ids)
+        started = time.perf_counter()
+        self._active[token] = _Invocation(name, started, asyncio.current_task())
+        failed = False
+        try:
+            return await func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            del self._active[token]
+            elapsed = time.perf_counter() - started
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = HandlerStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.recent.append(elapsed)
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if failed:
+                stats.errors += 1
+            if elapsed > self.slow_threshold:
+                stats.slow += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._tasks.append(asyncio.create_task(self._lag_loop()))
+        if self.report_interval:
+            self._tasks.append(asyncio.create_task(self._report_loop()))
+        self._watchdog = threading.Thread(target=self._watch, name="maxer-profiler", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    def reset(self) -> None:
+        self.handlers.clear()
+        with self._stacks_lock:
+            self.stacks.clear()
+        self._lags.clear()
+        self.lag_max = self.lag_last = 0.0
+        self.lag_over = self.blocked_samples = 0
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    async def _lag_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.lag_last = lag
+            self._lags.append(lag)
+            if lag > self.lag_max:
+                self.lag_max = lag
+            if lag > self.lag_threshold:
+                self.lag_over += 1
+            self._sample_slow()
+
+    def _sample_slow(self) -> None:
+        now = time.perf_counter()
+        for inv in list(self._active.values()):
+            if inv.task is None or now - inv.started < self.slow_threshold:
+                continue
+            frames = _await_chain(inv.task.get_coro())[-self.stack_depth :]
+            self._add_stack((inv.name, tuple(frames)))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            if time.monotonic() - self._heartbeat < self.lag_threshold + self.lag_interval:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)  # type: ignore[arg-type]
+            if frame is None:
+                continue
+            self.blocked_samples += 1
+            frames: List[str] = []
+            owner = "<loop>"
+            while frame is not None:
+                if len(frames) < self.stack_depth:
+                    frames.append(_fmt(frame, frame.f_lineno))
+                name = self._codes.get(frame.f_code)
+                if name is not None and owner == "<loop>":
+                    owner = name
+                frame = frame.f_back
+            self._add_stack((owner, tuple(reversed(frames))))
+
+    def _add_stack(self, key: StackKey) -> None:
+        with self._stacks_lock:
+            if key in self.stacks or len(self.stacks) < self.max_stacks:
+                self.stacks[key] += 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self._lags)
+        with self._stacks_lock:
+            top_stacks = self.stacks.most_common(self.top_n)
+        return {
+            "lag": {
+                "last_ms": self.lag_last * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": self.lag_max * 1000,
+                "over_threshold": self.lag_over,
+                "blocked_samples": self.blocked_samples,
+            },
+            "handlers": {
+                name: st.summary()
+                for name, st in sorted(self.handlers.items(), key=lambda kv: -kv[1].total)[: self.top_n]
+            },
+            "stacks": [{"handler": name, "samples": n, "frames": list(frames)} for (name, frames), n in top_stacks],
+        }
+
+    def report(self) -> str:
+        snap = self.snapshot()
+        lag = snap["lag"]
+        lines = [
+            f"loop lag: last {lag['last_ms']:.1f}ms p99 {lag['p99_ms']:.1f}ms max {lag['max_ms']:.1f}ms "
+            f"over threshold {lag['over_threshold']}x, blocked samples {lag['blocked_samples']}",
+            f"{'handler':<32} {'count':>7} {'total ms':>10} {'avg ms':>8} {'p99 ms':>8} {'max ms':>8} {'slow':>5} {'err':>4}",
+        ]
+        for name, st in snap["handlers"].items():
+            lines.append(
+                f"{name[:32]:<32} {st['count']:>7} {st['total_ms']:>10.1f} {st['avg_ms']:>8.2f} "
+                f"{st['p99_ms']:>8.2f} {st['max_ms']:>8.2f} {st['slow']:>5} {st['errors']:>4}"
+            )
+        for entry in snap["stacks"]:
+            lines.append(f"-- {entry['handler']}: {entry['samples']} samples")
+            lines.extend(f"     {frame}" for frame in entry["frames"][-6:])
+        return "\n".join(lines)
+
+    async def _report_loop(self) -> None:
+        assert self.report_interval
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if self.handlers or self.lag_over:
+                _logger.info("Handler profile:\n%s", self.report())
+
+
+def _fmt(frame, lineno: int) -> str:
+    code = frame.f_code
+    return f"{code.co_filename}:{lineno} {code.co_name}"
+
+
+def _await_chain(coro: Any) -> List[str]:
+    # Task.get_stack() stops at the task's own coroutine; follow what it awaits
+    frames: List[str] = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is not None:
+            frames.append(_fmt(frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
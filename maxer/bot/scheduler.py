@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timezone, tzinfo
+from typing import Any, Callable, Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+from ..core import settings as _cfg
+from ..core.priority import BULK, request_priority
+from ..resources.messages import coerce_body
+from ..utils.backoff import expo as _expo
+from ..utils.cron import CronSpec
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+    from ..core.models import NewMessageBody
+
+__all__ = ["Scheduler", "ScheduledJob"]
+
+_logger = logging.getLogger("maxer.bot.scheduler")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id      INTEGER PRIMARY KEY,
+    due     REAL NOT NULL,
+    chat_id INTEGER NOT NULL,
+    body    TEXT NOT NULL,
+    cron    TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_due ON jobs (due, id);
+"""
+
+
+@dataclass
+class ScheduledJob:
+    id: int
+    due: float
+    chat_id: int
+    body: Dict[str, Any]
+    cron: str | None = None
+
+
+class Scheduler:
+    """Persistent scheduler for delayed and recurring (cron) messages.
+
+    Jobs live in SQLite, indexed by due time. Only a window of upcoming
+    ``(due, id)`` pairs – at most ``window`` of them, covering the next
+    ``horizon`` seconds – is kept in an in-memory heap, so millions of pending
+    jobs cost disk rather than RAM and a restart reloads just that window.
+    Delivery is at-most-once: a job is removed (or moved to its next cron
+    slot) before its message is sent. Jobs missed while the process was down
+    fire on start; a recurring job then resumes from the current time.
+    """
+
+    def __init__(
+        self,
+        client: "MaxerClient",
+        path: str | os.PathLike = ":memory:",
+        *,
+        concurrency: int = 8,
+        horizon: float = 60.0,
+        window: int = 10_000,
+        tz: tzinfo = timezone.utc,
+        priority: str | None = BULK,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._c = client
+        self.path = os.fspath(path)
+        self.concurrency = concurrency
+        self.horizon = horizon
+        self.window = window
+        self.tz = tz
+        self.priority = priority
+        self._clock = clock
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._heap: List[Tuple[float, int]] = []
+        # every job ordered at or before this (due, id) is already in the heap
+        self._cursor: Tuple[float, int] = (-math.inf, -1)
+        self._crons: Dict[str, CronSpec] = {}
+        self._wake = asyncio.Event()
+        self._runner: asyncio.Task[None] | None = None
+        self._inflight: set[asyncio.Task[None]] = set()
+        self.fired = 0
+        self.failed = 0
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    async def schedule(
+        self,
+        chat_id: int,
+        body: "NewMessageBody | str | Dict[str, Any] | None" = None,
+        *,
+        at: float | None = None,
+        delay: float | None = None,
+        cron: str | None = None,
+        **body_kwargs,
+    ) -> int:
+        """Schedule a message; give exactly one of ``at`` (unix time), ``delay`` or ``cron``."""
+        if sum(x is not None for x in (at, delay, cron)) != 1:
+            raise ValueError("pass exactly one of at=, delay= or cron=")
+        if cron is not None:
+            due = self._cron(cron).next(self._clock())
+        else:
+            due = at if at is not None else self._clock() + delay  # type: ignore[operator]
+        row = (due, chat_id, self._encode(body, body_kwargs), cron)
+        job_id = (await asyncio.to_thread(self._insert, [row]))[0]
+        self._offer(due, job_id)
+        return job_id
+
+    async def schedule_many(self, jobs: Iterable[Tuple[int, Any, float]]) -> List[int]:
+        """Bulk-insert one-shot ``(chat_id, body, at)`` jobs in a single transaction."""
+        rows = [(at, chat_id, self._encode(body, {}), None) for chat_id, body, at in jobs]
+        ids = await asyncio.to_thread(self._insert, rows)
+        for (due, *_), job_id in zip(rows, ids):
+            self._offer(due, job_id)
+        return ids
+
+    async def cancel(self, job_id: int) -> bool:
+        # a stale heap entry is skipped when it comes due
+        return await asyncio.to_thread(self._delete, job_id)
+
+    async def get(self, job_id: int) -> ScheduledJob | None:
+        rows = await asyncio.to_thread(self._fetch, [job_id])
+        return rows[0] if rows else None
+
+    def pending(self) -> int:
+        with self._db_lock:
+            return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "fired": self.fired,
+            "failed": self.failed,
+            "loaded": len(self._heap),
+            "inflight": len(self._inflight),
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._runner is None:
+            await asyncio.to_thread(self._conn)
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def _run(self) -> None:
+        sem = asyncio.Semaphore(self.concurrency)
+        failures = 0
+        while True:
+            try:
+                await self._step(sem)
+            except Exception:
+                # e.g. "database is locked"; the runner must outlive it or sends stop silently
+                failures += 1
+                delay = await _expo(failures - 1, base=_cfg.RETRY_BACKOFF_BASE, cap=30.0)
+                _logger.exception("Scheduler step failed – retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+            else:
+                failures = 0
+
+    async def _step(self, sem: asyncio.Semaphore) -> None:
+        now = self._clock()
+        if len(self._heap) < self.window // 2 and self._cursor[0] < now + self.horizon:
+            await self._refill(now + self.horizon)
+
+        due: List[Tuple[float, int]] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.concurrency * 4:
+            due.append(heapq.heappop(self._heap))
+        if not due:
+            timeout = self.horizon / 4
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - now)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(timeout, 0.0))
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        try:
+            jobs, moved = await asyncio.to_thread(self._claim, [job_id for _, job_id in due], now)
+        except BaseException:
+            # not claimed: keep them due for the next attempt
+            for item in due:
+                heapq.heappush(self._heap, item)
+            raise
+        for due_at, job_id in moved:
+            self._offer(due_at, job_id)
+        for job in jobs:
+            await sem.acquire()
+            task = asyncio.create_task(self._fire(job, sem))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _fire(self, job: ScheduledJob, sem: asyncio.Semaphore) -> None:
+        try:
+            with request_priority(self.priority):
+                await self._c.send_message(job.chat_id, coerce_body(job.body, {}))
+            self.fired += 1
+        except Exception as exc:
+            self.failed += 1
+            _logger.warning("Scheduled job %s for chat %s failed: %s", job.id, job.chat_id, exc)
+        finally:
+            sem.release()
+
+    # ------------------------------------------------------------------
+    # Heap window
+    # ------------------------------------------------------------------
+
+    def _offer(self, due: float, job_id: int) -> None:
+        if (due, job_id) <= self._cursor:
+            heapq.heappush(self._heap, (due, job_id))
+            if self._heap[0] == (due, job_id):
+                self._wake.set()
+
+    def _load(self, until: float, limit: int) -> List[Tuple[float, int]]:
+        with self._db_lock:
+            return self._conn().execute(
+                "SELECT due, id FROM jobs WHERE (due, id) > (?, ?) AND due < ? ORDER BY due, id LIMIT ?",
+                (*self._cursor, until, limit),
+            ).fetchall()
+
+    async def _refill(self, until: float) -> None:
+        limit = self.window - len(self._heap)
+        rows = await asyncio.to_thread(self._load, until, limit)
+        for due, job_id in rows:
+            heapq.heappush(self._heap, (due, job_id))
+        # a full page means more jobs may be due before ``until``
+        self._cursor = (rows[-1][0], rows[-1][1]) if len(rows) >= limit else (until, -1)
+
+    def _claim(self, ids: List[int], now: float) -> Tuple[List[ScheduledJob], List[Tuple[float, int]]]:
+        """Load due jobs and, in one transaction, drop one-shots and advance recurring ones."""
+        jobs = [job for job in self._fetch(ids) if job.due <= now]
+        done, moved = [], []
+        for job in jobs:
+            if job.cron is None:
+                done.append((job.id,))
+            else:
+                moved.append((self._cron(job.cron).next(max(job.due, now)), job.id))
+        with self._db_lock:
+            db = self._conn()
+            db.execute("BEGIN")
+            try:
+                db.executemany("DELETE FROM jobs WHERE id = ?", done)
+                db.executemany("UPDATE jobs SET due = ? WHERE id = ?", moved)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return jobs, moved
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            if self.path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    def _insert(self, rows: List[tuple]) -> List[int]:
+        with self._db_lock:
+            db = self._conn()
+            db.execute("BEGIN")
+            try:
+                ids = [db.execute("INSERT INTO jobs (due, chat_id, body, cron) VALUES (?, ?, ?, ?)", r).lastrowid for r in rows]
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return ids
+
+    def _delete(self, job_id: int) -> bool:
+        with self._db_lock:
+            return self._conn().execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount > 0
+
+    def _fetch(self, ids: List[int]) -> List[ScheduledJob]:
+        marks = ",".join("?" * len(ids))
+        with self._db_lock:
+            rows = self._conn().execute(
+                f"SELECT id, due, chat_id, body, cron FROM jobs WHERE id IN ({marks})", ids
+            ).fetchall()
+        return [ScheduledJob(r[0], r[1], r[2], json.loads(r[3]), r[4]) for r in rows]
+
+    def _cron(self, expr: str) -> CronSpec:
+        spec = self._crons.get(expr)
+        if spec is None:
+            spec = self._crons[expr] = CronSpec(expr, self.tz)
+        return spec
+
+    @staticmethod
+    def _encode(body: Any, body_kwargs: Dict[str, Any]) -> str:
+        payload = coerce_body(body, body_kwargs).dict(exclude_none=True)
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, List, Tuple
+
+__all__ = [
+    "StateStorage",
+    "MemoryStateStorage",
+    "SQLiteStateStorage",
+    "StateManager",
+    "ChatState",
+]
+
+_logger = logging.getLogger("maxer.bot.state")
+
+Record = Dict[str, Any]  # {"state": str | None, "data": {...}}
+
+
+class StateStorage(abc.ABC):
+    """Backend interface for conversation state; records are small JSON-able dicts."""
+
+    @abc.abstractmethod
+    async def get(self, key: Hashable) -> Record | None: ...
+
+    @abc.abstractmethod
+    async def set(self, key: Hashable, record: Record) -> None: ...
+
+    @abc.abstractmethod
+    async def delete(self, key: Hashable) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStateStorage(StateStorage):
+    """LRU dict bounded by ``max_size`` entries, with optional idle ``ttl`` in seconds.
+
+    An entry expires ``ttl`` seconds after it was last written or read.
+    """
+
+    def __init__(self, *, max_size: int = 100_000, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict[Hashable, Tuple[Record, float]] = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def peek(self, key: Hashable, *, touch: bool = True) -> Record | None:
+        """The record, if present; ``touch`` restarts its idle ``ttl``."""
+        item = self._items.get(key)
+        if item is None:
+            return None
+        record, stamp = item
+        now = time.monotonic()
+        if self.ttl is not None and now - stamp > self.ttl:
+            del self._items[key]
+            self.evicted += 1
+            return None
+        if touch:
+            self._items[key] = (record, now)
+        self._items.move_to_end(key)
+        return record
+
+    def put(self, key: Hashable, record: Record) -> None:
+        self._items[key] = (record, time.monotonic())
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evicted += 1
+
+    def discard(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    async def get(self, key: Hashable) -> Record | None:
+        return self.peek(key)
+
+    async def set(self, key: Hashable, record: Record) -> None:
+        self.put(key, record)
+
+    async def delete(self, key: Hashable) -> None:
+        self.discard(key)
+
+
+class SQLiteStateStorage(StateStorage):
+    """SQLite persistence behind an in-memory LRU, with write-behind batching.
+
+    Writes land in memory and are flushed in one transaction every
+    ``flush_interval`` seconds or once ``flush_batch`` keys are dirty, so the
+    handler hot path never waits on disk. Reads of cached keys do no I/O.
+    Rows carry their write time, so here ``ttl`` counts from the last write.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        cache_size: int = 10_000,
+        ttl: float | None = None,
+        flush_interval: float = 1.0,
+        flush_batch: int = 500,
+    ):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self._cache = MemoryStateStorage(max_size=cache_size, ttl=ttl)
+        self._dirty: Dict[str, Record | None] = {}
+        self._flushing: Dict[str, Record | None] = {}
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, record TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_state_updated ON state (updated_at)")
+        self._db_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._wake: asyncio.Event | None = None
+        self._closed = False
+
+    async def get(self, key: Hashable) -> Record | None:
+        skey = str(key)
+        found, record = self._lookup(skey)
+        if found:
+            return record
+        async with self._db_lock:
+            row = await asyncio.to_thread(self._read, skey)
+        # a set() or delete() during the read is newer than the row
+        found, record = self._lookup(skey)
+        if found:
+            return record
+        if row is None:
+            return None
+        record, updated_at = json.loads(row[0]), row[1]
+        if self.ttl is not None and time.time() - updated_at > self.ttl:
+            return None
+        self._cache.put(skey, record)
+        return record
+
+    async def set(self, key: Hashable, record: Record) -> None:
+        skey = str(key)
+        self._cache.put(skey, record)
+        self._mark(skey, record)
+
+    async def delete(self, key: Hashable) -> None:
+        skey = str(key)
+        self._cache.discard(skey)
+        self._mark(skey, None)
+
+    async def flush(self) -> int:
+        if not self._dirty:
+            return 0
+        batch, self._dirty = self._dirty, {}
+        self._flushing = batch
+        now = time.time()
+        upserts = [(k, json.dumps(r, separators=(",", ":")), now) for k, r in batch.items() if r is not None]
+        deletes = [(k,) for k, r in batch.items() if r is None]
+        purge_before = now - self.ttl if self.ttl is not None else None
+        try:
+            async with self._db_lock:
+                await asyncio.to_thread(self._write, upserts, deletes, purge_before)
+        except BaseException:
+            # keep unflushed changes, without clobbering newer writes
+            for k, r in batch.items():
+                self._dirty.setdefault(k, r)
+            raise
+        finally:
+            if self._flushing is batch:
+                self._flushing = {}
+        return len(batch)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        async with self._db_lock:  # let an in-flight flush finish first
+            self._db.close()
+
+    def _lookup(self, skey: str) -> Tuple[bool, Record | None]:
+        """``(found, record)`` from unflushed writes or the cache, without I/O."""
+        for pending in (self._dirty, self._flushing):
+            if skey in pending:
+                return True, pending[skey]
+        record = self._cache.peek(skey, touch=False)
+        return record is not None, record
+
+    def _mark(self, skey: str, record: Record | None) -> None:
+        if self._closed:
+            raise RuntimeError("state storage is closed")
+        self._dirty[skey] = record
+        if self._flusher is None:
+            self._wake = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+        if len(self._dirty) >= self.flush_batch and self._wake is not None:
+            self._wake.set()
+
+    async def _flush_loop(self) -> None:
+        assert self._wake is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                _logger.exception("Failed to persist conversation state")
+
+    def _read(self, skey: str):
+        return self._db.execute("SELECT record, updated_at FROM state WHERE key = ?", (skey,)).fetchone()
+
+    def _write(self, upserts: List[tuple], deletes: List[tuple], purge_before: float | None) -> None:
+        self._db.execute("BEGIN")
+        try:
+            if upserts:
+                self._db.executemany("INSERT OR REPLACE INTO state VALUES (?, ?, ?)", upserts)
+            if deletes:
+                self._db.executemany("DELETE FROM state WHERE key = ?", deletes)
+            if purge_before is not None:
+                self._db.execute("DELETE FROM state WHERE updated_at < ?", (purge_before,))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+
+class _KeyLock:
+    __slots__ = ("lock", "users", "owner", "depth")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.owner: asyncio.Task[Any] | None = None
+        self.depth = 0
+
+
+class _KeyedLocks:
+    """One lock per key, re-entrant within a task, dropped once nobody holds or awaits it."""
+
+    __slots__ = ("_locks",)
+
+    def __init__(self):
+        self._locks: Dict[Hashable, _KeyLock] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def __call__(self, key: Hashable) -> AsyncIterator[None]:
+        task = asyncio.current_task()
+        entry = self._locks.get(key)
+        if entry is not None and entry.owner is task:
+            entry.depth += 1
+            try:
+                yield
+            finally:
+                entry.depth -= 1
+            return
+        if entry is None:
+            entry = self._locks[key] = _KeyLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                entry.owner = task
+                try:
+                    yield
+                finally:
+                    entry.owner = None
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._locks[key]
+
+
+class ChatState:
+    """State handle for one chat (``ctx.state``)."""
+
+    __slots__ = ("_manager", "key")
+
+    def __init__(self, manager: "StateManager", key: Hashable):
+        self._manager = manager
+        self.key = key
+
+    async def get_state(self) -> str | None:
+        record = await self._manager.storage.get(self.key)
+        return record.get("state") if record else None
+
+    async def get_data(self) -> Dict[str, Any]:
+        record = await self._manager.storage.get(self.key)
+        return dict(record.get("data") or {}) if record else {}
+
+    async def set_state(self, state: str | None) -> None:
+        async with self._manager.lock(self.key):
+            record = await self._manager.storage.get(self.key) or {}
+            await self._manager.storage.set(self.key, {"state": state, "data": record.get("data") or {}})
+
+    async def update(self, **data: Any) -> Dict[str, Any]:
+        async with self._manager.lock(self.key):
+            record = await self._manager.storage.get(self.key) or {}
+            merged = {**(record.get("data") or {}), **data}
+            await self._manager.storage.set(self.key, {"state": record.get("state"), "data": merged})
+        return merged
+
+    async def clear(self) -> None:
+        await self._manager.storage.delete(self.key)
+
+    def lock(self):
+        """Serialize longer read-modify-write sequences on this chat's state.
+
+        :meth:`set_state` and :meth:`update` take the same lock themselves; it
+        is re-entrant within a task, so they can be called while holding it.
+        """
+        return self._manager.lock(self.key)
+
+
+class StateManager:
+    def __init__(self, storage: StateStorage | None = None):
+        self.storage = storage if storage is not None else MemoryStateStorage()
+        self.lock = _KeyedLocks()
+
+    def for_chat(self, chat_id: Hashable) -> ChatState:
+        return ChatState(self, chat_id)
+
+    async def close(self) -> None:
+        await self.storage.close()
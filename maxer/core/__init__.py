@@ -1,8 +1,40 @@
-from .client import MaxerClient as Client
-from .models import *
-from .enums import *
-from .exceptions import *
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import MaxerClient as Client
+    from .models import *
+    from .enums import *
+    from .exceptions import *
 
 __all__ = [
     "Client",
-] 
\ No newline at end of file
+]
+
+# Names formerly star-imported from these modules are resolved on first access,
+# cheapest module first, so that importing ``maxer.core.exceptions`` (as the
+# webapp validators do) doesn't load pydantic or httpx.
+_STAR_MODULES = ("exceptions", "enums", "models")
+
+
+def __getattr__(name: str):
+    import importlib
+
+    if name == "Client":
+        value = importlib.import_module(f"{__name__}.client").MaxerClient
+    elif name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        for module_name in _STAR_MODULES:
+            module = importlib.import_module(f"{__name__}.{module_name}")
+            if name in vars(module):
+                value = vars(module)[name]
+                break
+        else:
+            try:
+                return importlib.import_module(f"{__name__}.{name}")
+            except ModuleNotFoundError as exc:
+                if exc.name != f"{__name__}.{name}":
+                    raise
+                raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
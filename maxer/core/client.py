@@ -1,24 +1,53 @@
 from __future__ import annotations
 
 import asyncio
+import datetime
+import email.utils
 import logging
+import math
 import os
 import pathlib
 import time
-from typing import Any, Dict, List, Optional, Sequence, AsyncGenerator
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, AsyncGenerator, TYPE_CHECKING
 
 import httpx
 
 from .exceptions import MaxerHTTPException, MaxerNetworkException
-from .models import Chat, Message, NewMessageBody, Update, User, BotCommand
+from .models import PYDANTIC_MODELS, Chat, Message, NewMessageBody, Update, User, BotCommand
 from .enums import ChatAction
+from .jsonstream import JSONArrayStream
 from . import settings as _cfg
 
 from ..utils.backoff import expo as _expo
 
+if TYPE_CHECKING:
+    from .hedging import HedgePolicy
+    from .idempotency import IdempotentSends
+    from .ratelimit import RateLimitCoordinator
+    from .priority import OutboundScheduler
+    from .resilience import Resilience
+    from .update_queue import UpdateQueue
+
 _logger = logging.getLogger("maxer.core.client")
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP-date); ``None`` if unusable."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        delay = when.timestamp() - time.time()
+    return max(0.0, delay) if math.isfinite(delay) else None
+
+
 class MaxerClient:
     def __init__(
         self,
@@ -27,8 +56,27 @@ class MaxerClient:
         base_url: str = _cfg.BASE_URL,
         timeout: float = _cfg.TIMEOUT,
         session: Optional[httpx.AsyncClient] = None,
+        resilience: Optional["Resilience"] = None,
+        outbound: Optional["OutboundScheduler"] = None,
+        hedging: Optional["HedgePolicy"] = None,
+        idempotency: Optional["IdempotentSends"] = None,
+        models: str = "pydantic",
+        ratelimit: Optional["RateLimitCoordinator"] = None,
     ):
         self.token = token
+        self.resilience = resilience
+        self.outbound = outbound
+        self.hedging = hedging
+        self.idempotency = idempotency
+        self.ratelimit = ratelimit
+        self._rl_ns = ratelimit.namespace(token) if ratelimit is not None else ""
+        if models == "pydantic":
+            self.models = PYDANTIC_MODELS
+        else:
+            from .compact import model_backend
+
+            self.models = model_backend(models)
+        self.update_recorder = None
         self._close_session = session is None
         headers = {"User-Agent": _cfg.USER_AGENT_TEMPLATE.format(version=httpx.__version__)}
         self._client: httpx.AsyncClient = session or httpx.AsyncClient(
@@ -36,11 +84,17 @@ class MaxerClient:
             timeout=timeout,
             params={"access_token": token},
             headers=headers,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=_cfg.KEEPALIVE_EXPIRY,
+            ),
         )
 
         from ..resources import (
             BotsAPI,
             ChatsAPI,
+            DownloadsAPI,
             MessagesAPI,
             SubscriptionsAPI,
             UploadsAPI,
@@ -51,25 +105,64 @@ class MaxerClient:
         self.messages = MessagesAPI(self)
         self.subscriptions = SubscriptionsAPI(self)
         self.uploads = UploadsAPI(self)
+        self.downloads = DownloadsAPI(self)
 
-    async def request(self, method: str, url: str, **kwargs) -> Any:
+    async def request(self, method: str, url: str, *, retry: bool = True, **kwargs) -> Any:
         _logger.debug("%s %s %s", method, url, kwargs.get("params") or kwargs.get("json") or "")
+        guard = self.resilience.guard(method, url) if self.resilience is not None else None
+        outbound = self.outbound
+        # classified once so retries keep the caller's priority
+        priority = outbound.classify(method, url) if outbound is not None else None
+        hedge_group = self.hedging.applies(method, url) if self.hedging is not None else None
+        budget = self.resilience.retry_budget if self.resilience is not None else None
+        if budget is not None:
+            budget.record_request()
         attempt = 0
         while True:
+            if priority is not None:
+                await outbound.acquire(priority)
+            if guard is not None:
+                try:
+                    await guard.acquire()
+                except BaseException:
+                    if priority is not None:
+                        outbound.release()
+                    raise
+            started = time.monotonic()
             try:
-                resp = await self._client.request(method, url, **kwargs)
+                try:
+                    if hedge_group is not None:
+                        resp = await self.hedging.send(hedge_group, lambda: self._send(method, url, kwargs))
+                    else:
+                        resp = await self._send(method, url, kwargs)
+                finally:
+                    if priority is not None:
+                        outbound.release()
             except httpx.RequestError as exc:
+                if guard is not None:
+                    guard.release(None, ok=False)
                 attempt += 1
-                if attempt >= _cfg.RETRY_ATTEMPTS:
+                if not retry or attempt >= _cfg.RETRY_ATTEMPTS or (budget is not None and not budget.try_retry()):
                     raise MaxerNetworkException(str(exc)) from exc
                 delay = await _expo(attempt - 1, base=_cfg.RETRY_BACKOFF_BASE)
                 _logger.warning("Network error %s – retrying in %.1fs", exc, delay)
                 await asyncio.sleep(delay)
                 continue
+            except BaseException:
+                if guard is not None:
+                    guard.abandon()
+                raise
+
+            if guard is not None:
+                guard.release(
+                    time.monotonic() - started,
+                    ok=resp.status_code < 500,
+                    overloaded=resp.status_code == 429,
+                )
 
             if resp.status_code >= 500:
                 attempt += 1
-                if attempt >= _cfg.RETRY_ATTEMPTS:
+                if not retry or attempt >= _cfg.RETRY_ATTEMPTS or (budget is not None and not budget.try_retry()):
                     raise MaxerHTTPException(resp.status_code, resp.text)
                 delay = await _expo(attempt - 1, base=_cfg.RETRY_BACKOFF_BASE)
                 _logger.warning("Server error %s – retrying in %.1fs", resp.status_code, delay)
@@ -79,21 +172,99 @@ class MaxerClient:
 
         _logger.debug("Response %s %s", resp.status_code, resp.text[:200])
         if resp.status_code >= 400:
-            if resp.headers.get("content-type", "").startswith("application/json"):
-                data = resp.json()
-                if isinstance(data, dict) and "error" in data:
-                    from .exceptions import MaxerAPIError
-
-                    raise MaxerAPIError(resp.status_code, data["error"])
-            raise MaxerHTTPException(resp.status_code, resp.text)
+            self._raise_for_status(resp)
 
         if resp.headers.get("content-type", "").startswith("application/json"):
             return resp.json()
         return resp.text
 
+    async def _send(self, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        ratelimit = self.ratelimit
+        if ratelimit is None:
+            return await self._client.request(method, url, **kwargs)
+        await ratelimit.acquire(self._rl_ns, method, url, kwargs)
+        resp = await self._client.request(method, url, **kwargs)
+        if resp.status_code == 429:
+            await self._throttled(resp)
+        return resp
+
+    async def _throttled(self, resp: httpx.Response) -> None:
+        if self.ratelimit is not None:
+            await self.ratelimit.throttled(self._rl_ns, _parse_retry_after(resp.headers.get("retry-after")))
+
+    @staticmethod
+    def _raise_for_status(resp: httpx.Response) -> None:
+        if resp.headers.get("content-type", "").startswith("application/json"):
+            data = resp.json()
+            if isinstance(data, dict) and "error" in data:
+                from .exceptions import MaxerAPIError
+
+                raise MaxerAPIError(resp.status_code, data["error"])
+        raise MaxerHTTPException(resp.status_code, resp.text)
+
+    async def stream_list(
+        self,
+        url: str,
+        key: str,
+        *,
+        params: Dict[str, Any] | None = None,
+        tail: Dict[str, Any] | None = None,
+    ) -> AsyncIterator[Any]:
+        """GET a ``{key: [...], ...}`` page, yielding raw items while the body is still arriving.
+
+        The remaining top-level fields (such as ``marker``) are put in
+        ``tail`` once the body is complete. Network errors and 5xx responses
+        are retried only until the first item has been yielded. The pooled
+        connection stays checked out until the page is consumed, so iterate
+        promptly. Hedging never applies here, and with ``resilience`` or
+        ``outbound`` set the page is fetched buffered through :meth:`request`:
+        limiter accounting is per whole response, and a priority slot must
+        not stay held while the caller processes items.
+        """
+        if self.resilience is not None or self.outbound is not None:
+            data = await self.request("GET", url, params=params)
+            if tail is not None:
+                tail.update((k, v) for k, v in data.items() if k != key)
+            for item in data.get(key) or []:
+                yield item
+            return
+
+        attempt = 0
+        while True:
+            parser = JSONArrayStream(key)
+            yielded = False
+            try:
+                if self.ratelimit is not None:
+                    await self.ratelimit.acquire(self._rl_ns, "GET", url, {"params": params})
+                async with self._client.stream("GET", url, params=params) as resp:
+                    if resp.status_code >= 400:
+                        await resp.aread()
+                        if resp.status_code == 429:
+                            await self._throttled(resp)
+                        if resp.status_code < 500 or attempt + 1 >= _cfg.RETRY_ATTEMPTS:
+                            self._raise_for_status(resp)
+                        raise httpx.RemoteProtocolError(f"server error {resp.status_code}")
+                    async for chunk in resp.aiter_bytes():
+                        for item in parser.feed(chunk):
+                            yielded = True
+                            yield item
+                rest = parser.close()
+                rest.pop(key, None)
+            except httpx.RequestError as exc:
+                attempt += 1
+                if yielded or attempt >= _cfg.RETRY_ATTEMPTS:
+                    raise MaxerNetworkException(str(exc)) from exc
+                delay = await _expo(attempt - 1, base=_cfg.RETRY_BACKOFF_BASE)
+                _logger.warning("Error streaming %s (%s) – retrying in %.1fs", url, exc, delay)
+                await asyncio.sleep(delay)
+                continue
+            if tail is not None:
+                tail.update(rest)
+            return
+
     async def get_me(self) -> User:
         data = await self.request("GET", "/me")
-        return User.parse_obj(data)
+        return self.models.User.parse_obj(data)
 
     async def update_me(
         self,
@@ -116,7 +287,7 @@ class MaxerClient:
         if photo is not None:
             payload["photo"] = photo
         data = await self.request("PATCH", "/me", json=payload)
-        return User.parse_obj(data)
+        return self.models.User.parse_obj(data)
 
     async def get_chats(self, *, count: int | None = None, marker: int | None = None) -> tuple[list[Chat], int | None]:
         params: Dict[str, Any] = {}
@@ -125,11 +296,11 @@ class MaxerClient:
         if marker is not None:
             params["marker"] = marker
         data = await self.request("GET", "/chats", params=params)
-        return [Chat.parse_obj(c) for c in data["chats"]], data.get("marker")
+        return [self.models.Chat.parse_obj(c) for c in data["chats"]], data.get("marker")
 
     async def get_chat(self, chat_id: int) -> Chat:
         data = await self.request("GET", f"/chats/{chat_id}")
-        return Chat.parse_obj(data)
+        return self.models.Chat.parse_obj(data)
 
     async def get_chat_by_link(self, chat_link: str) -> Chat:
         try:
@@ -139,11 +310,11 @@ class MaxerClient:
                 data = await self.request("GET", f"/chats/link/{chat_link}")
             else:
                 raise
-        return Chat.parse_obj(data)
+        return self.models.Chat.parse_obj(data)
 
     async def update_chat(self, chat_id: int, **fields) -> Chat:
         data = await self.request("PATCH", f"/chats/{chat_id}", json=fields)
-        return Chat.parse_obj(data)
+        return self.models.Chat.parse_obj(data)
 
     async def delete_chat(self, chat_id: int) -> bool:
         await self.request("DELETE", f"/chats/{chat_id}")
@@ -152,21 +323,29 @@ class MaxerClient:
     async def iter_chats(self, *, batch_size: int = 100):
         marker: int | None = None
         while True:
-            chats, marker = await self.get_chats(count=batch_size, marker=marker)
-            for ch in chats:
-                yield ch
+            params: Dict[str, Any] = {"count": batch_size}
+            if marker is not None:
+                params["marker"] = marker
+            tail: Dict[str, Any] = {}
+            async for item in self.stream_list("/chats", "chats", params=params, tail=tail):
+                yield self.models.Chat.parse_obj(item)
+            marker = tail.get("marker")
             if marker is None:
                 break
 
-    async def send_message(self, chat_id: int, body: NewMessageBody) -> Message:
+    async def send_message(self, chat_id: int, body: NewMessageBody, *, idempotency_key: str | None = None) -> Message:
+        if self.idempotency is not None:
+            from .idempotency import new_key
+
+            return await self.idempotency.send(self, chat_id, body, idempotency_key or new_key())
         payload = body.dict(exclude_none=True)
         data = await self.request("POST", "/messages", json={"chat_id": chat_id, **payload})
-        return Message.parse_obj(data)
+        return self.models.Message.parse_obj(data)
 
     async def edit_message(self, message_id: str, body: NewMessageBody) -> Message:
         payload = body.dict(exclude_none=True)
         data = await self.request("PUT", "/messages", json={"message_id": message_id, **payload})
-        return Message.parse_obj(data)
+        return self.models.Message.parse_obj(data)
 
     async def delete_message(self, message_id: str) -> bool:
         await self.request("DELETE", "/messages", params={"message_id": message_id})
@@ -175,9 +354,13 @@ class MaxerClient:
     async def iter_messages(self, *, chat_id: int, batch_size: int = 100):
         marker: int | None = None
         while True:
-            msgs, marker = await self.get_messages(chat_id=chat_id, count=batch_size, marker=marker)
-            for m in msgs:
-                yield m
+            params: Dict[str, Any] = {"chat_id": chat_id, "count": batch_size}
+            if marker is not None:
+                params["marker"] = marker
+            tail: Dict[str, Any] = {}
+            async for item in self.stream_list("/messages", "messages", params=params, tail=tail):
+                yield self.models.Message.parse_obj(item)
+            marker = tail.get("marker")
             if marker is None:
                 break
 
@@ -205,11 +388,11 @@ class MaxerClient:
         if count is not None:
             params["count"] = count
         data = await self.request("GET", "/messages", params=params)
-        return [Message.parse_obj(m) for m in data["messages"]], data.get("marker")
+        return [self.models.Message.parse_obj(m) for m in data["messages"]], data.get("marker")
 
     async def get_message(self, message_id: str) -> Message:
         data = await self.request("GET", f"/messages/{message_id}")
-        return Message.parse_obj(data)
+        return self.models.Message.parse_obj(data)
 
     async def get_video_info(self, video_token: str) -> Dict[str, Any]:
         return await self.request("GET", f"/videos/{video_token}")
@@ -234,8 +417,11 @@ class MaxerClient:
     async def get_subscriptions(self) -> list[dict[str, Any]]:
         return await self.request("GET", "/subscriptions")
 
-    async def subscribe(self, url: str, types: Sequence[str]) -> bool:
-        await self.request("POST", "/subscriptions", json={"url": url, "types": list(types)})
+    async def subscribe(self, url: str, types: Sequence[str] | None = None) -> bool:
+        payload: Dict[str, Any] = {"url": url}
+        if types:
+            payload["types"] = list(types)
+        await self.request("POST", "/subscriptions", json=payload)
         return True
 
     async def unsubscribe(self) -> bool:
@@ -259,23 +445,80 @@ class MaxerClient:
     async def upload_video(self, path: os.PathLike | str) -> Dict[str, Any]:
         return await self.upload_file(path, "video")
 
-    async def get_updates(self, offset: str | None = None, limit: int = 100, timeout: int = 30) -> List[Update]:
+    async def get_updates(
+        self,
+        offset: str | None = None,
+        limit: int = 100,
+        timeout: int = 30,
+        types: Sequence[str] | None = None,
+    ) -> List[Update]:
         params: Dict[str, Any] = {"limit": limit, "timeout": timeout}
         if offset is not None:
             params["offset"] = offset
+        if types:
+            params["types"] = ",".join(types)
         data = await self.request("GET", "/updates", params=params)
-        return [Update.parse_obj(item) for item in data]
+        if self.update_recorder is not None and data:
+            self.update_recorder.record_batch(data)
+        return [self.models.Update.parse_obj(item) for item in data]
 
-    async def long_poll(self, handler, *, poll_interval: float = 0.5):
+    async def long_poll(
+        self,
+        handler,
+        *,
+        poll_interval: float = 0.5,
+        queue: "UpdateQueue | None" = None,
+        workers: int = 1,
+        types: Sequence[str] | None = None,
+    ):
+        """Poll ``/updates`` forever, passing each update to ``handler``.
+
+        With a ``queue`` polling and handling are decoupled: ``workers`` tasks
+        drain the queue while polling pauses whenever it is full. ``types``
+        asks the server for those update types only.
+        """
+        if queue is not None:
+            await self._long_poll_queued(handler, poll_interval, queue, workers, types)
+            return
         offset: str | None = None
         while True:
-            updates = await self.get_updates(offset=offset)
+            updates = await self.get_updates(offset=offset, types=types)
             if updates:
                 offset = updates[-1].update_id
                 for upd in updates:
                     await handler(upd)
             await asyncio.sleep(poll_interval)
 
+    async def _long_poll_queued(
+        self,
+        handler,
+        poll_interval: float,
+        queue: "UpdateQueue",
+        workers: int,
+        types: Sequence[str] | None,
+    ):
+        async def consume():
+            while True:
+                upd = await queue.get()
+                try:
+                    await handler(upd)
+                except Exception:
+                    _logger.exception("Unhandled error while handling %s update", upd.type)
+
+        tasks = [asyncio.create_task(consume()) for _ in range(workers)]
+        offset: str | None = None
+        try:
+            while True:
+                updates = await self.get_updates(offset=offset, types=types)
+                if updates:
+                    offset = updates[-1].update_id
+                    await queue.put_many(updates)
+                await asyncio.sleep(poll_interval)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def __aenter__(self):
         return self
 
@@ -291,7 +534,7 @@ class MaxerClient:
         data = await self.request("GET", f"/chats/{chat_id}/pin")
         if not data:
             return None
-        return Message.parse_obj(data)
+        return self.models.Message.parse_obj(data)
 
     async def pin_message(self, chat_id: int, message_id: str) -> bool:
         await self.request("PUT", f"/chats/{chat_id}/pin", json={"message_id": message_id})
@@ -337,6 +580,19 @@ class MaxerClient:
         data = await self.request("GET", f"/chats/{chat_id}/members", params=params)
         return data.get("members", []), data.get("marker")
 
+    async def iter_chat_members(self, chat_id: int, *, batch_size: int = 100):
+        marker: int | None = None
+        while True:
+            params: Dict[str, Any] = {"count": batch_size}
+            if marker is not None:
+                params["marker"] = marker
+            tail: Dict[str, Any] = {}
+            async for item in self.stream_list(f"/chats/{chat_id}/members", "members", params=params, tail=tail):
+                yield item
+            marker = tail.get("marker")
+            if marker is None:
+                break
+
     async def add_chat_members(self, chat_id: int, user_ids: Sequence[int]) -> bool:
         await self.request("POST", f"/chats/{chat_id}/members", json={"user_ids": list(user_ids)})
         return True
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import typing
+from types import SimpleNamespace
+from typing import Any, Callable, ClassVar, Dict, Tuple, Type
+
+from pydantic import BaseModel
+
+from .models import PYDANTIC_MODELS, Chat, Message, Update, User, migrate_legacy_message
+
+__all__ = [
+    "CompactModel",
+    "CompactUser",
+    "CompactChat",
+    "CompactMessage",
+    "CompactUpdate",
+    "MODEL_BACKENDS",
+    "model_backend",
+]
+
+
+class CompactModel:
+    """Slotted, validation-free twin of a pydantic model, for read-heavy paths.
+
+    Classes are generated from the pydantic model's fields: same attribute
+    names, same defaults, nested models decoded into their compact twins, and
+    unknown keys kept for models with ``extra="allow"``. Values are taken as
+    the server sent them (enum fields stay plain strings, which still compare
+    equal to the ``str`` enums), so decoding is a single pass of attribute
+    stores. Use :meth:`to_model` to get the full model back.
+    """
+
+    __slots__ = ()
+    model: Type[BaseModel]
+    _fields: Tuple[str, ...] = ()
+    parse_obj: ClassVar[Callable[[Dict[str, Any]], "CompactModel"]]  # generated by _build
+
+    @classmethod
+    def model_validate(cls, data: Dict[str, Any]) -> "CompactModel":
+        return cls.parse_obj(data)
+
+    def dict(self, *, exclude_none: bool = False, by_alias: bool = False) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name in self._fields:
+            value = _dump(getattr(self, name), exclude_none)
+            if value is None and exclude_none:
+                continue
+            out[name] = value
+        return out
+
+    model_dump = dict
+
+    def to_model(self) -> BaseModel:
+        return self.model.parse_obj(self.dict(exclude_none=True))
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self._fields)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class _CompactWithExtras(CompactModel):
+    """Twin of a model with ``extra="allow"``: unknown keys are kept too, as pydantic does."""
+
+    __slots__ = ("_extra",)
+    _extra: Dict[str, Any]
+
+    def __getattr__(self, name: str) -> Any:
+        if name != "_extra":
+            try:
+                return self._extra[name]
+            except KeyError:
+                pass
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def dict(self, *, exclude_none: bool = False, by_alias: bool = False) -> Dict[str, Any]:
+        out = super().dict(exclude_none=exclude_none, by_alias=by_alias)
+        for name, value in self._extra.items():
+            if value is not None or not exclude_none:
+                out[name] = _dump(value, exclude_none)
+        return out
+
+    model_dump = dict
+
+    def __eq__(self, other: object) -> bool:
+        result = super().__eq__(other)
+        return result if result is not True else self._extra == other._extra  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _dump(value: Any, exclude_none: bool) -> Any:
+    if isinstance(value, CompactModel):
+        return value.dict(exclude_none=exclude_none)
+    if isinstance(value, list):
+        return [_dump(v, exclude_none) for v in value]
+    return value
+
+
+def _nested(annotation: Any) -> Tuple[Type[BaseModel] | None, bool]:
+    """``(model, is_list)`` if the annotation holds a pydantic model, else ``(None, False)``."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    is_list = typing.get_origin(annotation) is list
+    for arg in typing.get_args(annotation):
+        model, many = _nested(arg)
+        if model is not None:
+            return model, many or is_list
+    return None, False
+
+
+def _legacy_message(data: Dict[str, Any]) -> Dict[str, Any]:
+    if ("from_id" in data and data.get("sender") is None) or ("date" in data and data.get("timestamp") is None):
+        return migrate_legacy_message(dict(data))
+    return data
+
+
+# decode-time hooks, the counterpart of "before" validators
+_PREPARE: Dict[Type[BaseModel], Callable[[Dict[str, Any]], Dict[str, Any]]] = {Message: _legacy_message}
+
+_built: Dict[Type[BaseModel], Type[CompactModel]] = {}
+
+
+def _build(model: Type[BaseModel]) -> Type[CompactModel]:
+    cls = _built.get(model)
+    if cls is not None:
+        return cls
+    name = f"Compact{model.__name__}"
+    fields = tuple(model.model_fields)
+    extras = model.model_config.get("extra") == "allow"
+    base = _CompactWithExtras if extras else CompactModel
+    cls = type(name, (base,), {"__slots__": fields, "__module__": __name__, "model": model, "_fields": fields})
+    _built[model] = cls
+
+    ns: Dict[str, Any] = {"_new": object.__new__, "_prepare": _PREPARE.get(model)}
+    lines = ["def parse_obj(cls, d):"]
+    if ns["_prepare"] is not None:
+        lines.append("    d = _prepare(d)")
+    lines.append("    self = _new(cls)")
+    for i, (fname, field) in enumerate(model.model_fields.items()):
+        key = field.alias or fname
+        ns[f"_d{i}"] = None if field.is_required() else field.get_default(call_default_factory=True)
+        sub, many = _nested(field.annotation)
+        if sub is None:
+            lines.append(f"    self.{fname} = d.get({key!r}, _d{i})")
+            continue
+        ns[f"_n{i}"] = _build(sub).parse_obj
+        lines.append(f"    v = d.get({key!r}, _d{i})")
+        if many:
+            lines.append(f"    self.{fname} = None if v is None else [_n{i}(x) for x in v]")
+        else:
+            lines.append(f"    self.{fname} = None if v is None else _n{i}(v)")
+    if extras:
+        ns["_known"] = frozenset(f.alias or n for n, f in model.model_fields.items())
+        lines.append("    self._extra = {k: v for k, v in d.items() if k not in _known}")
+    lines.append("    return self")
+    exec("\n".join(lines), ns)  # noqa: S102 - source is generated from field names above
+    cls.parse_obj = classmethod(ns["parse_obj"])  # type: ignore[assignment]
+    globals()[name] = cls  # nested twins must be importable for pickling
+    return cls
+
+
+CompactUser = _build(User)
+CompactChat = _build(Chat)
+CompactMessage = _build(Message)
+CompactUpdate = _build(Update)
+
+MODEL_BACKENDS: Dict[str, SimpleNamespace] = {
+    "pydantic": PYDANTIC_MODELS,
+    "compact": SimpleNamespace(
+        name="compact", User=CompactUser, Chat=CompactChat, Message=CompactMessage, Update=CompactUpdate
+    ),
+}
+
+
+def model_backend(name: str) -> SimpleNamespace:
+    try:
+        return MODEL_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"models must be one of {sorted(MODEL_BACKENDS)}, got {name!r}") from None
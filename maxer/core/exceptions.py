@@ -26,4 +26,15 @@ class MaxerAPIError(MaxerHTTPException):
         self.code = error.get("code")
         self.description = error.get("description") or error.get("message")
         self.extra = {k: v for k, v in error.items() if k not in {"code", "description", "message"}}
-        super().__init__(status_code, self.description or str(error)) 
\ No newline at end of file
+        super().__init__(status_code, self.description or str(error))
+
+
+class MaxerOverloadedException(MaxerException):
+    pass
+
+
+class MaxerCircuitOpenException(MaxerOverloadedException):
+    def __init__(self, group: str, retry_after: float):
+        super().__init__(f"Circuit for '{group}' is open, retry in {retry_after:.1f}s")
+        self.group = group
+        self.retry_after = retry_after
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, TypeVar
+
+from ..utils.stats import percentile
+from .resilience import RetryBudget, endpoint_group
+
+__all__ = ["HedgePolicy"]
+
+_logger = logging.getLogger("maxer.core.hedging")
+
+T = TypeVar("T")
+
+
+class _GroupStats:
+    __slots__ = ("latencies", "requests", "hedged", "hedge_wins", "denied")
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+
+class HedgePolicy:
+    """Sends a backup copy of a slow idempotent request; the first response wins.
+
+    If a request has not completed after the ``percentile`` of recent
+    latencies for its endpoint group (``initial_delay`` until ``min_samples``
+    are known, always clamped to ``min_delay``..``max_delay``), the same
+    request is sent again and whichever finishes first is returned; the other
+    is cancelled. Backups are capped by a :class:`RetryBudget` to about
+    ``budget`` of recent requests, and they do not take an extra outbound
+    scheduler slot. Pass an instance as ``MaxerClient(..., hedging=HedgePolicy())``.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 95.0,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.02,
+        max_delay: float = 2.0,
+        budget: float = 0.05,
+        min_per_second: float = 0.1,
+        window: int = 256,
+        min_samples: int = 20,
+        methods: Iterable[str] = ("GET",),
+        exclude: Iterable[str] = ("updates",),
+        group: Callable[[str, str], str] = endpoint_group,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.methods = frozenset(m.upper() for m in methods)
+        self.exclude = frozenset(exclude)
+        self.budget = RetryBudget(ratio=budget, min_per_second=min_per_second)
+        self._group = group
+        self._groups: Dict[str, _GroupStats] = {}
+
+    def applies(self, method: str, url: str) -> str | None:
+        """Endpoint group to hedge under, or ``None`` if the request is never hedged."""
+        if method.upper() not in self.methods:
+            return None
+        name = self._group(method, url)
+        return None if name in self.exclude else name
+
+    def delay(self, group: str) -> float:
+        st = self._groups.get(group)
+        if st is None or len(st.latencies) < self.min_samples:
+            value = self.initial_delay
+        else:
+            value = percentile(sorted(st.latencies), self.percentile)
+        return min(self.max_delay, max(self.min_delay, value))
+
+    async def send(self, group: str, send: Callable[[], Awaitable[T]]) -> T:
+        st = self._groups.get(group)
+        if st is None:
+            st = self._groups[group] = _GroupStats(self.window)
+        st.requests += 1
+        self.budget.record_request()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(send())
+        backup: asyncio.Future[T] | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay(group))
+            if not done:
+                if self.budget.try_retry():
+                    st.hedged += 1
+                    _logger.debug("Hedging %s request after %.3fs", group, time.monotonic() - started)
+                    backup = asyncio.ensure_future(send())
+                else:
+                    st.denied += 1
+            pending = {primary} if backup is None else {primary, backup}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        winner = task
+                    else:
+                        error = exc
+                if winner is not None:
+                    # latency as the caller saw it; a lost primary's full latency is never known
+                    st.latencies.append(time.monotonic() - started)
+                    if winner is backup:
+                        st.hedge_wins += 1
+                    return winner.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "groups": {
+                name: {
+                    "requests": st.requests,
+                    "hedged": st.hedged,
+                    "hedge_wins": st.hedge_wins,
+                    "denied": st.denied,
+                    "hedge_rate": st.hedged / st.requests if st.requests else 0.0,
+                    "delay_ms": self.delay(name) * 1000,
+                }
+                for name, st in self._groups.items()
+            },
+            "denied": self.budget.denied,
+        }
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, TYPE_CHECKING
+
+from .exceptions import MaxerHTTPException, MaxerNetworkException
+from .models import Message, NewMessageBody
+from . import settings as _cfg
+
+from ..utils.backoff import expo as _expo
+
+if TYPE_CHECKING:
+    from .client import MaxerClient
+
+__all__ = ["IdempotentSends", "new_key"]
+
+_logger = logging.getLogger("maxer.core.idempotency")
+
+
+def new_key() -> str:
+    return uuid.uuid4().hex
+
+
+def _fingerprint(body: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (body.get("text") or "", len(body.get("attachments") or ()))
+
+
+class _Record:
+    __slots__ = ("expires", "message", "future")
+
+    def __init__(self, expires: float, future: "asyncio.Future[Message]"):
+        self.expires = expires
+        self.message: Message | None = None
+        self.future = future
+
+
+class IdempotentSends:
+    """Retries message sends without duplicating them.
+
+    Every logical send has a key (``send_message(..., idempotency_key=...)``
+    or a generated one) and the outcome is remembered for ``ttl`` seconds, so
+    sending again with the same key returns the first message. When an attempt
+    fails ambiguously (network error or 5xx, so it may have landed), the last
+    ``lookback`` messages of the chat are checked for one from the bot with the
+    same text and attachment count, sent after the attempt started and not
+    already claimed by another key, before the send is repeated. If that check
+    itself fails the original error is raised rather than risking a duplicate.
+    Pass an instance as ``MaxerClient(..., idempotency=IdempotentSends())``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 600.0,
+        max_size: int = 10_000,
+        attempts: int = 5,
+        lookback: int = 50,
+        skew: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.attempts = attempts
+        self.lookback = lookback
+        self.skew = skew
+        self._clock = clock
+        self._records: "OrderedDict[str, _Record]" = OrderedDict()
+        self._claimed: Dict[str, str] = {}  # message_id -> key
+        self._me: int | None = None
+        self.stats: Dict[str, int] = {"sent": 0, "deduplicated": 0, "ambiguous": 0, "reconciled": 0, "resent": 0}
+
+    async def send(self, client: "MaxerClient", chat_id: int, body: NewMessageBody, key: str) -> Message:
+        self._expire()
+        rec = self._records.get(key)
+        if rec is not None:
+            self.stats["deduplicated"] += 1
+            if rec.message is not None:
+                return rec.message
+            return await asyncio.shield(rec.future)
+
+        future: asyncio.Future[Message] = asyncio.get_running_loop().create_future()
+        rec = self._records[key] = _Record(self._clock() + self.ttl, future)
+        try:
+            message = await self._send(client, chat_id, body.dict(exclude_none=True), key)
+        except BaseException as exc:
+            del self._records[key]
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; nobody else has to retrieve it
+            raise
+        rec.message = message
+        self._claimed[message.message_id] = key
+        future.set_result(message)
+        self.stats["sent"] += 1
+        return message
+
+    async def _send(self, client: "MaxerClient", chat_id: int, payload: Dict[str, Any], key: str) -> Message:
+        since = int((self._clock() - self.skew) * 1000)
+        attempt = 0
+        while True:
+            try:
+                data = await client.request("POST", "/messages", json={"chat_id": chat_id, **payload}, retry=False)
+                return client.models.Message.parse_obj(data)
+            except (MaxerNetworkException, MaxerHTTPException) as exc:
+                if isinstance(exc, MaxerHTTPException) and exc.status_code < 500:
+                    raise
+                self.stats["ambiguous"] += 1
+                try:
+                    landed = await self._find(client, chat_id, payload, since, key)
+                except Exception as check_exc:
+                    _logger.warning("Could not check chat %s for a landed send: %s", chat_id, check_exc)
+                    raise exc
+                if landed is not None:
+                    self.stats["reconciled"] += 1
+                    _logger.info("Send to chat %s landed despite %s", chat_id, exc)
+                    return landed
+                attempt += 1
+                if attempt >= self.attempts:
+                    raise
+                self.stats["resent"] += 1
+                delay = await _expo(attempt - 1, base=_cfg.RETRY_BACKOFF_BASE)
+                _logger.warning("Send to chat %s did not land (%s) – resending in %.1fs", chat_id, exc, delay)
+                await asyncio.sleep(delay)
+
+    async def _find(
+        self, client: "MaxerClient", chat_id: int, payload: Dict[str, Any], since: int, key: str
+    ) -> Message | None:
+        if self._me is None:
+            self._me = (await client.get_me()).user_id
+        messages, _ = await client.get_messages(chat_id=chat_id, from_ts=since, count=self.lookback)
+        wanted = _fingerprint(payload)
+        for msg in messages:
+            if msg.sender is None or msg.sender.user_id != self._me or msg.message_id in self._claimed:
+                continue
+            if msg.timestamp is not None and msg.timestamp < since:
+                continue
+            if _fingerprint(msg.body or {}) == wanted:
+                self._claimed[msg.message_id] = key  # before any await, so a concurrent check skips it
+                return msg
+        return None
+
+    def _expire(self) -> None:
+        now = self._clock()
+        records = self._records
+        while records:
+            rec = next(iter(records.values()))
+            if rec.message is None or (rec.expires > now and len(records) <= self.max_size):
+                break
+            records.popitem(last=False)
+            self._claimed.pop(rec.message.message_id, None)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List
+
+__all__ = ["JSONArrayStream"]
+
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+
+_QUOTE, _BACKSLASH = 0x22, 0x5C
+_OPEN = frozenset(b"[{")
+_CLOSE = frozenset(b"]}")
+_LBRACKET, _RBRACKET, _COMMA = 0x5B, 0x5D, 0x2C
+
+
+def _string_end(buf: bytearray, start: int) -> int:
+    """Index of the quote closing a string whose body starts at ``start``, or -1 if not buffered yet."""
+    while True:
+        end = buf.find(b'"', start)
+        if end < 0:
+            return -1
+        k = end - 1
+        while buf[k] == _BACKSLASH:
+            k -= 1
+        if (end - 1 - k) % 2 == 0:
+            return end
+        start = end + 1
+
+
+class JSONArrayStream:
+    """Incremental parser for one array inside a top-level JSON object.
+
+    Feed it the body of ``{"messages": [{...}, {...}], "marker": 42}`` in
+    arbitrary chunks; :meth:`feed` returns each array item as soon as its last
+    byte has arrived, and :meth:`close` returns the rest of the object
+    (``{"messages": [], "marker": 42}``). Only structural characters are
+    visited, and buffered bytes are dropped as items complete, so memory is
+    bounded by the largest single item rather than the whole body.
+    """
+
+    def __init__(self, key: str):
+        self._key = key.encode()
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_array = False
+        self._done = False
+        self._item_start = 0
+        self._rest_from = 0
+        self._rest = bytearray()
+        self._last_key: bytes | None = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        buf = self._buf
+        buf += chunk
+        items: List[Any] = []
+        pos = self._pos
+        while True:
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            p = m.start()
+            c = buf[p]
+            if c == _QUOTE:
+                end = _string_end(buf, p + 1)
+                if end < 0:
+                    pos = p  # rescan the string once more bytes arrive
+                    break
+                if self._depth == 1:
+                    self._last_key = bytes(buf[p + 1 : end])
+                pos = end + 1
+                continue
+            pos = p + 1
+            if c in _OPEN:
+                if (
+                    c == _LBRACKET
+                    and self._depth == 1
+                    and not self._done
+                    and self._last_key == self._key
+                ):
+                    self._in_array = True
+                    self._rest += buf[self._rest_from : p + 1]
+                    self._item_start = p + 1
+                self._depth += 1
+            elif c in _CLOSE:
+                self._depth -= 1
+                if self._in_array and self._depth == 1:
+                    self._emit(buf, p, items)
+                    self._in_array = False
+                    self._done = True
+                    self._rest_from = p
+            elif c == _COMMA and self._in_array and self._depth == 2:
+                self._emit(buf, p, items)
+                self._item_start = p + 1
+
+        if self._in_array and self._item_start:
+            # everything before the current item has been handed out
+            cut = self._item_start
+            del buf[:cut]
+            pos -= cut
+            self._item_start = 0
+            self._rest_from = 0
+        self._pos = pos
+        return items
+
+    def _emit(self, buf: bytearray, end: int, items: List[Any]) -> None:
+        raw = bytes(buf[self._item_start : end]).strip()
+        if raw:
+            items.append(json.loads(raw))
+
+    def close(self) -> Dict[str, Any]:
+        if self._in_array or self._depth != 0:
+            raise ValueError("truncated JSON body")
+        self._rest += self._buf[self._rest_from :]
+        rest = json.loads(bytes(self._rest)) if self._rest.strip() else {}
+        if not isinstance(rest, dict):
+            raise ValueError("expected a JSON object")
+        return rest
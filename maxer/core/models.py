@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from types import SimpleNamespace
 from typing import List, Optional, Dict, Any, Union
 
 from pydantic import BaseModel, Field, model_validator
@@ -53,6 +54,15 @@ class MessageStat(BaseModel):
         extra = "allow"
 
 
+def migrate_legacy_message(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill ``sender``/``timestamp`` from the legacy ``from_id``/``date`` fields, in place."""
+    if values.get("sender") is None and values.get("from_id") is not None:
+        values["sender"] = {"user_id": values["from_id"]}
+    if values.get("timestamp") is None and values.get("date") is not None:
+        values["timestamp"] = values["date"]
+    return values
+
+
 class Message(BaseModel):
     message_id: str = Field(..., alias="message_id")
     chat_id: int | None = None
@@ -73,11 +83,7 @@ class Message(BaseModel):
 
     @model_validator(mode="before")
     def _migrate_legacy_fields(cls, values):
-        if values.get("sender") is None and values.get("from_id") is not None:
-            values["sender"] = {"user_id": values["from_id"]}
-        if values.get("timestamp") is None and values.get("date") is not None:
-            values["timestamp"] = values["date"]
-        return values
+        return migrate_legacy_message(values)
 
 
 class NewMessageBody(BaseModel):
@@ -90,10 +96,10 @@ class NewMessageBody(BaseModel):
     buttons: Optional[List[Dict[str, Any]]] = None
 
     @model_validator(mode="after")
-    def _ensure_content(cls, values):  # noqa: N805
-        if not any(values.get(k) for k in ("text", "attachments", "link")):
+    def _ensure_content(self):
+        if not (self.text or self.attachments or self.link):
             raise ValueError("NewMessageBody must contain at least text, attachments or link")
-        return values
+        return self
 
 
 class Chat(BaseModel):
@@ -111,4 +117,8 @@ class Chat(BaseModel):
 class Update(BaseModel):
     update_id: str = Field(..., alias="update_id")
     type: str
-    data: Dict[str, Any] 
\ No newline at end of file
+    data: Dict[str, Any]
+
+
+# the model classes a client decodes responses into; see ``maxer.core.compact`` for the alternative
+PYDANTIC_MODELS = SimpleNamespace(name="pydantic", User=User, Chat=Chat, Message=Message, Update=Update)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Mapping
+
+from .resilience import endpoint_group
+
+__all__ = [
+    "INTERACTIVE",
+    "NORMAL",
+    "BULK",
+    "OutboundScheduler",
+    "request_priority",
+    "current_priority",
+]
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+
+DEFAULT_WEIGHTS: Dict[str, float] = {INTERACTIVE: 8.0, NORMAL: 3.0, BULK: 1.0}
+
+# endpoint groups that are user-facing whatever the caller's tag
+DEFAULT_CLASSES: Dict[str, str] = {"answers": INTERACTIVE}
+
+_current: ContextVar[str | None] = ContextVar("maxer_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(cls: str | None) -> Iterator[None]:
+    """Tag API calls made in this context (and tasks it spawns) with a priority class."""
+    if cls is None:
+        yield
+        return
+    token = _current.set(cls)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_priority() -> str | None:
+    return _current.get()
+
+
+class _ClassStats:
+    __slots__ = ("granted", "queued", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.granted = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class OutboundScheduler:
+    """Weighted fair admission of outbound requests by priority class.
+
+    At most ``concurrency`` requests are in flight and, if ``rate`` is set, a
+    token bucket caps starts per second. When requests are queued, free
+    capacity is handed out by stride scheduling over the classes' ``weights``:
+    with the defaults interactive traffic gets 8 of every 12 grants under
+    contention, bulk still gets 1, and an idle class's share goes to the rest.
+    Pass an instance as ``MaxerClient(..., outbound=OutboundScheduler())``.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 16,
+        rate: float | None = None,
+        burst: int | None = None,
+        weights: Mapping[str, float] | None = None,
+        classes: Mapping[str, str] | None = None,
+        default: str = NORMAL,
+        exclude: Iterable[str] = ("updates",),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self.classes = dict(DEFAULT_CLASSES if classes is None else classes)
+        if default not in self.weights:
+            raise ValueError(f"default class {default!r} has no weight")
+        self.default = default
+        self.exclude = frozenset(exclude)
+        self._clock = clock
+        self._waiters: Dict[str, Deque[tuple[asyncio.Future[None], float]]] = {c: deque() for c in self.weights}
+        self._pass: Dict[str, float] = {c: 0.0 for c in self.weights}
+        self._vtime = 0.0
+        self._active = 0
+        self._tokens = float(self.burst)
+        self._stamp = clock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._stats: Dict[str, _ClassStats] = {c: _ClassStats() for c in self.weights}
+
+    def classify(self, method: str, url: str) -> str | None:
+        """Priority class for a request, or ``None`` if it bypasses the scheduler."""
+        group = endpoint_group(method, url)
+        if group in self.exclude:
+            return None
+        cls = self.classes.get(group) or _current.get() or self.default
+        return cls if cls in self.weights else self.default
+
+    async def acquire(self, cls: str) -> None:
+        if not self._queued() and self._can_grant():
+            self._advance(cls)
+            self._grant(cls, 0.0)
+            return
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[None] = loop.create_future()
+        queue = self._waiters[cls]
+        if not queue:
+            # a class returning from idle does not get credit for the time it was away
+            self._pass[cls] = max(self._pass[cls], self._vtime)
+        queue.append((fut, self._clock()))
+        self._stats[cls].queued += 1
+        self._pump()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._active -= 1
+        self._pump()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "classes": {
+                cls: {
+                    "granted": st.granted,
+                    "queued": st.queued,
+                    "waiting": len(self._waiters[cls]),
+                    "avg_wait_ms": st.wait_total / st.granted * 1000 if st.granted else 0.0,
+                    "max_wait_ms": st.wait_max * 1000,
+                }
+                for cls, st in self._stats.items()
+            },
+        }
+
+    def _queued(self) -> bool:
+        return any(self._waiters.values())
+
+    def _can_grant(self) -> bool:
+        if self._active >= self.concurrency:
+            return False
+        if self.rate is None:
+            return True
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        return self._tokens >= 1.0
+
+    def _advance(self, cls: str) -> None:
+        self._vtime = max(self._vtime, self._pass[cls])
+        self._pass[cls] = self._vtime + 1.0 / self.weights[cls]
+
+    def _grant(self, cls: str, waited: float) -> None:
+        self._active += 1
+        if self.rate is not None:
+            self._tokens -= 1.0
+        st = self._stats[cls]
+        st.granted += 1
+        st.wait_total += waited
+        st.wait_max = max(st.wait_max, waited)
+
+    def _pump(self) -> None:
+        while True:
+            ready = [c for c, q in self._waiters.items() if q]
+            if not ready:
+                return
+            if not self._can_grant():
+                if self._active < self.concurrency and self._timer is None:
+                    delay = (1.0 - self._tokens) / self.rate  # type: ignore[operator]
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+                return
+            cls = min(ready, key=self._pass.__getitem__)
+            fut, queued_at = self._waiters[cls].popleft()
+            if fut.cancelled():
+                continue
+            self._advance(cls)
+            self._grant(cls, self._clock() - queued_at)
+            fut.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._pump()
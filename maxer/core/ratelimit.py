@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .resilience import endpoint_group
+
+__all__ = ["RateStore", "MemoryRateStore", "SQLiteRateStore", "RateLimitCoordinator"]
+
+_logger = logging.getLogger("maxer.core.ratelimit")
+
+_CHAT_URL = re.compile(r"^/chats/(-?\d+)")
+
+# keys idle for this long are dropped from a store; their schedule is in the past anyway
+_IDLE_TTL = 300.0
+_PRUNE_EVERY = 1000
+
+
+def _gcra(tat: float | None, now: float, interval: float, tolerance: float) -> Tuple[float, float]:
+    """``(new_tat, wait)`` for one reservation on a GCRA schedule."""
+    start = now if tat is None or tat < now else tat
+    return start + interval, max(0.0, start - tolerance - now)
+
+
+class RateStore(abc.ABC):
+    """Where rate schedules live; every worker on a token must use the same one.
+
+    A schedule is one float per key, the GCRA "theoretical arrival time". An
+    external store (Redis and the like) implements :meth:`reserve` and
+    :meth:`defer` atomically on its side (a server-side script doing the same
+    arithmetic) and preferably uses its own clock rather than ``now``.
+    """
+
+    @abc.abstractmethod
+    async def reserve(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        """Book the next slot on ``key``; returns the seconds to wait before using it."""
+
+    @abc.abstractmethod
+    async def defer(self, key: str, until: float) -> None:
+        """Make sure no slot on ``key`` starts before ``until``."""
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateStore(RateStore):
+    """In-process store: shared by clients in one process, and a stand-in for tests."""
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._ops = 0
+
+    async def reserve(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        self._tat[key], wait = _gcra(self._tat.get(key), now, interval, tolerance)
+        self._ops += 1
+        if self._ops % _PRUNE_EVERY == 0:
+            cutoff = now - _IDLE_TTL
+            self._tat = {k: v for k, v in self._tat.items() if v > cutoff}
+        return wait
+
+    async def defer(self, key: str, until: float) -> None:
+        self._tat[key] = max(self._tat.get(key, until), until)
+
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS rate_tat (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+
+
+class SQLiteRateStore(RateStore):
+    """Store in a SQLite file, shared by every process on the host that opens it.
+
+    Each reservation is one ``BEGIN IMMEDIATE`` transaction, so SQLite's file
+    lock serialises the read-modify-write across processes.
+    """
+
+    def __init__(self, path: str, *, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._ops = 0
+
+    async def reserve(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        return await asyncio.to_thread(self._reserve, key, interval, tolerance, now)
+
+    async def defer(self, key: str, until: float) -> None:
+        await asyncio.to_thread(self._defer, key, until)
+
+    async def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(_SCHEMA)
+        return self._db
+
+    def _reserve(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        with self._db_lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT tat FROM rate_tat WHERE key = ?", (key,)).fetchone()
+                tat, wait = _gcra(row[0] if row else None, now, interval, tolerance)
+                db.execute("INSERT OR REPLACE INTO rate_tat (key, tat) VALUES (?, ?)", (key, tat))
+                self._ops += 1
+                if self._ops % _PRUNE_EVERY == 0:
+                    db.execute("DELETE FROM rate_tat WHERE tat < ?", (now - _IDLE_TTL,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _defer(self, key: str, until: float) -> None:
+        with self._db_lock:
+            self._conn().execute(
+                "INSERT INTO rate_tat (key, tat) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tat = MAX(tat, excluded.tat)",
+                (key, until),
+            )
+
+
+class RateLimitCoordinator:
+    """Rate limits shared by every worker that uses the same bot token and store.
+
+    Each request books a slot on the token's global schedule (``rate`` per
+    second, bursts of ``burst``) and sleeps until it. Writes addressed to a
+    chat first book and wait out a slot on that chat's schedule
+    (``chat_rate``/``chat_burst``), so global slots go to requests that can
+    actually be sent.
+    Bookings are first come, first served across processes, and a 429 pushes
+    the global schedule back by ``Retry-After`` for everyone. Schedules are
+    keyed by a hash of the token, never the token itself. Pass an instance as
+    ``MaxerClient(..., ratelimit=RateLimitCoordinator(SQLiteRateStore(path)))``.
+    """
+
+    def __init__(
+        self,
+        store: RateStore | None = None,
+        *,
+        rate: float = 30.0,
+        burst: int | None = None,
+        chat_rate: float | None = 1.0,
+        chat_burst: int = 3,
+        retry_after: float = 1.0,
+        exclude: Iterable[str] = ("updates",),
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store if store is not None else MemoryRateStore()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_after = retry_after
+        self.exclude = frozenset(exclude)
+        self._clock = clock
+        self.stats: Dict[str, float] = {"requests": 0, "waited": 0, "wait_total": 0.0, "wait_max": 0.0, "deferred": 0}
+
+    @staticmethod
+    def namespace(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+    async def acquire(self, ns: str, method: str, url: str, kwargs: Dict[str, Any]) -> None:
+        if endpoint_group(method, url) in self.exclude:
+            return
+        wait = 0.0
+        chat_rate = self.chat_rate
+        chat_id = _chat_id(method, url, kwargs) if chat_rate else None
+        if chat_id is not None:
+            interval = 1.0 / chat_rate  # type: ignore[operator]
+            wait = await self.store.reserve(
+                f"{ns}:{chat_id}", interval, (self.chat_burst - 1) * interval, self._clock()
+            )
+            if wait > 0:
+                # wait out the chat before booking a global slot: a slot booked ahead
+                # would push the whole schedule back and sit unused until then
+                await asyncio.sleep(wait)
+        global_wait = await self.store.reserve(f"{ns}:*", 1.0 / self.rate, (self.burst - 1) / self.rate, self._clock())
+        wait += global_wait
+        self.stats["requests"] += 1
+        if wait > 0:
+            self.stats["waited"] += 1
+            self.stats["wait_total"] += wait
+            self.stats["wait_max"] = max(self.stats["wait_max"], wait)
+        if global_wait > 0:
+            await asyncio.sleep(global_wait)
+
+    async def throttled(self, ns: str, retry_after: float | None) -> None:
+        """Called on a 429: hold back every worker on the token."""
+        self.stats["deferred"] += 1
+        delay = retry_after if retry_after is not None else self.retry_after
+        _logger.warning("Rate limited by the API – pausing all workers for %.1fs", delay)
+        # past the burst tolerance too, so the first slot after the pause is at ``delay``
+        await self.store.defer(f"{ns}:*", self._clock() + delay + (self.burst - 1) / self.rate)
+
+    async def close(self) -> None:
+        await self.store.close()
+
+
+def _chat_id(method: str, url: str, kwargs: Dict[str, Any]) -> Any:
+    """Chat a write request is addressed to, if any."""
+    if method == "GET":
+        return None
+    for source in (kwargs.get("params"), kwargs.get("json")):
+        if isinstance(source, dict) and source.get("chat_id") is not None:
+            return source["chat_id"]
+    m = _CHAT_URL.match(url)
+    return m.group(1) if m else None
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable
+
+from .exceptions import MaxerCircuitOpenException, MaxerOverloadedException
+
+__all__ = [
+    "AIMDLimiter",
+    "CircuitBreaker",
+    "RetryBudget",
+    "EndpointGuard",
+    "Resilience",
+    "endpoint_group",
+]
+
+_logger = logging.getLogger("maxer.core.resilience")
+
+
+def endpoint_group(method: str, url: str) -> str:
+    """``/chats/123/members`` -> ``chats``; used to give each API area its own limits."""
+    path = url.split("?", 1)[0].strip("/")
+    return path.split("/", 1)[0] or "root"
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease.
+
+    The limit grows by about one per window of successful requests and is cut
+    by ``backoff_ratio`` on errors, 429s, or latency above the threshold. The
+    threshold is ``latency_threshold`` if given, otherwise ``tolerance`` times
+    a slow-moving average of observed latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff_ratio: float = 0.5,
+        latency_threshold: float | None = None,
+        tolerance: float = 2.0,
+        max_queue: int | None = None,
+    ):
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.tolerance = tolerance
+        self.max_queue = max_queue
+        self.inflight = 0
+        self._avg_latency: float | None = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return
+        if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+            raise MaxerOverloadedException(f"{len(self._waiters)} requests already waiting for a slot")
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # the slot was handed to us just as we got cancelled; pass it on
+                self.inflight -= 1
+                self._wake()
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, latency: float | None, *, overloaded: bool = False) -> None:
+        self.inflight -= 1
+        if overloaded:
+            self._decrease()
+        elif latency is not None:
+            threshold = self.latency_threshold
+            if threshold is None and self._avg_latency is not None:
+                threshold = self._avg_latency * self.tolerance
+            if threshold is not None and latency > threshold:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            self._avg_latency = latency if self._avg_latency is None else self._avg_latency * 0.95 + latency * 0.05
+        self._wake()
+
+    def _decrease(self) -> None:
+        # one cut per latency window, so a burst of failures doesn't collapse the limit
+        now = time.monotonic()
+        if now - self._last_decrease < (self._avg_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.inflight += 1
+                fut.set_result(None)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: float = 0.5,
+        min_requests: int = 20,
+        window: float = 10.0,
+        reset_timeout: float = 5.0,
+        half_open_max: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.state = self.CLOSED
+        self._events: Deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probes = 0
+        if self._probes >= self.half_open_max:
+            return False
+        self._probes += 1
+        return True
+
+    @property
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record(self, ok: bool) -> None:
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if ok:
+                self._close()
+            else:
+                self._open(now)
+            return
+
+        self._events.append((now, ok))
+        if not ok:
+            self._failures += 1
+        cutoff = now - self.window
+        while self._events and self._events[0][0] < cutoff:
+            _, was_ok = self._events.popleft()
+            if not was_ok:
+                self._failures -= 1
+        total = len(self._events)
+        if self.state == self.CLOSED and total >= self.min_requests and self._failures / total >= self.failure_threshold:
+            self._open(now)
+
+    def forget(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _open(self, now: float) -> None:
+        _logger.warning("Circuit opened (%d/%d failures in window)", self._failures, len(self._events))
+        self.state = self.OPEN
+        self._opened_at = now
+
+    def _close(self) -> None:
+        _logger.info("Circuit closed")
+        self.state = self.CLOSED
+        self._events.clear()
+        self._failures = 0
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent requests, plus a small floor per second."""
+
+    def __init__(self, *, ratio: float = 0.1, min_per_second: float = 1.0, ttl: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.ttl = ttl
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.denied = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.ttl
+        for q in (self._requests, self._retries):
+            while q and q[0] < cutoff:
+                q.popleft()
+
+    def record_request(self) -> None:
+        self._requests.append(time.monotonic())
+
+    def try_retry(self) -> bool:
+        now = time.monotonic()
+        self._trim(now)
+        allowed = self.min_per_second * self.ttl + self.ratio * len(self._requests)
+        if len(self._retries) >= allowed:
+            self.denied += 1
+            return False
+        self._retries.append(now)
+        return True
+
+
+class EndpointGuard:
+    __slots__ = ("name", "limiter", "breaker", "rejected")
+
+    def __init__(self, name: str, limiter: AIMDLimiter, breaker: CircuitBreaker):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.rejected = 0
+
+    async def acquire(self) -> None:
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise MaxerCircuitOpenException(self.name, self.breaker.retry_after)
+        try:
+            await self.limiter.acquire()
+        except BaseException:
+            # cancelled or shed while queued: hand back a half-open probe slot
+            self.breaker.forget()
+            raise
+        if self.breaker.state == CircuitBreaker.OPEN:
+            # the circuit opened while we were queued behind the limiter
+            self.limiter.release(None)
+            self.rejected += 1
+            raise MaxerCircuitOpenException(self.name, self.breaker.retry_after)
+
+    def release(self, latency: float | None, *, ok: bool, overloaded: bool = False) -> None:
+        self.limiter.release(latency, overloaded=overloaded or not ok)
+        self.breaker.record(ok)
+
+    def abandon(self) -> None:
+        """Give the slot back without a health sample (e.g. the caller was cancelled)."""
+        self.limiter.release(None)
+        self.breaker.forget()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limiter.limit),
+            "inflight": self.limiter.inflight,
+            "queued": self.limiter.queued,
+            "circuit": self.breaker.state,
+            "rejected": self.rejected,
+        }
+
+
+class Resilience:
+    """Per-endpoint-group limiters and breakers plus a shared retry budget.
+
+    Pass an instance as ``MaxerClient(..., resilience=Resilience())``.
+    Long-poll ``/updates`` is excluded by default because its latency is the
+    server-side wait, not a health signal.
+    """
+
+    def __init__(
+        self,
+        *,
+        limiter: Callable[[], AIMDLimiter] = AIMDLimiter,
+        breaker: Callable[[], CircuitBreaker] = CircuitBreaker,
+        retry_budget: RetryBudget | None = None,
+        group: Callable[[str, str], str] = endpoint_group,
+        exclude: Iterable[str] = ("updates",),
+    ):
+        self._limiter_factory = limiter
+        self._breaker_factory = breaker
+        self.retry_budget = retry_budget or RetryBudget()
+        self._group = group
+        self.exclude = frozenset(exclude)
+        self._guards: Dict[str, EndpointGuard] = {}
+
+    def guard(self, method: str, url: str) -> EndpointGuard | None:
+        name = self._group(method, url)
+        if name in self.exclude:
+            return None
+        guard = self._guards.get(name)
+        if guard is None:
+            guard = self._guards[name] = EndpointGuard(name, self._limiter_factory(), self._breaker_factory())
+        return guard
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "groups": {name: g.stats() for name, g in self._guards.items()},
+            "retries_denied": self.retry_budget.denied,
+        }
@@ -2,4 +2,9 @@ BASE_URL: str = "https://botapi.max.ru"
 TIMEOUT: float = 10.0
 USER_AGENT_TEMPLATE: str = "maxer/{version}"
 RETRY_ATTEMPTS: int = 3
-RETRY_BACKOFF_BASE: float = 0.5  # seconds 
\ No newline at end of file
+RETRY_BACKOFF_BASE: float = 0.5  # seconds
+EDIT_MIN_INTERVAL: float = 1.0  # seconds between edits of one message when coalescing
+CALLBACK_ANSWER_DEADLINE: float = 1.0  # seconds before a slow callback handler is answered for
+MEMBERS_BATCH_SIZE: int = 100  # user ids per add-members / add-admins request
+UPDATE_QUEUE_SIZE: int = 1000  # pending updates before polling pauses
+KEEPALIVE_EXPIRY: float = 60.0  # seconds an idle pooled connection is kept
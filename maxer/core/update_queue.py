@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Mapping
+
+from . import settings as _cfg
+from .models import Update
+
+__all__ = ["UpdateQueue", "DEFAULT_PRIORITIES", "DEFAULT_TTL", "DEFAULT_COLLAPSE"]
+
+# lower runs first; types not listed get ``default_priority``
+DEFAULT_PRIORITIES: Dict[str, int] = {
+    "callback_query": 0,
+    "message_callback": 0,
+    "new_message": 1,
+    "message_created": 1,
+    "bot_started": 1,
+    "message_edited": 3,
+    "message_removed": 3,
+    "bot_added": 4,
+    "bot_removed": 4,
+    "user_added": 6,
+    "user_removed": 6,
+    "chat_title_changed": 8,
+    "typing": 9,
+}
+
+# seconds after which an event is no longer worth handling
+DEFAULT_TTL: Dict[str, float] = {
+    "callback_query": 15.0,
+    "message_callback": 15.0,
+    "typing": 5.0,
+}
+
+
+def _per_chat(upd: Update) -> Hashable:
+    return upd.data.get("chat_id")
+
+
+def _per_message(upd: Update) -> Hashable:
+    message = upd.data.get("message")
+    if isinstance(message, dict):
+        return (message.get("body") or {}).get("mid") or message.get("message_id")
+    return upd.data.get("message_id")
+
+
+# event types where only the newest pending event per key matters
+DEFAULT_COLLAPSE: Dict[str, Callable[[Update], Hashable]] = {
+    "typing": _per_chat,
+    "chat_title_changed": _per_chat,
+    "message_edited": _per_message,
+}
+
+
+class _Entry:
+    __slots__ = ("update", "received", "key", "alive")
+
+    def __init__(self, update: Update, received: float, key: Hashable):
+        self.update = update
+        self.received = received
+        self.key = key
+        self.alive = True
+
+
+class UpdateQueue:
+    """Bounded priority queue between polling and dispatch.
+
+    Updates are served lowest priority number first, FIFO within a priority.
+    While the queue is full :meth:`put` waits, which stalls the poller, unless
+    a queued update of a sheddable priority (``>= shed_priority``) ranks below
+    the incoming one and can be evicted instead. Updates older than their
+    type's ``ttl`` are dropped on the way out, and a newer event for the same
+    ``collapse`` key replaces the pending one in place. Every drop is counted
+    in :attr:`stats` (``expired.<type>``, ``collapsed.<type>``, ``shed.<type>``).
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        *,
+        priorities: Mapping[str, int] | None = None,
+        default_priority: int = 5,
+        shed_priority: int = 5,
+        ttl: Mapping[str, float] | None = None,
+        collapse: Mapping[str, Callable[[Update], Hashable]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize or _cfg.UPDATE_QUEUE_SIZE
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.default_priority = default_priority
+        self.shed_priority = shed_priority
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.collapse = dict(DEFAULT_COLLAPSE if collapse is None else collapse)
+        self._clock = clock
+        self._lanes: Dict[int, Deque[_Entry]] = {}
+        self._order: List[int] = []
+        self._pending: Dict[Hashable, _Entry] = {}
+        self._size = 0
+        self._not_empty = asyncio.Condition()
+        self._not_full = asyncio.Condition()
+        self.stats: Counter[str] = Counter()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def full(self) -> bool:
+        return self._size >= self.maxsize
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    @property
+    def dropped(self) -> int:
+        return sum(v for k, v in self.stats.items() if k.startswith(("expired.", "collapsed.", "shed.")))
+
+    def priority(self, update_type: str) -> int:
+        return self.priorities.get(update_type, self.default_priority)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def put(self, update: Update) -> None:
+        while not self._offer(update):
+            self.stats["waits"] += 1
+            async with self._not_full:
+                await self._not_full.wait_for(lambda: not self.full())
+        async with self._not_empty:
+            self._not_empty.notify()
+
+    async def put_many(self, updates: Iterable[Update]) -> None:
+        for update in updates:
+            await self.put(update)
+
+    def _offer(self, update: Update) -> bool:
+        keyfn = self.collapse.get(update.type)
+        key: Hashable = None
+        if keyfn is not None:
+            sub = keyfn(update)
+            if sub is not None:
+                key = (update.type, sub)
+                pending = self._pending.get(key)
+                if pending is not None and pending.alive:
+                    pending.update = update
+                    self.stats[f"collapsed.{update.type}"] += 1
+                    return True
+
+        prio = self.priority(update.type)
+        if self.full() and not self._shed_below(prio):
+            return False
+
+        entry = _Entry(update, self._clock(), key)
+        lane = self._lanes.get(prio)
+        if lane is None:
+            lane = self._lanes[prio] = deque()
+            self._order = sorted(self._lanes)
+        lane.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        self._size += 1
+        self.stats["enqueued"] += 1
+        return True
+
+    def _shed_below(self, prio: int) -> bool:
+        for lane_prio in reversed(self._order):
+            if lane_prio <= prio or lane_prio < self.shed_priority:
+                return False
+            lane = self._lanes[lane_prio]
+            while lane:
+                # evict the newest so older events keep their place in line
+                entry = lane.pop()
+                if entry.alive:
+                    self._discard(entry)
+                    self.stats[f"shed.{entry.update.type}"] += 1
+                    return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    async def get(self) -> Update:
+        while True:
+            async with self._not_empty:
+                await self._not_empty.wait_for(lambda: self._size > 0)
+            update = self._take()
+            # expired entries free room too, so wake the producer either way
+            async with self._not_full:
+                self._not_full.notify()
+            if update is not None:
+                return update
+
+    def get_nowait(self) -> Update | None:
+        return self._take()
+
+    def _take(self) -> Update | None:
+        now = self._clock()
+        wall = time.time()
+        for prio in self._order:
+            lane = self._lanes[prio]
+            while lane:
+                entry = lane.popleft()
+                if not entry.alive:
+                    continue
+                self._discard(entry)
+                if self._expired(entry, now, wall):
+                    self.stats[f"expired.{entry.update.type}"] += 1
+                    continue
+                self.stats["dispatched"] += 1
+                return entry.update
+        return None
+
+    def _expired(self, entry: _Entry, now: float, wall: float) -> bool:
+        ttl = self.ttl.get(entry.update.type)
+        if ttl is None:
+            return False
+        if now - entry.received > ttl:
+            return True
+        ts: Any = entry.update.data.get("timestamp")
+        # server timestamps are unix milliseconds
+        return isinstance(ts, (int, float)) and wall - ts / 1000 > ttl
+
+    def _discard(self, entry: _Entry) -> None:
+        entry.alive = False
+        self._size -= 1
+        if entry.key is not None and self._pending.get(entry.key) is entry:
+            del self._pending[entry.key]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, TYPE_CHECKING
+
+from .exceptions import MaxerNetworkException
+
+if TYPE_CHECKING:
+    from .client import MaxerClient
+
+__all__ = ["ConnectionWarmer"]
+
+_logger = logging.getLogger("maxer.core.warmup")
+
+
+class ConnectionWarmer:
+    """Opens pooled connections ahead of the first real request and keeps them open.
+
+    :meth:`warm` checks the token with ``get_me`` and then sends
+    ``connections`` concurrent ``GET /me`` so the pool holds that many
+    connections with DNS, TCP and TLS already done. After :meth:`start`, the
+    same pings repeat every ``keepalive_interval`` seconds so idle connections
+    are not expired by the pool (``KEEPALIVE_EXPIRY``) or the server. Pings go
+    straight to the HTTP session, bypassing priorities, hedging and
+    resilience, but each one books a slot with the client's ``ratelimit``
+    coordinator and a 429 pauses it as usual. Use
+    ``Bot(..., warmup=ConnectionWarmer())``.
+    """
+
+    def __init__(self, *, connections: int = 4, keepalive_interval: float | None = 30.0, timeout: float = 5.0):
+        self.connections = connections
+        self.keepalive_interval = keepalive_interval
+        self.timeout = timeout
+        self.warmups = 0
+        self.pings = 0
+        self.failures = 0
+        self.last_warm_ms = 0.0
+        self.last_ping_ms = 0.0
+        self.max_ping_ms = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def warm(self, client: "MaxerClient") -> None:
+        started = time.perf_counter()
+        await client.get_me()
+        await self._ping(client)
+        self.warmups += 1
+        self.last_warm_ms = (time.perf_counter() - started) * 1000
+        _logger.info("Warmed %d connections in %.1fms", self.connections, self.last_warm_ms)
+
+    def start(self, client: "MaxerClient") -> None:
+        if self._task is None and self.keepalive_interval:
+            self._task = asyncio.create_task(self._keepalive(client))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": self.connections,
+            "warmups": self.warmups,
+            "last_warm_ms": self.last_warm_ms,
+            "pings": self.pings,
+            "failures": self.failures,
+            "last_ping_ms": self.last_ping_ms,
+            "max_ping_ms": self.max_ping_ms,
+        }
+
+    async def _ping(self, client: "MaxerClient") -> float:
+        started = time.perf_counter()
+        results: List[Any] = await asyncio.gather(
+            *(self._ping_one(client) for _ in range(self.connections)),
+            return_exceptions=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        self.pings += 1
+        self.last_ping_ms = elapsed
+        self.max_ping_ms = max(self.max_ping_ms, elapsed)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            self.failures += len(errors)
+            if len(errors) == len(results):
+                raise MaxerNetworkException(str(errors[0])) from errors[0]
+            _logger.warning("%d of %d warm-up connections failed: %s", len(errors), len(results), errors[0])
+        return elapsed
+
+    async def _ping_one(self, client: "MaxerClient") -> None:
+        if client.ratelimit is not None:
+            await client.ratelimit.acquire(client._rl_ns, "GET", "/me", {})
+        resp = await client._client.get("/me", timeout=self.timeout)
+        if resp.status_code == 429:
+            await client._throttled(resp)
+
+    async def _keepalive(self, client: "MaxerClient") -> None:
+        assert self.keepalive_interval
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                elapsed = await self._ping(client)
+            except MaxerNetworkException as exc:
+                _logger.warning("Keep-alive ping failed: %s", exc)
+                continue
+            _logger.debug("Keep-alive ping of %d connections took %.1fms", self.connections, elapsed)
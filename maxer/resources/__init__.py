@@ -1,5 +1,7 @@
 from .bots import BotsAPI
 from .chats import ChatsAPI
+from .downloads import DownloadsAPI
+from .membership import MembershipReconciler, ReconcileReport, Roster
 from .messages import MessagesAPI
 from .subscriptions import SubscriptionsAPI
 from .uploads import UploadsAPI
@@ -7,7 +9,11 @@ from .uploads import UploadsAPI
 __all__ = [
     "BotsAPI",
     "ChatsAPI",
+    "DownloadsAPI",
+    "MembershipReconciler",
     "MessagesAPI",
+    "ReconcileReport",
+    "Roster",
     "SubscriptionsAPI",
     "UploadsAPI",
 ] 
\ No newline at end of file
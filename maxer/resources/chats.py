@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Sequence, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, TYPE_CHECKING
 
 from ..core.enums import ChatAction
 from ..core.models import Chat, Message
+from .membership import MembershipReconciler, ReconcileReport, Roster
 
 if TYPE_CHECKING:
     from ..core.client import MaxerClient
@@ -84,4 +85,24 @@ class ChatsAPI:
         return await self._c.remove_chat_member(chat_id, user_id, block=block)
 
     async def add_admins(self, chat_id: int, user_ids: Sequence[int]) -> bool:
-        return await self._c.add_chat_admins(chat_id, user_ids) 
\ No newline at end of file
+        return await self._c.add_chat_admins(chat_id, user_ids)
+
+    async def reconcile(
+        self,
+        desired: Mapping[int, Roster | Iterable[int]],
+        *,
+        dry_run: bool = False,
+        concurrency: int = 8,
+        remove_extra: bool = True,
+        block: bool | None = None,
+        protect: Iterable[int] = (),
+    ) -> ReconcileReport:
+        """Make each chat's members and admins match ``desired`` (chat_id -> :class:`Roster`)."""
+        reconciler = MembershipReconciler(
+            self._c,
+            concurrency=concurrency,
+            remove_extra=remove_extra,
+            block=block,
+            protect=protect,
+        )
+        return await reconciler.reconcile(desired, dry_run=dry_run)
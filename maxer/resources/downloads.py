@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pathlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..core import settings as _cfg
+from ..core.exceptions import MaxerHTTPException, MaxerNetworkException
+from ..core.priority import BULK, request_priority
+from ..utils.backoff import expo as _expo
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+    from ..core.models import Message
+
+__all__ = ["DownloadsAPI", "DownloadReport"]
+
+_logger = logging.getLogger("maxer.resources.downloads")
+
+CHUNK_SIZE = 64 * 1024
+
+_DEFAULT_EXT = {"photo": ".jpg", "image": ".jpg", "video": ".mp4", "audio": ".mp3", "sticker": ".webp"}
+
+Source = str | Dict[str, Any]
+
+
+@dataclass
+class DownloadReport:
+    files: int = 0
+    bytes: int = 0
+    skipped: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class DownloadsAPI:
+    """Chunked downloads of attachments through the client's connection pool.
+
+    Nothing is held in memory beyond one chunk per transfer; files are written
+    to ``<name>.part`` and renamed when complete, so an interrupted download is
+    resumed with a ``Range`` request next time.
+    """
+
+    def __init__(self, client: "MaxerClient"):
+        self._c = client
+
+    async def resolve_url(self, source: Source) -> str | None:
+        """URL of an attachment dict (``{"type": ..., "payload": {...}}``) or a plain URL."""
+        if isinstance(source, str):
+            return source
+        payload = source.get("payload") or {}
+        if payload.get("url"):
+            return payload["url"]
+        if source.get("type") == "video" and payload.get("token"):
+            info = await self._c.get_video_info(payload["token"])
+            urls = (info or {}).get("urls") or {}
+            # keys look like mp4_1080, mp4_720, ...; prefer the highest resolution
+            best = max(urls, key=lambda k: int("".join(ch for ch in k if ch.isdigit()) or 0), default=None)
+            return urls.get(best) if best else None
+        return None
+
+    async def stream(
+        self,
+        source: Source,
+        *,
+        offset: int = 0,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Yield the body of an attachment in chunks, starting at byte ``offset``."""
+        url = await self.resolve_url(source)
+        if url is None:
+            raise ValueError("attachment has no downloadable URL")
+        async with self._open(url, offset) as resp:
+            if resp.status_code >= 400:
+                await resp.aread()
+                raise MaxerHTTPException(resp.status_code, resp.text)
+            if offset and resp.status_code != 206:
+                raise MaxerHTTPException(resp.status_code, "server ignored the Range request")
+            async for chunk in resp.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def download(
+        self,
+        source: Source,
+        dest: os.PathLike | str,
+        *,
+        resume: bool = True,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> pathlib.Path:
+        url = await self.resolve_url(source)
+        if url is None:
+            raise ValueError("attachment has no downloadable URL")
+        path = pathlib.Path(dest)
+        part = path.with_name(path.name + ".part")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            part.unlink(missing_ok=True)
+
+        attempt = 0
+        while True:
+            offset = part.stat().st_size if part.exists() else 0
+            try:
+                async with self._open(url, offset) as resp:
+                    if resp.status_code == 416 and offset:
+                        break  # .part already holds the whole file
+                    if resp.status_code >= 400:
+                        await resp.aread()
+                        raise MaxerHTTPException(resp.status_code, resp.text)
+                    mode = "ab" if offset and resp.status_code == 206 else "wb"
+                    with part.open(mode) as fp:
+                        async for chunk in resp.aiter_bytes(chunk_size):
+                            fp.write(chunk)
+                break
+            except httpx.RequestError as exc:
+                attempt += 1
+                if attempt >= _cfg.RETRY_ATTEMPTS:
+                    raise MaxerNetworkException(str(exc)) from exc
+                delay = await _expo(attempt - 1, base=_cfg.RETRY_BACKOFF_BASE)
+                _logger.warning("Download of %s interrupted (%s) – resuming in %.1fs", path.name, exc, delay)
+                await asyncio.sleep(delay)
+
+        part.replace(path)
+        return path
+
+    async def download_many(
+        self,
+        items: Iterable[Tuple[Source, os.PathLike | str]] | AsyncIterable[Tuple[Source, os.PathLike | str]],
+        *,
+        concurrency: int = 4,
+        skip_existing: bool = True,
+    ) -> DownloadReport:
+        """Download ``(source, dest)`` pairs with at most ``concurrency`` transfers in flight.
+
+        Items are pulled lazily, so an async generator over a long message
+        history is never buffered beyond a few pending entries.
+        """
+        report = DownloadReport()
+        queue: asyncio.Queue[Tuple[Source, os.PathLike | str] | None] = asyncio.Queue(maxsize=concurrency * 2)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                source, dest = item
+                if skip_existing and pathlib.Path(dest).exists():
+                    report.skipped += 1
+                    continue
+                try:
+                    with request_priority(BULK):
+                        path = await self.download(source, dest)
+                except Exception as exc:
+                    _logger.warning("Failed to download %s: %s", dest, exc)
+                    report.failed.append((os.fspath(dest), str(exc)))
+                    continue
+                report.files += 1
+                report.bytes += path.stat().st_size
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queue.put(item)
+            else:
+                for item in items:
+                    await queue.put(item)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+        return report
+
+    async def archive_chat(
+        self,
+        chat_id: int,
+        dest_dir: os.PathLike | str,
+        *,
+        concurrency: int = 4,
+        types: Iterable[str] | None = None,
+        batch_size: int = 100,
+    ) -> DownloadReport:
+        """Download every attachment in a chat's history into ``dest_dir``."""
+        root = pathlib.Path(dest_dir)
+        wanted = set(types) if types is not None else None
+
+        async def items():
+            async for msg in self._c.iter_messages(chat_id=chat_id, batch_size=batch_size):
+                for index, att in enumerate(message_attachments(msg)):
+                    if wanted is not None and att.get("type") not in wanted:
+                        continue
+                    yield att, root / _file_name(msg.message_id, index, att)
+
+        return await self.download_many(items(), concurrency=concurrency)
+
+    def _open(self, url: str, offset: int):
+        # Build the request by hand: AsyncClient.build_request would merge the
+        # client's access_token query param into third-party CDN URLs.
+        headers = {"User-Agent": self._c._client.headers.get("User-Agent", "maxer")}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        request = httpx.Request("GET", url, headers=headers)
+        return _Streamed(self._c._client, request)
+
+
+class _Streamed:
+    __slots__ = ("_session", "_request", "_response")
+
+    def __init__(self, session: httpx.AsyncClient, request: httpx.Request):
+        self._session = session
+        self._request = request
+        self._response: httpx.Response | None = None
+
+    async def __aenter__(self) -> httpx.Response:
+        self._response = await self._session.send(self._request, stream=True, follow_redirects=True)
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._response is not None:
+            await self._response.aclose()
+
+
+def message_attachments(msg: "Message") -> List[Dict[str, Any]]:
+    body = msg.body or {}
+    return [a for a in body.get("attachments") or [] if isinstance(a, dict)]
+
+
+def _file_name(message_id: str, index: int, att: Dict[str, Any]) -> str:
+    payload = att.get("payload") or {}
+    ext = pathlib.PurePosixPath(urlsplit(payload.get("url") or "").path).suffix
+    if not ext or len(ext) > 6:
+        ext = _DEFAULT_EXT.get(att.get("type", ""), "")
+    safe_id = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in message_id)
+    return f"{safe_id}_{index}{ext}"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, TYPE_CHECKING
+
+from ..core import settings as _cfg
+from ..core.exceptions import MaxerHTTPException
+from ..core.models import Message, NewMessageBody
+from ..utils.backoff import expo as _expo
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+
+__all__ = ["EditCoalescer"]
+
+_logger = logging.getLogger("maxer.resources.edits")
+
+
+class _Entry:
+    __slots__ = ("pending", "last_payload", "last_sent_at", "last_message", "error", "task", "wake")
+
+    def __init__(self):
+        self.pending: NewMessageBody | None = None
+        self.last_payload: Dict[str, Any] | None = None
+        self.last_sent_at = float("-inf")
+        self.last_message: Message | None = None
+        self.error: BaseException | None = None
+        self.task: asyncio.Task[None] | None = None
+        self.wake = asyncio.Event()
+
+
+class EditCoalescer:
+    """Merges rapid edits of the same message into as few requests as possible.
+
+    Only the newest pending body of a message is kept. It is sent at most once
+    per ``min_interval`` seconds, immediately on :meth:`commit`, and not at all
+    if it matches what was last sent. A rate-limited edit is retried with
+    backoff (never sooner than ``min_interval``); any other failure drops the
+    body and keeps the error for :meth:`commit` to raise.
+    """
+
+    def __init__(self, client: "MaxerClient", *, min_interval: float | None = None, max_tracked: int = 10_000):
+        self._c = client
+        self.min_interval = _cfg.EDIT_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_tracked = max_tracked
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.requested = 0
+        self.sent = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+    async def edit(self, message_id: str, body: NewMessageBody) -> None:
+        self.requested += 1
+        entry = self._entries.get(message_id)
+        if entry is None:
+            entry = self._entries[message_id] = _Entry()
+            self._evict()
+        else:
+            self._entries.move_to_end(message_id)
+            if entry.pending is not None:
+                self.coalesced += 1
+        entry.pending = body
+        if entry.task is None:
+            entry.task = asyncio.create_task(self._run(message_id, entry))
+
+    async def commit(self, message_id: str) -> Message | None:
+        """Send the latest pending body now and stop tracking the message.
+
+        Returns the edited message, or ``None`` if nothing new had to be sent.
+        Raises the error of the last failed attempt, if any.
+        """
+        entry = self._entries.get(message_id)
+        if entry is None:
+            return None
+        sent_before = entry.last_message
+        if entry.pending is not None and entry.task is None:
+            entry.task = asyncio.create_task(self._run(message_id, entry))
+        if entry.task is not None:
+            entry.wake.set()
+            await asyncio.shield(entry.task)
+        self._entries.pop(message_id, None)
+        if entry.error is not None:
+            raise entry.error
+        return entry.last_message if entry.last_message is not sent_before else None
+
+    async def flush(self) -> None:
+        """Commit every tracked message, e.g. before shutdown."""
+        for message_id in list(self._entries):
+            try:
+                await self.commit(message_id)
+            except Exception:
+                _logger.exception("Failed to flush edit of %s", message_id)
+
+    async def _run(self, message_id: str, entry: _Entry) -> None:
+        failures = 0
+        try:
+            while entry.pending is not None:
+                wait = entry.last_sent_at + self.min_interval - time.monotonic()
+                if wait > 0 and not entry.wake.is_set():
+                    try:
+                        await asyncio.wait_for(entry.wake.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+
+                body, entry.pending = entry.pending, None
+                if body is None:
+                    continue
+                payload = body.dict(exclude_none=True)
+                if payload == entry.last_payload:
+                    self.skipped += 1
+                    continue
+                try:
+                    entry.last_message = await self._c.edit_message(message_id, body)
+                except Exception as exc:
+                    entry.error = exc
+                    failures += 1
+                    if not _rate_limited(exc) or failures >= _cfg.RETRY_ATTEMPTS:
+                        # a newer body, if any, is still sent; this one is dropped
+                        _logger.warning("Coalesced edit of %s failed: %s", message_id, exc)
+                        failures = 0
+                        continue
+                    if entry.pending is None:
+                        entry.pending = body
+                    delay = max(self.min_interval, await _expo(failures - 1, base=_cfg.RETRY_BACKOFF_BASE))
+                    _logger.warning("Coalesced edit of %s rate limited – retrying in %.1fs", message_id, delay)
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                entry.error = None
+                entry.last_payload = payload
+                entry.last_sent_at = time.monotonic()
+                self.sent += 1
+        finally:
+            entry.task = None
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_tracked:
+            for message_id, entry in self._entries.items():
+                if entry.task is None and entry.pending is None:
+                    del self._entries[message_id]
+                    break
+            else:
+                return
+
+
+def _rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, MaxerHTTPException) and exc.status_code == 429
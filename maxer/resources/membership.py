@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Set, Tuple, TYPE_CHECKING
+
+from ..core import settings as _cfg
+from ..core.priority import BULK, request_priority
+
+if TYPE_CHECKING:
+    from ..core.client import MaxerClient
+
+__all__ = ["Roster", "MembershipPlan", "ReconcileReport", "MembershipReconciler"]
+
+_logger = logging.getLogger("maxer.resources.membership")
+
+
+@dataclass
+class Roster:
+    """Desired membership of one chat; admins are implicitly members."""
+
+    members: Iterable[int] = ()
+    admins: Iterable[int] = ()
+
+
+@dataclass
+class MembershipPlan:
+    chat_id: int
+    add_members: List[int] = field(default_factory=list)
+    remove_members: List[int] = field(default_factory=list)
+    add_admins: List[int] = field(default_factory=list)
+    remove_admins: List[int] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.add_members or self.remove_members or self.add_admins or self.remove_admins)
+
+
+@dataclass
+class ReconcileReport:
+    dry_run: bool = False
+    chats: int = 0
+    changed: int = 0
+    members_added: int = 0
+    members_removed: int = 0
+    admins_added: int = 0
+    admins_removed: int = 0
+    requests: int = 0
+    plans: Dict[int, MembershipPlan] = field(default_factory=dict)
+    failed: Dict[int, str] = field(default_factory=dict)
+
+
+def _batches(items: List[int], size: int) -> Iterable[List[int]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+class MembershipReconciler:
+    """Brings the members and admins of many chats in line with desired rosters.
+
+    Each chat's current state is streamed page by page, diffed against its
+    :class:`Roster`, and the difference applied: additions in batches of
+    ``batch_size`` (one request each), removals one user at a time since the
+    API has no bulk form. Up to ``concurrency`` chats are processed at once;
+    with ``dry_run`` only the plans are computed. Owners and the bot itself
+    are never removed or demoted.
+    """
+
+    def __init__(
+        self,
+        client: "MaxerClient",
+        *,
+        concurrency: int = 8,
+        batch_size: int | None = None,
+        remove_extra: bool = True,
+        block: bool | None = None,
+        protect: Iterable[int] = (),
+    ):
+        self._c = client
+        self.concurrency = concurrency
+        self.batch_size = batch_size or _cfg.MEMBERS_BATCH_SIZE
+        self.remove_extra = remove_extra
+        self.block = block
+        self.protect: Set[int] = set(protect)
+
+    async def plan(self, chat_id: int, roster: Roster) -> MembershipPlan:
+        want_admins = set(roster.admins)
+        want_members = set(roster.members) | want_admins
+        current: Set[int] = set()
+        admins: Set[int] = set()
+        keep: Set[int] = set(self.protect)
+        async for m in self._c.iter_chat_members(chat_id):
+            uid = m["user_id"]
+            current.add(uid)
+            if m.get("is_admin"):
+                admins.add(uid)
+            if m.get("is_owner"):
+                keep.add(uid)
+
+        plan = MembershipPlan(chat_id)
+        plan.add_members = sorted(want_members - current)
+        plan.add_admins = sorted(want_admins - admins)
+        if self.remove_extra:
+            # admins who are leaving the chat altogether need no separate demotion
+            plan.remove_admins = sorted((admins - want_admins - keep) & want_members)
+            plan.remove_members = sorted(current - want_members - keep)
+        return plan
+
+    async def apply(self, plan: MembershipPlan, report: ReconcileReport) -> None:
+        c = self._c
+        for batch in _batches(plan.add_members, self.batch_size):
+            if await self._step(plan, report, c.add_chat_members(plan.chat_id, batch), "add members"):
+                report.members_added += len(batch)
+        # promotion needs membership, so new admins were added as members above
+        for batch in _batches(plan.add_admins, self.batch_size):
+            if await self._step(plan, report, c.add_chat_admins(plan.chat_id, batch), "add admins"):
+                report.admins_added += len(batch)
+        for uid in plan.remove_admins:
+            if await self._step(plan, report, c.remove_chat_admin(plan.chat_id, uid), f"demote {uid}"):
+                report.admins_removed += 1
+        for uid in plan.remove_members:
+            if await self._step(plan, report, c.remove_chat_member(plan.chat_id, uid, block=self.block), f"remove {uid}"):
+                report.members_removed += 1
+
+    async def _step(self, plan: MembershipPlan, report: ReconcileReport, call, what: str) -> bool:
+        report.requests += 1
+        try:
+            await call
+        except Exception as exc:
+            _logger.warning("Chat %s: failed to %s: %s", plan.chat_id, what, exc)
+            plan.errors.append(f"{what}: {exc}")
+            return False
+        return True
+
+    async def reconcile(self, desired: Mapping[int, Roster | Iterable[int]], *, dry_run: bool = False) -> ReconcileReport:
+        report = ReconcileReport(dry_run=dry_run)
+        if self.remove_extra:
+            me = await self._c.get_me()
+            self.protect.add(me.user_id)
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(chat_id: int, roster: Roster):
+            async with sem:
+                try:
+                    plan = await self.plan(chat_id, roster)
+                except Exception as exc:
+                    _logger.warning("Chat %s: failed to read members: %s", chat_id, exc)
+                    report.failed[chat_id] = str(exc)
+                    return
+                report.plans[chat_id] = plan
+                report.chats += 1
+                if not plan:
+                    return
+                report.changed += 1
+                if dry_run:
+                    return
+                await self.apply(plan, report)
+                if plan.errors:
+                    report.failed[chat_id] = "; ".join(plan.errors)
+
+        # tasks copy the context, so every chat's calls run as bulk traffic
+        with request_priority(BULK):
+            await asyncio.gather(*(one(cid, r) for cid, r in _items(desired)))
+        return report
+
+
+def _items(desired: Mapping[int, Roster | Iterable[int]]) -> List[Tuple[int, Roster]]:
+    return [(cid, r if isinstance(r, Roster) else Roster(members=r)) for cid, r in desired.items()]
@@ -3,63 +3,68 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple, TYPE_CHECKING
 
 from ..core.models import Message, NewMessageBody
+from .edits import EditCoalescer
 
 if TYPE_CHECKING:
     from ..core.client import MaxerClient
 
 
+def coerce_body(body: NewMessageBody | str | Dict[str, Any] | None, body_kwargs: Dict[str, Any]) -> NewMessageBody:
+    if isinstance(body, NewMessageBody):
+        if body_kwargs:
+            raise ValueError("body_kwargs are ignored when 'body' is already NewMessageBody")
+        return body
+
+    if isinstance(body, str):
+        payload: Dict[str, Any] = {"text": body}
+    elif isinstance(body, dict):
+        payload = body.copy()
+    elif body is None:
+        payload = {}
+    else:
+        raise TypeError("body must be NewMessageBody | str | dict | None")
+
+    if body_kwargs:
+        payload.update(body_kwargs)
+
+    return NewMessageBody(**payload)
+
+
 class MessagesAPI:
 
     def __init__(self, client: "MaxerClient"):
         self._c = client
+        self._edits: EditCoalescer | None = None
 
-    async def send(self, chat_id: int, body: NewMessageBody | str | Dict[str, Any] | None = None, **body_kwargs) -> Message:
-        if isinstance(body, NewMessageBody):
-            if body_kwargs:
-                raise ValueError("body_kwargs are ignored when 'body' is already NewMessageBody")
-            _body = body
-        else:
-            if isinstance(body, str):
-                payload: Dict[str, Any] = {"text": body}
-            elif isinstance(body, dict):
-                payload = body.copy()
-            elif body is None:
-                payload = {}
-            else:
-                raise TypeError("body must be NewMessageBody | str | dict | None")
-
-            if body_kwargs:
-                payload.update(body_kwargs)
+    @property
+    def edits(self) -> EditCoalescer:
+        """Shared coalescer used by ``edit(..., coalesce=True)``."""
+        if self._edits is None:
+            self._edits = EditCoalescer(self._c)
+        return self._edits
 
-            _body = NewMessageBody(**payload)
-
-        return await self._c.send_message(chat_id, _body)
+    async def send(
+        self,
+        chat_id: int,
+        body: NewMessageBody | str | Dict[str, Any] | None = None,
+        *,
+        idempotency_key: str | None = None,
+        **body_kwargs,
+    ) -> Message:
+        return await self._c.send_message(chat_id, coerce_body(body, body_kwargs), idempotency_key=idempotency_key)
 
     async def edit(
         self,
         message_id: str,
         body: NewMessageBody | str | Dict[str, Any] | None = None,
+        *,
+        coalesce: bool = False,
         **body_kwargs,
-    ) -> Message:
-        if isinstance(body, NewMessageBody):
-            if body_kwargs:
-                raise ValueError("body_kwargs are ignored when 'body' is already NewMessageBody")
-            _body = body
-        else:
-            if isinstance(body, str):
-                payload: Dict[str, Any] = {"text": body}
-            elif isinstance(body, dict):
-                payload = body.copy()
-            elif body is None:
-                payload = {}
-            else:
-                raise TypeError("body must be NewMessageBody | str | dict | None")
-
-            if body_kwargs:
-                payload.update(body_kwargs)
-
-            _body = NewMessageBody(**payload)
-
+    ) -> Message | None:
+        _body = coerce_body(body, body_kwargs)
+        if coalesce:
+            await self.edits.edit(message_id, _body)
+            return None
         return await self._c.edit_message(message_id, _body)
 
     async def delete(self, *, message_id: str) -> bool:
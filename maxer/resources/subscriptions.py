@@ -11,7 +11,7 @@ class SubscriptionsAPI:
     async def list(self):
         return await self._c.get_subscriptions()
 
-    async def subscribe(self, url: str, types: Sequence[str]) -> bool:
+    async def subscribe(self, url: str, types: Sequence[str] | None = None) -> bool:
         return await self._c.subscribe(url, types)
 
     async def unsubscribe(self) -> bool:
@@ -0,0 +1,14 @@
+from .emulator import MaxEmulator
+from .metrics import LatencyRecorder, percentile
+from .replay import ReplayReport, UpdateRecorder, UpdateReplayer, iter_batches, stub_session
+
+__all__ = [
+    "MaxEmulator",
+    "LatencyRecorder",
+    "percentile",
+    "ReplayReport",
+    "UpdateRecorder",
+    "UpdateReplayer",
+    "iter_batches",
+    "stub_session",
+]
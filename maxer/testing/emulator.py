@@ -0,0 +1,631 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Sequence, Set, Tuple
+
+import httpx
+
+__all__ = ["MaxEmulator"]
+
+_logger = logging.getLogger("maxer.testing.emulator")
+
+Route = Callable[..., Awaitable[Any]]
+Latency = float | Tuple[float, float] | Callable[[httpx.Request], float]
+
+
+class _Reply(Exception):
+    def __init__(self, status: int, code: str, description: str, headers: Dict[str, str] | None = None):
+        self.status = status
+        self.code = code
+        self.description = description
+        self.headers = headers or {}
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class MaxEmulator:
+    """Stateful in-process stand-in for the MAX Bot API.
+
+    Plug it into a client with :meth:`transport`/:meth:`client`, or expose it
+    over HTTP with :meth:`serve`.
+    """
+
+    def __init__(
+        self,
+        *,
+        token: str = "emulator-token",
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limit: float | None = None,
+        rate_burst: float | None = None,
+        max_poll_wait: float | None = 1.0,
+        seed: int | None = None,
+    ):
+        self.token = token
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_poll_wait = max_poll_wait
+        self._rng = random.Random(seed)
+        self._bucket = _TokenBucket(rate_limit, rate_burst or rate_limit) if rate_limit else None
+        self._forced_errors: List[int] = []
+
+        self._ids = itertools.count(1)
+        self.bot: Dict[str, Any] = {
+            "user_id": next(self._ids),
+            "first_name": "Emulated bot",
+            "username": "emulated_bot",
+            "is_bot": True,
+            "commands": [],
+        }
+        self.users: Dict[int, Dict[str, Any]] = {self.bot["user_id"]: self.bot}
+        self.chats: Dict[int, Dict[str, Any]] = {}
+        self.members: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.pins: Dict[int, str] = {}
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        self.chat_messages: Dict[int, List[str]] = {}
+        self.answers: List[Dict[str, Any]] = []
+        self.actions: List[Tuple[int, str]] = []
+        self.subscriptions: List[Dict[str, Any]] = []
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+
+        self._default_sender: int | None = None
+        self._updates: Deque[Dict[str, Any]] = deque()
+        self._update_seq = 0
+        self._update_event = asyncio.Event()
+        self._servers: List[asyncio.base_events.Server] = []
+
+        self.stats: Counter[str] = Counter()
+        self._routes: List[Tuple[str, re.Pattern[str], Route]] = []
+        self._install_routes()
+
+    # ------------------------------------------------------------------
+    # State helpers
+    # ------------------------------------------------------------------
+
+    def add_user(self, first_name: str = "User", **fields) -> Dict[str, Any]:
+        user_id = fields.pop("user_id", None) or next(self._ids)
+        user = {"user_id": user_id, "first_name": first_name, "is_bot": False, **fields}
+        self.users[user_id] = user
+        return user
+
+    def add_chat(
+        self,
+        title: str | None = None,
+        *,
+        members: Sequence[int] = (),
+        admins: Sequence[int] = (),
+        **fields,
+    ) -> Dict[str, Any]:
+        chat_id = fields.pop("chat_id", None) or next(self._ids)
+        chat = {
+            "chat_id": chat_id,
+            "type": "chat",
+            "status": "active",
+            "title": title or f"Chat {chat_id}",
+            "last_event_time": self._now(),
+            "participants_count": 0,
+            "is_public": False,
+            "link": f"chat{chat_id}",
+            **fields,
+        }
+        self.chats[chat_id] = chat
+        self.members[chat_id] = {}
+        self.chat_messages[chat_id] = []
+        self._add_member(chat_id, self.bot["user_id"], admin=True)
+        for uid in members:
+            self._add_member(chat_id, uid)
+        for uid in admins:
+            self._add_member(chat_id, uid, admin=True)
+        return chat
+
+    def push_update(self, update_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        self._update_seq += 1
+        update = {"update_id": str(self._update_seq), "type": update_type, "data": data}
+        self._updates.append(update)
+        self._update_event.set()
+        return update
+
+    def push_message(self, chat_id: int, text: str, *, sender_id: int | None = None) -> Dict[str, Any]:
+        """Store a message as if a user sent it and emit a ``new_message`` update."""
+        if sender_id is None:
+            if self._default_sender is None:
+                self._default_sender = self.add_user("Emulated user")["user_id"]
+            sender_id = self._default_sender
+        msg = self._store_message(chat_id, {"text": text}, sender=self.users[sender_id])
+        self.push_update(
+            "new_message",
+            {"chat_id": chat_id, "message_id": msg["message_id"], "text": text, "sender": self.users[sender_id]},
+        )
+        return msg
+
+    def push_callback(self, chat_id: int, payload: str, *, user_id: int | None = None) -> Dict[str, Any]:
+        callback_id = f"cb{next(self._ids)}"
+        data: Dict[str, Any] = {"chat_id": chat_id, "callback_id": callback_id, "callback": payload}
+        if user_id is not None:
+            data["user"] = self.users.get(user_id)
+        return self.push_update("callback_query", data)
+
+    async def generate(
+        self,
+        factory: Callable[[int], Tuple[str, Dict[str, Any]]],
+        *,
+        count: int,
+        rate: float | None = None,
+    ) -> None:
+        """Push ``count`` updates built by ``factory(i)``, optionally paced at ``rate`` per second."""
+        interval = 1.0 / rate if rate else 0.0
+        start = time.perf_counter()
+        for i in range(count):
+            update_type, data = factory(i)
+            self.push_update(update_type, data)
+            if interval:
+                delay = start + (i + 1) * interval - time.perf_counter()
+                await asyncio.sleep(max(0.0, delay))
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        self._forced_errors.extend([status] * count)
+
+    @property
+    def pending_updates(self) -> int:
+        return len(self._updates)
+
+    # ------------------------------------------------------------------
+    # Client integration
+    # ------------------------------------------------------------------
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def session(self, base_url: str = "https://emulator.invalid", **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=self.transport(),
+            base_url=base_url,
+            params={"access_token": self.token},
+            **kwargs,
+        )
+
+    def client(self, **kwargs):
+        from ..core.client import MaxerClient
+
+        return MaxerClient(self.token, session=self.session(), **kwargs)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.base_events.Server:
+        """Serve the emulator over plain HTTP/1.1; ``port=0`` picks a free port."""
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        self._servers.append(server)
+        sock = server.sockets[0].getsockname()
+        _logger.info("MAX emulator listening on http://%s:%s", sock[0], sock[1])
+        return server
+
+    async def aclose(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.stats["requests"] += 1
+
+        delay = self._latency(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            if request.url.params.get("access_token") != self.token:
+                raise _Reply(401, "verify.token", "Invalid access_token")
+            if self._bucket is not None:
+                retry_after = self._bucket.take()
+                if retry_after:
+                    raise _Reply(
+                        429,
+                        "too.many.requests",
+                        "Rate limit exceeded",
+                        {"Retry-After": f"{retry_after:.3f}"},
+                    )
+            if self._forced_errors:
+                status = self._forced_errors.pop(0)
+                raise _Reply(status, "emulated.error", "Injected failure")
+            if self.error_rate and self._rng.random() < self.error_rate:
+                raise _Reply(self.error_status, "emulated.error", "Injected failure")
+
+            for method, pattern, route in self._routes:
+                if method != request.method:
+                    continue
+                match = pattern.fullmatch(path)
+                if match is not None:
+                    body = json.loads(request.content) if request.content else {}
+                    result = await route(request, body, *match.groups())
+                    self.stats[f"{method} {pattern.pattern}"] += 1
+                    return httpx.Response(200, json=result)
+            raise _Reply(404, "not.found", f"{request.method} {path}")
+        except _Reply as reply:
+            self.stats[f"status.{reply.status}"] += 1
+            return httpx.Response(
+                reply.status,
+                json={"error": {"code": reply.code, "description": reply.description}},
+                headers=reply.headers,
+            )
+
+    def _latency(self, request: httpx.Request) -> float:
+        if callable(self.latency):
+            return self.latency(request)
+        if isinstance(self.latency, tuple):
+            return self._rng.uniform(*self.latency)
+        return self.latency
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        host, port = writer.get_extra_info("sockname")[:2]
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    raw = await reader.readline()
+                    if raw in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = raw.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+                request = httpx.Request(method, f"http://{host}:{port}{target}", headers=headers, content=body)
+                response = await self.handle(request)
+                content = response.content
+                head = [f"HTTP/1.1 {response.status_code} {response.reason_phrase}"]
+                head += [f"{k}: {v}" for k, v in response.headers.items() if k.lower() != "content-length"]
+                head.append(f"Content-Length: {len(content)}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    def _route(self, method: str, pattern: str, func: Route) -> None:
+        self._routes.append((method, re.compile(pattern), func))
+
+    def _install_routes(self) -> None:
+        r = self._route
+        r("GET", r"/me", self._get_me)
+        r("PATCH", r"/me", self._patch_me)
+        r("GET", r"/chats", self._list_chats)
+        r("GET", r"/chats/(-?\d+)", self._get_chat)
+        r("GET", r"/chats/link/([^/]+)", self._get_chat_by_link)
+        r("PATCH", r"/chats/(-?\d+)", self._patch_chat)
+        r("DELETE", r"/chats/(-?\d+)", self._delete_chat)
+        r("POST", r"/chats/(-?\d+)/actions", self._chat_action)
+        r("GET", r"/chats/(-?\d+)/pin", self._get_pin)
+        r("PUT", r"/chats/(-?\d+)/pin", self._put_pin)
+        r("DELETE", r"/chats/(-?\d+)/pin", self._delete_pin)
+        r("GET", r"/chats/(-?\d+)/members/me", self._member_me)
+        r("DELETE", r"/chats/(-?\d+)/members/me", self._leave_chat)
+        r("GET", r"/chats/(-?\d+)/members/admins", self._list_admins)
+        r("POST", r"/chats/(-?\d+)/members/admins", self._add_admins)
+        r("DELETE", r"/chats/(-?\d+)/members/admins/(\d+)", self._remove_admin)
+        r("GET", r"/chats/(-?\d+)/members", self._list_members)
+        r("POST", r"/chats/(-?\d+)/members", self._add_members)
+        r("DELETE", r"/chats/(-?\d+)/members", self._remove_member)
+        r("GET", r"/messages", self._list_messages)
+        r("GET", r"/messages/([^/]+)", self._get_message)
+        r("POST", r"/messages", self._send_message)
+        r("PUT", r"/messages", self._edit_message)
+        r("DELETE", r"/messages", self._delete_message)
+        r("GET", r"/videos/([^/]+)", self._video_info)
+        r("POST", r"/answers", self._answer)
+        r("GET", r"/subscriptions", self._list_subscriptions)
+        r("POST", r"/subscriptions", self._subscribe)
+        r("DELETE", r"/subscriptions", self._unsubscribe)
+        r("POST", r"/uploads", self._upload_url)
+        r("POST", r"/upload-target/([^/]+)", self._upload_target)
+        r("GET", r"/updates", self._get_updates)
+
+    # -- bots --------------------------------------------------------------
+
+    async def _get_me(self, request, body):
+        return self.bot
+
+    async def _patch_me(self, request, body):
+        self.bot.update({k: v for k, v in body.items() if v is not None})
+        return self.bot
+
+    # -- chats -------------------------------------------------------------
+
+    def _chat(self, chat_id: str) -> Dict[str, Any]:
+        chat = self.chats.get(int(chat_id))
+        if chat is None:
+            raise _Reply(404, "chat.not.found", f"Chat {chat_id} not found")
+        return chat
+
+    async def _list_chats(self, request, body):
+        ids = sorted(self.chats)
+        items, marker = self._page(ids, request)
+        return {"chats": [self.chats[i] for i in items], "marker": marker}
+
+    async def _get_chat(self, request, body, chat_id):
+        return self._chat(chat_id)
+
+    async def _get_chat_by_link(self, request, body, link):
+        for chat in self.chats.values():
+            if chat.get("link") == link:
+                return chat
+        raise _Reply(404, "chat.not.found", f"Chat {link} not found")
+
+    async def _patch_chat(self, request, body, chat_id):
+        chat = self._chat(chat_id)
+        chat.update(body)
+        return chat
+
+    async def _delete_chat(self, request, body, chat_id):
+        self._chat(chat_id)
+        cid = int(chat_id)
+        self.chats.pop(cid)
+        self.members.pop(cid, None)
+        self.pins.pop(cid, None)
+        return {"success": True}
+
+    async def _chat_action(self, request, body, chat_id):
+        self._chat(chat_id)
+        self.actions.append((int(chat_id), body.get("action", "")))
+        return {"success": True}
+
+    async def _get_pin(self, request, body, chat_id):
+        self._chat(chat_id)
+        mid = self.pins.get(int(chat_id))
+        return self.messages.get(mid) if mid else None
+
+    async def _put_pin(self, request, body, chat_id):
+        self._chat(chat_id)
+        mid = body.get("message_id")
+        if mid not in self.messages:
+            raise _Reply(404, "message.not.found", f"Message {mid} not found")
+        self.pins[int(chat_id)] = mid
+        return {"success": True}
+
+    async def _delete_pin(self, request, body, chat_id):
+        self._chat(chat_id)
+        self.pins.pop(int(chat_id), None)
+        return {"success": True}
+
+    # -- members -----------------------------------------------------------
+
+    def _add_member(self, chat_id: int, user_id: int, *, admin: bool = False) -> None:
+        user = self.users.get(user_id) or self.add_user(user_id=user_id)
+        members = self.members[chat_id]
+        member = members.get(user_id)
+        if member is None:
+            member = {**user, "is_owner": False, "is_admin": False, "join_time": self._now()}
+            members[user_id] = member
+            self.chats[chat_id]["participants_count"] = len(members)
+        if admin:
+            member["is_admin"] = True
+
+    async def _member_me(self, request, body, chat_id):
+        self._chat(chat_id)
+        return self.members[int(chat_id)].get(self.bot["user_id"])
+
+    async def _leave_chat(self, request, body, chat_id):
+        self._chat(chat_id)
+        self.members[int(chat_id)].pop(self.bot["user_id"], None)
+        return {"success": True}
+
+    async def _list_admins(self, request, body, chat_id):
+        self._chat(chat_id)
+        return {"members": [m for m in self.members[int(chat_id)].values() if m["is_admin"]]}
+
+    async def _add_admins(self, request, body, chat_id):
+        self._chat(chat_id)
+        admins = body.get("admins") or [{"user_id": body.get("user_id")}]
+        members = self.members[int(chat_id)]
+        for admin in admins:
+            if int(admin["user_id"]) not in members:
+                raise _Reply(400, "user.not.member", f"User {admin['user_id']} is not a member of chat {chat_id}")
+        for admin in admins:
+            self._add_member(int(chat_id), int(admin["user_id"]), admin=True)
+        return {"success": True}
+
+    async def _remove_admin(self, request, body, chat_id, user_id):
+        self._chat(chat_id)
+        member = self.members[int(chat_id)].get(int(user_id))
+        if member is not None:
+            member["is_admin"] = False
+        return {"success": True}
+
+    async def _list_members(self, request, body, chat_id):
+        self._chat(chat_id)
+        members = self.members[int(chat_id)]
+        user_ids = request.url.params.get("user_ids")
+        if user_ids:
+            wanted = [int(u) for u in user_ids.split(",")]
+            return {"members": [members[u] for u in wanted if u in members], "marker": None}
+        items, marker = self._page(list(members), request)
+        return {"members": [members[u] for u in items], "marker": marker}
+
+    async def _add_members(self, request, body, chat_id):
+        self._chat(chat_id)
+        for uid in body.get("user_ids", []):
+            self._add_member(int(chat_id), int(uid))
+        return {"success": True}
+
+    async def _remove_member(self, request, body, chat_id):
+        self._chat(chat_id)
+        self.members[int(chat_id)].pop(int(request.url.params["user_id"]), None)
+        self.chats[int(chat_id)]["participants_count"] = len(self.members[int(chat_id)])
+        return {"success": True}
+
+    # -- messages ----------------------------------------------------------
+
+    def _store_message(self, chat_id: int, body: Dict[str, Any], *, sender: Dict[str, Any]) -> Dict[str, Any]:
+        if chat_id not in self.chats:
+            raise _Reply(404, "chat.not.found", f"Chat {chat_id} not found")
+        mid = f"mid.{chat_id}.{next(self._ids)}"
+        msg_body = {k: v for k, v in body.items() if k != "chat_id"}
+        msg_body["mid"] = mid
+        msg = {
+            "message_id": mid,
+            "chat_id": chat_id,
+            "sender": sender,
+            "recipient": {"chat_id": chat_id},
+            "type": "text",
+            "timestamp": self._now(),
+            "body": msg_body,
+        }
+        self.messages[mid] = msg
+        self.chat_messages[chat_id].append(mid)
+        self.chats[chat_id]["last_event_time"] = msg["timestamp"]
+        return msg
+
+    def _message(self, message_id: str) -> Dict[str, Any]:
+        msg = self.messages.get(message_id)
+        if msg is None:
+            raise _Reply(404, "message.not.found", f"Message {message_id} not found")
+        return msg
+
+    async def _list_messages(self, request, body):
+        params = request.url.params
+        if params.get("message_ids"):
+            mids = params["message_ids"].split(",")
+            return {"messages": [self.messages[m] for m in mids if m in self.messages], "marker": None}
+        chat_id = int(params.get("chat_id", 0))
+        self._chat(str(chat_id))
+        lo = int(params.get("from", 0) or 0)
+        hi = int(params["to"]) if params.get("to") else None
+        mids = [
+            m
+            for m in self.chat_messages[chat_id]
+            if self.messages[m]["timestamp"] >= lo and (hi is None or self.messages[m]["timestamp"] <= hi)
+        ]
+        items, marker = self._page(mids, request)
+        return {"messages": [self.messages[m] for m in items], "marker": marker}
+
+    async def _get_message(self, request, body, message_id):
+        return self._message(message_id)
+
+    async def _send_message(self, request, body):
+        chat_id = body.get("chat_id") or request.url.params.get("chat_id")
+        if chat_id is None:
+            raise _Reply(400, "proto.payload", "chat_id is required")
+        if not (body.get("text") or body.get("attachments") or body.get("link")):
+            raise _Reply(400, "proto.payload", "Message must contain text, attachments or link")
+        return self._store_message(int(chat_id), body, sender=self.bot)
+
+    async def _edit_message(self, request, body):
+        msg = self._message(body.get("message_id", ""))
+        msg["body"].update({k: v for k, v in body.items() if k != "message_id"})
+        return msg
+
+    async def _delete_message(self, request, body):
+        msg = self._message(request.url.params.get("message_id", ""))
+        self.messages.pop(msg["message_id"])
+        self.chat_messages[msg["chat_id"]].remove(msg["message_id"])
+        return {"success": True}
+
+    async def _video_info(self, request, body, token):
+        return {"token": token, "width": 1280, "height": 720, "duration": 10, "urls": {}}
+
+    async def _answer(self, request, body):
+        self.answers.append(body)
+        return {"success": True}
+
+    # -- subscriptions & uploads -------------------------------------------
+
+    async def _list_subscriptions(self, request, body):
+        return {"subscriptions": self.subscriptions}
+
+    async def _subscribe(self, request, body):
+        self.subscriptions = [s for s in self.subscriptions if s["url"] != body["url"]]
+        self.subscriptions.append({"url": body["url"], "update_types": body.get("types"), "time": self._now()})
+        return {"success": True}
+
+    async def _unsubscribe(self, request, body):
+        self.subscriptions.clear()
+        return {"success": True}
+
+    async def _upload_url(self, request, body):
+        key = f"u{next(self._ids)}"
+        self.uploads[key] = {"type": body.get("type")}
+        base = f"{request.url.scheme}://{request.url.netloc.decode()}"
+        return {"upload_url": f"{base}/upload-target/{key}?access_token={self.token}"}
+
+    async def _upload_target(self, request, body, key):
+        if key not in self.uploads:
+            raise _Reply(404, "upload.not.found", key)
+        self.uploads[key]["size"] = len(request.content)
+        return {"file_id": key, "token": key}
+
+    # -- updates -----------------------------------------------------------
+
+    async def _get_updates(self, request, body):
+        params = request.url.params
+        limit = int(params.get("limit", 100))
+        offset = int(params.get("offset") or params.get("marker") or 0)
+        types = set(params["types"].split(",")) if params.get("types") else None
+        # acknowledged updates are dropped, just like on the real server
+        while self._updates and int(self._updates[0]["update_id"]) <= offset:
+            self._updates.popleft()
+
+        if not self._matching(types, 1):
+            wait = float(params.get("timeout", 30))
+            if self.max_poll_wait is not None:
+                wait = min(wait, self.max_poll_wait)
+            self._update_event.clear()
+            try:
+                await asyncio.wait_for(self._update_event.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+        return self._matching(types, limit)
+
+    def _matching(self, types: Set[str] | None, limit: int) -> List[Dict[str, Any]]:
+        pending = self._updates if types is None else (u for u in self._updates if u["type"] in types)
+        return list(itertools.islice(pending, limit))
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _now() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _page(items: List[Any], request: httpx.Request) -> Tuple[List[Any], int | None]:
+        params = request.url.params
+        start = int(params.get("marker") or 0)
+        count = int(params.get("count") or 50)
+        end = start + count
+        return items[start:end], end if end < len(items) else None
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+from ..utils.stats import percentile
+
+__all__ = ["LatencyRecorder", "percentile"]
+
+
+class LatencyRecorder:
+    __slots__ = ("samples",)
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def summary(self, quantiles: Sequence[float] = (50, 90, 99, 99.9)) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        result: Dict[str, float] = {"count": float(len(ordered))}
+        if not ordered:
+            return result
+        result["mean_ms"] = sum(ordered) / len(ordered) * 1000
+        for q in quantiles:
+            result[f"p{q:g}_ms"] = percentile(ordered, q) * 1000
+        result["max_ms"] = ordered[-1] * 1000
+        return result
@@ -0,0 +1,241 @@
+"""Record raw update streams and replay them into a ``Bot``.
+
+Recordings are gzip-compressed JSON lines, one line per ``get_updates`` batch
+or webhook body::
+
+    {"t": 1712345678.123, "k": "poll", "u": [<raw update>, ...]}
+
+The file is append-only: each session adds a new gzip member, which readers
+see as one continuous stream.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import importlib
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+import httpx
+
+from .metrics import LatencyRecorder
+
+if TYPE_CHECKING:
+    from ..bot import Bot
+    from ..core.client import MaxerClient
+
+__all__ = ["UpdateRecorder", "UpdateReplayer", "ReplayReport", "iter_batches", "stub_session"]
+
+_logger = logging.getLogger("maxer.testing.replay")
+
+
+class UpdateRecorder:
+    def __init__(self, path: str | os.PathLike, *, flush_every: int = 50, flush_interval: float = 1.0):
+        self.path = os.fspath(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._fp: IO[bytes] | None = gzip.open(self.path, "ab")
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.batches = 0
+        self.updates = 0
+
+    def attach(self, client: "MaxerClient") -> "UpdateRecorder":
+        client.update_recorder = self
+        return self
+
+    def detach(self, client: "MaxerClient") -> None:
+        if client.update_recorder is self:
+            client.update_recorder = None
+
+    def record_batch(self, updates: List[Dict[str, Any]], *, kind: str = "poll") -> None:
+        if self._fp is None:
+            raise ValueError("recorder is closed")
+        line = json.dumps({"t": time.time(), "k": kind, "u": updates}, separators=(",", ":"), ensure_ascii=False)
+        self._fp.write(line.encode("utf-8") + b"\n")
+        self.batches += 1
+        self.updates += len(updates)
+        self._pending += 1
+        now = time.monotonic()
+        if self._pending >= self.flush_every or now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def record_webhook(self, body: Dict[str, Any] | bytes | str) -> None:
+        if isinstance(body, (bytes, str)):
+            body = json.loads(body)
+        self.record_batch([body], kind="webhook")
+
+    def flush(self) -> None:
+        if self._fp is None:
+            return
+        # a sync flush leaves a readable prefix on disk if the process dies later
+        self._fp.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_batches(path: str | os.PathLike) -> Iterator[Tuple[float, str, List[Dict[str, Any]]]]:
+    with gzip.open(path, "rb") as fp:
+        try:
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    break
+                rec = json.loads(line)
+                yield rec["t"], rec["k"], rec["u"]
+        except (EOFError, zlib.error):
+            # recording was cut off mid-write; everything before it is intact
+            _logger.warning("Truncated recording %s", path)
+
+
+def _stub_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/messages" and request.method in ("POST", "PUT"):
+        body = json.loads(request.content or b"{}")
+        chat_id = body.get("chat_id") or 0
+        return httpx.Response(
+            200,
+            json={
+                "message_id": body.get("message_id") or f"mid.stub.{time.monotonic_ns()}",
+                "chat_id": chat_id,
+                "recipient": {"chat_id": chat_id},
+                "type": "text",
+                "timestamp": int(time.time() * 1000),
+                "body": body,
+            },
+        )
+    if request.url.path == "/me":
+        return httpx.Response(200, json={"user_id": 0, "first_name": "Replay", "is_bot": True})
+    return httpx.Response(200, json={"success": True})
+
+
+def stub_session() -> httpx.AsyncClient:
+    """An ``httpx.AsyncClient`` that accepts every outbound call without touching the network."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(_stub_handler), base_url="https://replay.invalid")
+
+
+@dataclass
+class ReplayReport:
+    batches: int = 0
+    updates: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    handler: LatencyRecorder = field(default_factory=LatencyRecorder)
+    lag: LatencyRecorder = field(default_factory=LatencyRecorder)
+
+    @property
+    def throughput(self) -> float:
+        return self.updates / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "updates": self.updates,
+            "errors": self.errors,
+            "elapsed_s": self.elapsed,
+            "throughput_per_s": self.throughput,
+            "handler_latency": self.handler.summary(),
+            "schedule_lag": self.lag.summary(),
+        }
+
+
+class UpdateReplayer:
+    """Feed a recording into ``Bot._update_router``.
+
+    ``speed=1`` keeps the recorded pacing, ``speed=10`` plays ten times faster
+    and ``speed=None`` dispatches as fast as the handlers allow (so no
+    schedule lag is reported). With ``stub=True`` the bot's client keeps its
+    options but talks to :func:`stub_session` for the duration of the run.
+    """
+
+    def __init__(self, path: str | os.PathLike, *, speed: float | None = None, kinds: Tuple[str, ...] = ("poll", "webhook")):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.path = path
+        self.speed = speed
+        self.kinds = kinds
+
+    async def run(self, bot: "Bot", *, stub: bool = True, limit: int | None = None) -> ReplayReport:
+        client = bot.client
+        session = client._client
+        models = client.models  # decode as production does, e.g. with models="compact"
+        if stub:
+            # swap only the transport, so client options and everything holding
+            # ``bot.client`` (the scheduler, resources) keep working
+            client._client = stub_session()
+
+        report = ReplayReport()
+        router = bot._update_router
+        first_t: float | None = None
+        start = time.perf_counter()
+        try:
+            for t, kind, raw_updates in iter_batches(self.path):
+                if kind not in self.kinds:
+                    continue
+                if first_t is None:
+                    first_t = t
+                if self.speed is not None:
+                    due = start + (t - first_t) / self.speed
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    report.lag.add(max(0.0, time.perf_counter() - due))
+                report.batches += 1
+                for raw in raw_updates:
+                    upd = models.Update.parse_obj(raw)
+                    t0 = time.perf_counter()
+                    try:
+                        await router(upd)
+                    except Exception:
+                        report.errors += 1
+                        _logger.exception("Handler failed for update %s", upd.update_id)
+                    report.handler.add(time.perf_counter() - t0)
+                    report.updates += 1
+                    if limit is not None and report.updates >= limit:
+                        return report
+        finally:
+            report.elapsed = time.perf_counter() - start
+            if stub:
+                stubbed, client._client = client._client, session
+                await stubbed.aclose()
+        return report
+
+
+def _load_bot(spec: str) -> "Bot":
+    module_name, _, attr = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr or "bot")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m maxer.testing.replay")
+    parser.add_argument("recording")
+    parser.add_argument("bot", help="import path of the Bot instance, e.g. mybot.main:bot")
+    parser.add_argument("--speed", type=float, default=None, help="playback speed factor (default: maximum)")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--live", action="store_true", help="let outbound calls reach the real API")
+    args = parser.parse_args(argv)
+
+    replayer = UpdateReplayer(args.recording, speed=args.speed)
+    report = asyncio.run(replayer.run(_load_bot(args.bot), stub=not args.live, limit=args.limit))
+    print(json.dumps(report.as_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import FrozenSet, Tuple
+
+__all__ = ["CronSpec"]
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+# (low, high) per field: minute, hour, day of month, month, day of week
+_BOUNDS: Tuple[Tuple[int, int], ...] = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        rng, _, step_s = part.partition("/")
+        step = int(step_s) if step_s else 1
+        if step < 1:
+            raise ValueError(f"invalid cron step in {part!r}")
+        if rng == "*":
+            start, stop = low, high
+        elif "-" in rng:
+            a, b = rng.split("-", 1)
+            start, stop = int(a), int(b)
+        else:
+            start = int(rng)
+            stop = high if step_s else start
+        if not (low <= start <= stop <= high):
+            raise ValueError(f"cron value {part!r} out of range {low}-{high}")
+        values.update(range(start, stop + 1, step))
+    return frozenset(values)
+
+
+class CronSpec:
+    """Standard five-field cron expression (``"*/15 9-18 * * 1-5"``) or ``@daily``-style alias.
+
+    As in cron, when both day-of-month and day-of-week are restricted a day
+    matching either one qualifies. Sunday is ``0`` or ``7``.
+    """
+
+    __slots__ = ("expr", "tz", "minutes", "hours", "days", "months", "weekdays", "_dom_any", "_dow_any")
+
+    def __init__(self, expr: str, tz: tzinfo = timezone.utc):
+        self.expr = expr
+        self.tz = tz
+        fields = _ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression must have 5 fields: {expr!r}")
+        parsed = [_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _BOUNDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self._dom_any = fields[2] == "*"
+        self._dow_any = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSpec({self.expr!r})"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.isoweekday() % 7) in self.weekdays
+        if self._dom_any or self._dow_any:
+            return dom and dow
+        return dom or dow
+
+    def next(self, after: float) -> float:
+        """First matching minute strictly after the unix timestamp ``after``."""
+        dt = datetime.fromtimestamp(after, self.tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt.year + 5
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt.timestamp()
+        raise ValueError(f"cron expression {self.expr!r} never matches")
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+__all__ = ["percentile"]
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples (``q`` in 0..100)."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
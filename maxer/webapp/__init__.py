@@ -1,3 +1,5 @@
 from .validators import validate_init_data
+from .verifier import InitDataVerifier
+from .asgi import InitDataMiddleware
 
-__all__ = ["validate_init_data"] 
\ No newline at end of file
+__all__ = ["validate_init_data", "InitDataVerifier", "InitDataMiddleware"]
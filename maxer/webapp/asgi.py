@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, MutableMapping
+from urllib.parse import parse_qs
+
+from ..core.exceptions import MaxerValidationException
+from .verifier import InitDataVerifier
+
+__all__ = ["InitDataMiddleware"]
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+
+class InitDataMiddleware:
+    """ASGI middleware that authenticates mini-app requests by their init data.
+
+    The raw string is read from ``header`` (with an optional ``prefix`` such as
+    ``"tma "``) or, failing that, from the ``query_param`` query parameter.
+    Verified parameters are stored in ``scope[scope_key]`` and, for frameworks
+    that expose it (Starlette, FastAPI), in ``scope["state"]``. HTTP requests
+    and WebSocket handshakes are both checked (a bad handshake is closed with
+    code 1008); only ``lifespan`` passes unchecked. ``exempt_paths`` match a
+    whole path or everything below it: ``/health`` covers ``/health/db`` but
+    not ``/healthz``.
+    """
+
+    def __init__(
+        self,
+        app: Callable[[Scope, Receive, Send], Awaitable[None]],
+        verifier: InitDataVerifier,
+        *,
+        header: str = "x-max-init-data",
+        prefix: str = "",
+        query_param: str | None = None,
+        exempt_paths: Iterable[str] = (),
+        scope_key: str = "maxer_init_data",
+    ):
+        self.app = app
+        self.verifier = verifier
+        self._header = header.lower().encode("latin-1")
+        self._prefix = prefix
+        self.query_param = query_param
+        self.exempt_paths = tuple(exempt_paths)
+        self._exempt_prefixes = tuple(p.rstrip("/") + "/" for p in self.exempt_paths if p.rstrip("/"))
+        self.scope_key = scope_key
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan" or self._exempt(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+
+        raw = self._extract(scope)
+        if raw is None:
+            await self._reject(scope, receive, send, "missing init data")
+            return
+        try:
+            params = self.verifier.verify(raw)
+        except MaxerValidationException as exc:
+            await self._reject(scope, receive, send, str(exc))
+            return
+
+        scope[self.scope_key] = params
+        state = scope.get("state")
+        if isinstance(state, dict):
+            state[self.scope_key] = params
+        await self.app(scope, receive, send)
+
+    def _exempt(self, path: str) -> bool:
+        return path in self.exempt_paths or path.startswith(self._exempt_prefixes)
+
+    def _extract(self, scope: Scope) -> str | None:
+        for name, value in scope.get("headers", ()):
+            if name == self._header:
+                text = value.decode("latin-1")
+                if text.startswith(self._prefix):
+                    return text[len(self._prefix):]
+                return None
+        if self.query_param:
+            values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get(self.query_param)
+            if values:
+                return values[0]
+        return None
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+        if scope["type"] == "websocket":
+            message = await receive()
+            if message["type"] == "websocket.connect":
+                await send({"type": "websocket.close", "code": 1008, "reason": detail})
+            return
+        body = json.dumps({"error": {"code": "unauthorized", "description": detail}}).encode()
+        headers: list[tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        response: Dict[str, Any] = {"type": "http.response.start", "status": 401, "headers": headers}
+        await send(response)
+        await send({"type": "http.response.body", "body": body})
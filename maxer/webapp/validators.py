@@ -4,9 +4,10 @@ import hashlib
 import hmac
 import json
 import urllib.parse as _ulib
+from functools import lru_cache
 from typing import Any, Dict
 
-from ..core.exceptions import MaxerException
+from ..core.exceptions import MaxerValidationException
 
 __all__ = ["validate_init_data"]
 
@@ -26,25 +27,38 @@ def _parse_init_data(raw: str) -> Dict[str, str]:
     return result
 
 
-def validate_init_data(init_data: str, bot_token: str) -> Dict[str, Any]:
-    params = _parse_init_data(init_data)
+@lru_cache(maxsize=32)
+def _secret_key(bot_token: str) -> bytes:
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
 
-    recv_hash = params.pop("hash", None)
-    if recv_hash is None:
-        raise MaxerException("init_data does not contain 'hash' parameter")
 
-    data_check_string = "\n".join(f"{k}={params[k]}" for k in sorted(params))
+def _data_check_string(params: Dict[str, str]) -> bytes:
+    return "\n".join(f"{k}={params[k]}" for k in sorted(params)).encode()
 
-    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
-    calc_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
 
-    if calc_hash != recv_hash:
-        raise MaxerException("init_data hash validation failed")
+def _calc_hash(secret_key: bytes, data_check_string: bytes) -> str:
+    return hmac.new(secret_key, data_check_string, hashlib.sha256).hexdigest()
 
+
+def _decode_user(params: Dict[str, Any]) -> Dict[str, Any]:
     if "user" in params:
         try:
             params["user"] = json.loads(params["user"])
         except json.JSONDecodeError:
             pass
+    return params
+
+
+def validate_init_data(init_data: str, bot_token: str) -> Dict[str, Any]:
+    params = _parse_init_data(init_data)
+
+    recv_hash = params.pop("hash", None)
+    if recv_hash is None:
+        raise MaxerValidationException("init_data does not contain 'hash' parameter")
+
+    calc_hash = _calc_hash(_secret_key(bot_token), _data_check_string(params))
+
+    if not hmac.compare_digest(calc_hash.encode(), recv_hash.encode()):
+        raise MaxerValidationException("init_data hash validation failed")
 
-    return params 
\ No newline at end of file
+    return _decode_user(params) 
\ No newline at end of file
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hmac
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from ..core.exceptions import MaxerValidationException
+from .validators import _calc_hash, _data_check_string, _decode_user, _parse_init_data, _secret_key
+
+__all__ = ["InitDataVerifier"]
+
+
+class InitDataVerifier:
+    """Reusable init-data checker for mini-app backends.
+
+    HMAC secrets are derived once per bot token, ``auth_date`` is checked
+    against ``max_age`` seconds, and strings that already passed are kept in an
+    LRU cache until they expire, so repeat requests skip hashing entirely.
+    The cache keeps the flat string fields, so every call returns its own
+    dict (with ``user`` decoded afresh) that callers may mutate freely.
+    """
+
+    def __init__(
+        self,
+        bot_tokens: str | Iterable[str],
+        *,
+        max_age: float | None = 24 * 3600,
+        cache_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        if isinstance(bot_tokens, str):
+            bot_tokens = [bot_tokens]
+        self._secrets: Dict[str, bytes] = {}
+        for token in bot_tokens:
+            self.add_token(token)
+        if not self._secrets:
+            raise ValueError("at least one bot token is required")
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self._clock = clock
+        self._cache: OrderedDict[str, Tuple[Dict[str, str], str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def add_token(self, bot_token: str) -> None:
+        self._secrets[bot_token] = _secret_key(bot_token)
+
+    def remove_token(self, bot_token: str) -> None:
+        self._secrets.pop(bot_token, None)
+        for key in [k for k, (_, token, _) in self._cache.items() if token == bot_token]:
+            del self._cache[key]
+
+    def verify(self, init_data: str) -> Dict[str, Any]:
+        return self.verify_with_token(init_data)[0]
+
+    def verify_with_token(self, init_data: str) -> Tuple[Dict[str, Any], str]:
+        """Like :meth:`verify`, but also return the bot token that signed the data."""
+        now = self._clock()
+        cached = self._cache.get(init_data)
+        if cached is not None:
+            params, token, expires_at = cached
+            if now < expires_at:
+                self._cache.move_to_end(init_data)
+                self.hits += 1
+                return _decode_user(dict(params)), token
+            del self._cache[init_data]
+
+        self.misses += 1
+        params, token = self._check_signature(init_data)
+        expires_at = self._expires_at(params, now)
+        if self.cache_size > 0:
+            self._cache[init_data] = (params, token, expires_at)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return _decode_user(dict(params)), token
+
+    def verify_many(self, items: Iterable[str], *, return_exceptions: bool = False) -> List[Any]:
+        results: List[Any] = []
+        for init_data in items:
+            try:
+                results.append(self.verify(init_data))
+            except MaxerValidationException as exc:
+                if not return_exceptions:
+                    raise
+                results.append(exc)
+        return results
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _check_signature(self, init_data: str) -> Tuple[Dict[str, str], str]:
+        params = _parse_init_data(init_data)
+        recv_hash = params.pop("hash", None)
+        if recv_hash is None:
+            raise MaxerValidationException("init_data does not contain 'hash' parameter")
+        recv = recv_hash.encode()
+        check = _data_check_string(params)
+        for token, secret in self._secrets.items():
+            if hmac.compare_digest(_calc_hash(secret, check).encode(), recv):
+                return params, token
+        raise MaxerValidationException("init_data hash validation failed")
+
+    def _expires_at(self, params: Dict[str, str], now: float) -> float:
+        if self.max_age is None:
+            return float("inf")
+        try:
+            auth_date = float(params["auth_date"])
+        except (KeyError, ValueError):
+            raise MaxerValidationException("init_data does not contain a valid 'auth_date'") from None
+        if auth_date > 1e11:  # milliseconds
+            auth_date /= 1000
+        expires_at = auth_date + self.max_age
+        if now >= expires_at:
+            raise MaxerValidationException("init_data has expired")
+        return expires_at
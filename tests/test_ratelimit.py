@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from maxer.core.ratelimit import MemoryRateStore, RateLimitCoordinator
+
+SCALE = 0.2  # real seconds per simulated second
+
+
+def _max_in_window(times, window):
+    times = sorted(times)
+    return max(sum(1 for t in times if start <= t < start + window) for start in times)
+
+
+def test_global_quota_holds_with_chat_throttled_sends(monkeypatch):
+    real_sleep = asyncio.sleep
+    started = time.monotonic()
+
+    def clock():
+        return (time.monotonic() - started) / SCALE
+
+    async def scaled_sleep(delay):
+        await real_sleep(delay * SCALE)
+
+    monkeypatch.setattr(asyncio, "sleep", scaled_sleep)
+    rl = RateLimitCoordinator(MemoryRateStore(), rate=10, burst=1, chat_rate=1, chat_burst=1, clock=clock)
+    sends = []
+
+    async def send(chat_id):
+        await rl.acquire("ns", "POST", "/messages", {"json": {"chat_id": chat_id}})
+        sends.append(clock())
+
+    async def scenario():
+        await asyncio.gather(*(send(1) for _ in range(10)), *(send(c) for c in range(2, 12)))
+
+    asyncio.run(scenario())
+    assert len(sends) == 20
+    # a little slack for scheduling jitter, which only ever delays a send
+    assert _max_in_window(sends, 0.95) <= 10
+    # the other chats got the slots the throttled chat could not use
+    assert sorted(sends)[10] < 2.0
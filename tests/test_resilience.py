@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from maxer.core.exceptions import MaxerOverloadedException
+from maxer.core.resilience import AIMDLimiter, CircuitBreaker, EndpointGuard
+
+
+def _half_open_guard(**limiter_kw) -> EndpointGuard:
+    breaker = CircuitBreaker(reset_timeout=0.0, half_open_max=1)
+    breaker._open(0.0)
+    return EndpointGuard("chats", AIMDLimiter(initial=1, max_limit=1, **limiter_kw), breaker)
+
+
+def test_cancelled_half_open_acquire_returns_probe():
+    async def scenario():
+        guard = _half_open_guard()
+        await guard.limiter.acquire()  # someone else holds the only slot
+        queued = asyncio.create_task(guard.acquire())
+        await asyncio.sleep(0)
+        assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+        assert guard.limiter.queued == 1
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        guard.limiter.release(None)
+
+        await guard.acquire()
+        guard.release(0.01, ok=True)
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_shed_half_open_acquire_returns_probe():
+    async def scenario():
+        guard = _half_open_guard(max_queue=0)
+        await guard.limiter.acquire()
+        with pytest.raises(MaxerOverloadedException):
+            await guard.acquire()
+        guard.limiter.release(None)
+
+        await guard.acquire()
+        guard.release(0.01, ok=True)
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
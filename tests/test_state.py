@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+from maxer.bot import state as state_module
+from maxer.bot.state import MemoryStateStorage, SQLiteStateStorage, StateManager
+
+
+def _slow_reads(storage: SQLiteStateStorage) -> threading.Event:
+    """Make the next DB read block until the returned event is set."""
+    gate = threading.Event()
+    read = storage._read
+
+    def slow_read(skey):
+        row = read(skey)
+        gate.wait(5)
+        return row
+
+    storage._read = slow_read
+    return gate
+
+
+async def _while_reading(storage: SQLiteStateStorage, key: str, write):
+    gate = _slow_reads(storage)
+    reader = asyncio.create_task(storage.get(key))
+    await asyncio.sleep(0.05)  # the read is now parked in its thread
+    await write()
+    gate.set()
+    return await reader
+
+
+def test_set_during_cache_miss_read_wins(tmp_path):
+    async def scenario():
+        storage = SQLiteStateStorage(tmp_path / "state.db", cache_size=1)
+        await storage.set("a", {"state": "old", "data": {}})
+        await storage.set("b", {"state": None, "data": {}})  # evicts "a" from the cache
+        await storage.flush()
+
+        new = {"state": "new", "data": {}}
+        got = await _while_reading(storage, "a", lambda: storage.set("a", new))
+        assert got == new
+        assert await storage.get("a") == new
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_delete_flushed_during_read_is_not_resurrected(tmp_path):
+    async def scenario():
+        storage = SQLiteStateStorage(tmp_path / "state.db", cache_size=1)
+        await storage.set("a", {"state": "old", "data": {}})
+        await storage.set("b", {"state": None, "data": {}})
+        await storage.flush()
+
+        flushing = []
+
+        async def delete_and_flush():
+            await storage.delete("a")
+            flushing.append(asyncio.create_task(storage.flush()))  # waits on the reader's DB lock
+            await asyncio.sleep(0)
+
+        assert await _while_reading(storage, "a", delete_and_flush) is None
+        assert await flushing[0] == 1
+        assert await storage.get("a") is None
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+class _YieldingStorage(MemoryStateStorage):
+    """Gives other tasks a turn inside every read, like a real backend would."""
+
+    async def get(self, key):
+        record = await super().get(key)
+        await asyncio.sleep(0)
+        return record
+
+
+def test_concurrent_updates_on_one_chat_are_not_lost():
+    async def scenario():
+        state = StateManager(_YieldingStorage()).for_chat(1)
+        await asyncio.gather(*(state.update(**{f"k{i}": i}) for i in range(20)), state.set_state("done"))
+        assert await state.get_data() == {f"k{i}": i for i in range(20)}
+        assert await state.get_state() == "done"
+
+    asyncio.run(scenario())
+
+
+def test_chat_lock_is_reentrant_within_a_task():
+    async def scenario():
+        manager = StateManager(_YieldingStorage())
+        state = manager.for_chat(1)
+        async with state.lock():
+            await state.update(a=1)
+            await state.set_state("x")
+        assert await state.get_data() == {"a": 1}
+        assert len(manager.lock) == 0
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
+def test_memory_ttl_is_idle_time(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(state_module.time, "monotonic", lambda: now[0])
+    storage = MemoryStateStorage(ttl=10)
+    storage.put("a", {"state": "x"})
+    for _ in range(3):
+        now[0] += 8
+        assert storage.peek("a") == {"state": "x"}
+    now[0] += 11
+    assert storage.peek("a") is None